@@ -0,0 +1,70 @@
+"""Optional orjson acceleration shared by the JSON-heavy helpers.
+
+Install the ``speedups`` extra to enable it; without orjson every helper
+falls back to the stdlib ``json`` behaviour.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from typing import Any, Optional
+
+try:  # pragma: no cover - optional speedup
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None  # type: ignore[assignment]
+
+
+if orjson is not None:
+    # Values the stdlib encoder rejects must not be serialized either.
+    _DUMPS_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+def _has_non_finite(payload: Any) -> bool:
+    pending = [payload]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+    return False
+
+
+def dumps(payload: Any) -> Optional[bytes]:
+    """Serialize ``payload`` with orjson, or ``None`` when the caller must fall back.
+
+    Raises ``ValueError`` for NaN and infinities, as ``json.dumps`` does with
+    ``allow_nan=False``; orjson would silently write them as ``null``.
+    """
+
+    if orjson is None:
+        return None
+    try:
+        encoded = orjson.dumps(payload, option=_DUMPS_OPTIONS)
+    except TypeError:
+        # Non-string keys, oversized ints or other values orjson rejects.
+        return None
+    # Non-finite floats come out as ``null``, so only then is a walk needed.
+    if b"null" in encoded and _has_non_finite(payload):
+        raise ValueError("Out of range float values are not JSON compliant")
+    return encoded
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse a JSON document, with orjson when it is installed."""
+
+    if orjson is None:
+        return json.loads(data)
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # The stdlib parser also accepts NaN and Infinity literals.
+        return json.loads(data)
+
+
+__all__ = ["dumps", "loads"]
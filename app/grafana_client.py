@@ -2,20 +2,49 @@
 
 from __future__ import annotations
 
+import asyncio
+import http.cookiejar
 import logging
+import os
+import ssl
+import weakref
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from typing import Any, Mapping, MutableMapping, Optional
-from urllib.parse import urljoin, urlparse, urlunparse
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Mapping, MutableMapping, Optional, Sequence, Tuple
+from urllib.parse import urlparse, urlunparse
 
 import httpx
 
-from . import __version__
+from . import __version__, _json
 from .config import DEFAULT_GRAFANA_URL, GrafanaConfig
 
 LOGGER = logging.getLogger(__name__)
 
 USER_AGENT = f"mcp-grafana-python/{__version__}"
 _DEFAULT_TIMEOUT = httpx.Timeout(30.0)
+_DEFAULT_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+
+# Pooled clients are bound to the event loop that created their connections,
+# so they are cached per loop and keyed by the TLS settings they were built
+# with.  Entries disappear together with their loop.
+_SHARED_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[Any, Any], httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+# Number of active ``shared_client_scope`` blocks per loop; the pool is only
+# closed when the last one exits.
+_SCOPE_USERS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, int]" = weakref.WeakKeyDictionary()
+
+
+def _encode_json_body(payload: Any) -> Optional[bytes]:
+    """Serialize a request body with orjson, or ``None`` to let httpx do it."""
+
+    return _json.dumps(payload)
+
+
+def _decode_json(response: httpx.Response) -> Any:
+    # Same as ``response.json()``, which also parses the raw content bytes.
+    return _json.loads(response.content)
 
 
 class GrafanaAPIError(RuntimeError):
@@ -28,6 +57,89 @@ class GrafanaAPIError(RuntimeError):
         self.message = message
 
 
+@lru_cache(maxsize=None)
+def _ssl_context(verify: bool | str, cert: Optional[tuple[str, str]]) -> ssl.SSLContext:
+    """Build the TLS context for ``verify``/``cert`` once per process.
+
+    Loading the CA bundle is the expensive part of setting up a client, so all
+    pooled clients with the same settings share one context.
+    """
+
+    if isinstance(verify, str):
+        if os.path.isdir(verify):
+            context = ssl.create_default_context(capath=verify)
+        else:
+            context = ssl.create_default_context(cafile=verify)
+    else:
+        context = httpx.create_ssl_context(verify=verify)
+    if cert is not None:
+        context.load_cert_chain(*cert)
+    return context
+
+
+def _cookieless_jar() -> http.cookiejar.CookieJar:
+    """Return a cookie jar that never stores a cookie.
+
+    Pooled clients are shared by every credential set on the loop, so a
+    ``Set-Cookie`` such as ``grafana_session`` answering one principal must
+    not be replayed on the next principal's requests.
+    """
+
+    return http.cookiejar.CookieJar(
+        policy=http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
+
+def _shared_client(verify: bool | str, cert: Optional[tuple[str, str]]) -> httpx.AsyncClient:
+    """Return the pooled client for the running loop and TLS settings."""
+
+    loop = asyncio.get_running_loop()
+    clients = _SHARED_CLIENTS.get(loop)
+    if clients is None:
+        clients = _SHARED_CLIENTS[loop] = {}
+    key = (verify, cert)
+    client = clients.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=_DEFAULT_TIMEOUT,
+            verify=_ssl_context(verify, cert),
+            limits=_DEFAULT_LIMITS,
+            cookies=_cookieless_jar(),
+        )
+        clients[key] = client
+    return client
+
+
+async def aclose_shared_clients() -> None:
+    """Close the pooled clients bound to the running event loop."""
+
+    clients = _SHARED_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if clients:
+        for client in clients.values():
+            await client.aclose()
+
+
+@asynccontextmanager
+async def shared_client_scope() -> AsyncIterator[None]:
+    """Keep the running loop's pool open while any scope is active.
+
+    Scopes may overlap, e.g. one per server session; only the last one to
+    exit closes the pooled clients, so other sessions' requests are unaffected.
+    """
+
+    loop = asyncio.get_running_loop()
+    _SCOPE_USERS[loop] = _SCOPE_USERS.get(loop, 0) + 1
+    try:
+        yield
+    finally:
+        remaining = _SCOPE_USERS[loop] - 1
+        if remaining:
+            _SCOPE_USERS[loop] = remaining
+        else:
+            del _SCOPE_USERS[loop]
+            await aclose_shared_clients()
+
+
+@lru_cache(maxsize=64)
 def _build_api_base_url(url: str) -> str:
     if not url:
         url = DEFAULT_GRAFANA_URL
@@ -44,9 +156,13 @@ class GrafanaClient:
     _base_url: str = field(init=False, repr=False)
     _verify: bool | str = field(init=False, repr=False)
     _cert: Optional[tuple[str, str]] = field(init=False, repr=False)
+    _base_headers: httpx.Headers = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
         self._base_url = _build_api_base_url(self.config.url)
+        # Normalized once; copying an ``httpx.Headers`` reuses the encoded
+        # items instead of re-validating every entry per request.
+        self._base_headers = httpx.Headers(self._static_headers())
         tls = self.config.tls_config
         if tls is not None:
             self._verify = tls.resolve_verify()
@@ -55,19 +171,40 @@ class GrafanaClient:
             self._verify = True
             self._cert = None
 
-    def _headers(
-            self, extra: Optional[Mapping[str, str]] = None) -> MutableMapping[str, str]:
-        headers: MutableMapping[str, str] = {
+    async def __aenter__(self) -> "GrafanaClient":
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.aclose()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        return _shared_client(self._verify, self._cert)
+
+    async def aclose(self) -> None:
+        """Release what this instance owns.
+
+        Connections belong to the per-loop pool, which other instances may be
+        using mid-request, so there is nothing to close here; the pool is torn
+        down only by ``aclose_shared_clients``.
+        """
+
+    def _static_headers(self) -> Dict[str, str]:
+        headers = {
             "User-Agent": USER_AGENT,
             "Accept": "application/json",
         }
         if self.config.api_key:
-            headers.setdefault(
-                "Authorization",
-                f"Bearer {self.config.api_key}")
+            headers["Authorization"] = f"Bearer {self.config.api_key}"
         if self.config.access_token and self.config.id_token:
-            headers.setdefault("X-Access-Token", self.config.access_token)
-            headers.setdefault("X-Grafana-Id", self.config.id_token)
+            headers["X-Access-Token"] = self.config.access_token
+            headers["X-Grafana-Id"] = self.config.id_token
+        return headers
+
+    def _headers(
+            self, extra: Optional[Mapping[str, str]] = None) -> MutableMapping[str, str]:
+        # The credential headers are fixed for the client's lifetime, so
+        # only the per-request extras are merged here.
+        headers = self._base_headers.copy()
         if extra:
             headers.update(extra)
         return headers
@@ -89,7 +226,9 @@ class GrafanaClient:
             path = path[len("/api/"):]
         elif path == "/api":
             path = ""
-        return urljoin(self._base_url + "/", path.lstrip("/"))
+        # The base never carries a query or fragment, so plain concatenation
+        # matches urljoin without re-parsing the base on every request.
+        return f"{self._base_url}/{path.lstrip('/')}"
 
     async def request(
         self,
@@ -103,6 +242,12 @@ class GrafanaClient:
     ) -> httpx.Response:
         url = self._absolute_url(path)
         combined_headers = self._headers(headers)
+        content = None
+        if json is not None:
+            content = _encode_json_body(json)
+            if content is not None:
+                combined_headers["Content-Type"] = "application/json"
+                json = None
         LOGGER.debug(
             "Performing Grafana request",
             extra={
@@ -114,19 +259,17 @@ class GrafanaClient:
         else:
             client_timeout = timeout if isinstance(timeout, httpx.Timeout) else httpx.Timeout(timeout)
 
-        async with httpx.AsyncClient(
-            timeout=client_timeout,
-            verify=self._verify,
-            cert=self._cert,
+        # Reuse the pooled connections; auth and timeout are per request.
+        response = await self._get_client().request(
+            method,
+            url,
+            params=params,
+            json=json,
+            content=content,
+            headers=combined_headers,
             auth=self._auth(),
-        ) as client:
-            response = await client.request(
-                method,
-                url,
-                params=params,
-                json=json,
-                headers=combined_headers,
-            )
+            timeout=client_timeout,
+        )
         if response.status_code >= 400:
             body = response.text
             LOGGER.debug("Grafana API error", extra={
@@ -142,7 +285,29 @@ class GrafanaClient:
         timeout: Optional[float | httpx.Timeout] = None,
     ) -> Any:
         response = await self.request("GET", path, params=params, timeout=timeout)
-        return response.json()
+        return _decode_json(response)
+
+    async def batch_get_json(
+        self,
+        paths: Sequence[str],
+        *,
+        concurrency: int = 16,
+    ) -> List[Any]:
+        """Fetch ``paths`` concurrently, returning bodies in request order.
+
+        At most ``concurrency`` requests are in flight; the first failure
+        cancels the rest and is raised (inside an ``ExceptionGroup``).
+        """
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _fetch(path: str) -> Any:
+            async with semaphore:
+                return await self.get_json(path)
+
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(_fetch(path)) for path in paths]
+        return [task.result() for task in tasks]
 
     async def post_json(
         self,
@@ -156,11 +321,11 @@ class GrafanaClient:
         if response.headers.get(
             "content-type",
                 "").startswith("application/json"):
-            return response.json()
+            return _decode_json(response)
         return response.text
 
     async def delete(self, path: str, *, params: Optional[Mapping[str, Any]] = None) -> None:
         await self.request("DELETE", path, params=params)
 
 
-__all__ = ["GrafanaClient", "GrafanaAPIError", "USER_AGENT"]
+__all__ = ["GrafanaClient", "GrafanaAPIError", "USER_AGENT", "aclose_shared_clients", "shared_client_scope"]
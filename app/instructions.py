@@ -5,9 +5,8 @@ from __future__ import annotations
 import logging
 import os
 import re
-from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Mapping
+from typing import Callable, Dict, Tuple
 
 LOGGER = logging.getLogger(__name__)
 
@@ -36,14 +35,6 @@ explicitly requested; present key fields and next-step suggestions instead."""
 _PLACEHOLDER_RE = re.compile(r"\{\{\s*([A-Z][A-Z0-9_]+)\s*\}\}")
 
 
-def _placeholder_resolver() -> Mapping[str, str]:
-    """Return a mapping of placeholder names to replacement values."""
-
-    # Environment variables take precedence and can be extended without code
-    # changes.
-    return {key: value for key, value in os.environ.items() if key}
-
-
 def _replace_placeholders(
         text: str, value_lookup: Callable[[str], str | None]) -> str:
     """Replace ``{{PLACEHOLDER}}`` tokens using ``value_lookup`` to resolve values."""
@@ -59,9 +50,9 @@ def _replace_placeholders(
 def format_instructions(text: str) -> str:
     """Render the instruction template applying environment-driven substitutions."""
 
-    lookup = _placeholder_resolver()
-    # ``lookup.get`` already returns ``None`` for missing keys, preserving the token.
-    return _replace_placeholders(text, lookup.get)
+    # Environment variables resolve placeholders; ``get`` returns ``None`` for
+    # missing keys, preserving the token.  Only referenced names are looked up.
+    return _replace_placeholders(text, os.environ.get)
 
 
 def _candidate_paths() -> tuple[Path, ...]:
@@ -80,23 +71,61 @@ def _candidate_paths() -> tuple[Path, ...]:
     return tuple(candidates)
 
 
-@lru_cache(maxsize=1)
+# Rendered instructions keyed by path, with the mtime_ns they were read at;
+# an edit replaces the entry.  An empty string marks a blank file so it is
+# skipped without being read again.
+_CACHE: Dict[str, Tuple[int, str]] = {}
+_DEFAULT_KEY = ""
+
+
+def clear_instructions_cache() -> None:
+    """Forget every rendered instruction text so the next load re-reads it."""
+
+    _CACHE.clear()
+
+
 def load_instructions() -> str:
-    """Load instructions text from configured sources, falling back to the default string."""
+    """Load instructions text from configured sources, falling back to the default string.
+
+    Files are re-read only when their modification time changes; otherwise a
+    single ``stat`` per candidate is enough to serve the cached rendering.
+    """
 
     for path in _candidate_paths():
         try:
-            if path.exists():
-                content = path.read_text(encoding="utf-8").strip()
-                if content:
-                    LOGGER.info("Using instructions from '%s'", path)
-                    return format_instructions(content)
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
         except OSError as exc:  # pragma: no cover - filesystem issues
             LOGGER.warning(
                 "Failed to read instructions from '%s': %s", path, exc)
-
-    LOGGER.info("Using built-in instructions text")
-    return format_instructions(_DEFAULT_TEXT)
-
-
-__all__ = ["format_instructions", "load_instructions"]
+            continue
+
+        key = str(path)
+        cached = _CACHE.get(key)
+        if cached is not None and cached[0] == stat.st_mtime_ns:
+            rendered = cached[1]
+        else:
+            try:
+                content = path.read_text(encoding="utf-8").strip()
+            except OSError as exc:  # pragma: no cover - filesystem issues
+                LOGGER.warning(
+                    "Failed to read instructions from '%s': %s", path, exc)
+                continue
+            if content:
+                LOGGER.info("Using instructions from '%s'", path)
+                rendered = format_instructions(content)
+            else:
+                rendered = ""
+            _CACHE[key] = (stat.st_mtime_ns, rendered)
+        if rendered:
+            return rendered
+
+    cached = _CACHE.get(_DEFAULT_KEY)
+    if cached is None:
+        LOGGER.info("Using built-in instructions text")
+        cached = _CACHE[_DEFAULT_KEY] = (0, format_instructions(_DEFAULT_TEXT))
+    return cached[1]
+
+
+__all__ = ["clear_instructions_cache", "format_instructions", "load_instructions"]
@@ -6,9 +6,10 @@ import argparse
 import logging
 import os
 import asyncio
+from functools import lru_cache
 from pathlib import Path
 import sys
-from typing import Tuple
+from typing import Awaitable, Dict, Iterator, Tuple
 
 from dotenv import find_dotenv, load_dotenv
 
@@ -28,7 +29,7 @@ from .config import (
 )
 from .server import create_app
 from .config import grafana_config_from_env
-from .grafana_client import GrafanaClient, GrafanaAPIError
+from .grafana_client import GrafanaClient, GrafanaAPIError, aclose_shared_clients
 
 
 def _request_shutdown(app: object, transport: str) -> None:
@@ -65,18 +66,49 @@ def _request_shutdown(app: object, transport: str) -> None:
                     exc_info=True)
 
 
-def _parse_address(value: str) -> Tuple[str, int]:
-    if ":" not in value:
-        raise argparse.ArgumentTypeError("Address must be in HOST:PORT format")
-    host, port_str = value.rsplit(":", 1)
+async def _run_closing_clients(check: Awaitable[int]) -> int:
+    """Await ``check`` and release pooled Grafana connections before the loop ends."""
+
     try:
-        port = int(port_str)
-    except ValueError as exc:  # pragma: no cover - defensive
-        raise argparse.ArgumentTypeError("Port must be an integer") from exc
-    return host, port
+        return await check
+    finally:
+        await aclose_shared_clients()
 
 
-def main(argv: list[str] | None = None) -> None:
+def _parse_address(value: str) -> Tuple[str, int]:
+    host, sep, port_str = value.rpartition(":")
+    if not sep:
+        raise argparse.ArgumentTypeError("Address must be in HOST:PORT format")
+    # ASCII digits only: ``str.isdigit`` alone accepts characters ``int`` rejects.
+    if not (port_str.isascii() and port_str.isdigit()):
+        raise argparse.ArgumentTypeError("Port must be an integer")
+    return host, int(port_str)
+
+
+_ENV_ARGUMENTS: Dict[str, Tuple[str, str]] = {
+    GRAFANA_URL_ENV: ("grafana_url", "Grafana base URL"),
+    GRAFANA_SERVICE_ACCOUNT_ENV: ("grafana_service_account_token", "Grafana service account token"),
+    GRAFANA_API_KEY_ENV: ("grafana_api_key", "Legacy Grafana API key"),
+    GRAFANA_USERNAME_ENV: ("grafana_username", "Grafana username for basic auth"),
+    GRAFANA_PASSWORD_ENV: ("grafana_password", "Grafana password for basic auth"),
+    GRAFANA_ACCESS_TOKEN_ENV: ("grafana_access_token", "Grafana access token"),
+    GRAFANA_ID_TOKEN_ENV: ("grafana_id_token", "Grafana ID token"),
+    # TLS-related environment variables are CLI-overridable as well
+    GRAFANA_TLS_SKIP_VERIFY_ENV: ("grafana_tls_skip_verify", "Skip TLS certificate verification (true/false)"),
+    GRAFANA_TLS_CERT_FILE_ENV: ("grafana_tls_cert_file", "Client certificate file path"),
+    GRAFANA_TLS_KEY_FILE_ENV: ("grafana_tls_key_file", "Client certificate key file path"),
+    GRAFANA_TLS_CA_FILE_ENV: ("grafana_tls_ca_file", "CA bundle file path for Grafana"),
+}
+
+
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Return the CLI parser, built once per process.
+
+    The parser must stay unmodified after construction: per-run defaults are
+    supplied through the namespace passed to ``parse_args`` instead.
+    """
+
     parser = argparse.ArgumentParser(
         description="Run the Grafana FastMCP server.")
     parser.add_argument(
@@ -137,30 +169,19 @@ def main(argv: list[str] | None = None) -> None:
         help="Path for the streamable HTTP endpoint (absolute or relative to the base path)",
     )
 
-    env_arguments = {
-        GRAFANA_URL_ENV: ("grafana_url", "Grafana base URL"),
-        GRAFANA_SERVICE_ACCOUNT_ENV: ("grafana_service_account_token", "Grafana service account token"),
-        GRAFANA_API_KEY_ENV: ("grafana_api_key", "Legacy Grafana API key"),
-        GRAFANA_USERNAME_ENV: ("grafana_username", "Grafana username for basic auth"),
-        GRAFANA_PASSWORD_ENV: ("grafana_password", "Grafana password for basic auth"),
-        GRAFANA_ACCESS_TOKEN_ENV: ("grafana_access_token", "Grafana access token"),
-        GRAFANA_ID_TOKEN_ENV: ("grafana_id_token", "Grafana ID token"),
-    }
-    # Add TLS-related environment variables as CLI-overridable flags
-    env_arguments.update({
-        GRAFANA_TLS_SKIP_VERIFY_ENV: ("grafana_tls_skip_verify", "Skip TLS certificate verification (true/false)"),
-        GRAFANA_TLS_CERT_FILE_ENV: ("grafana_tls_cert_file", "Client certificate file path"),
-        GRAFANA_TLS_KEY_FILE_ENV: ("grafana_tls_key_file", "Client certificate key file path"),
-        GRAFANA_TLS_CA_FILE_ENV: ("grafana_tls_ca_file", "CA bundle file path for Grafana"),
-    })
-
-    for env_name, (dest, description) in env_arguments.items():
+    for env_name, (dest, description) in _ENV_ARGUMENTS.items():
         parser.add_argument(
             f"--{env_name}",
             dest=dest,
             help=f"{description}. Overrides the {env_name} environment variable when provided.",
         )
 
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = _build_parser()
+
     # First pass to resolve env-file parameter without consuming CLI overrides
     pre_args, _ = parser.parse_known_args(argv)
 
@@ -178,20 +199,20 @@ def main(argv: list[str] | None = None) -> None:
     if default_env and default_env.exists():
         selected_env = default_env.resolve()
     else:
-        fallback_candidates: list[Path | None] = [
-            _resolve_candidate(pre_args.env_file),
-            _resolve_candidate(os.getenv("ENV_FILE")),
-            _resolve_candidate(Path.cwd() / ".env"),
-        ]
-
-        discovered = find_dotenv(usecwd=True)
-        if discovered:
-            fallback_candidates.append(_resolve_candidate(discovered))
-        discovered_relative = find_dotenv(usecwd=False)
-        if discovered_relative:
-            fallback_candidates.append(_resolve_candidate(discovered_relative))
-
-        for candidate in fallback_candidates:
+        def _fallback_candidates() -> Iterator[Path | None]:
+            # Lazily, in priority order: the find_dotenv() directory walks
+            # only run when no explicit candidate exists.
+            yield _resolve_candidate(pre_args.env_file)
+            yield _resolve_candidate(os.getenv("ENV_FILE"))
+            yield _resolve_candidate(Path.cwd() / ".env")
+            discovered = find_dotenv(usecwd=True)
+            if discovered:
+                yield _resolve_candidate(discovered)
+            discovered_relative = find_dotenv(usecwd=False)
+            if discovered_relative:
+                yield _resolve_candidate(discovered_relative)
+
+        for candidate in _fallback_candidates():
             if candidate and candidate.exists():
                 selected_env = candidate
                 break
@@ -209,9 +230,12 @@ def main(argv: list[str] | None = None) -> None:
         "streamable_http_path": os.getenv("STREAMABLE_HTTP_PATH"),
     }
 
-    parser.set_defaults(**{key: value for key, value in env_defaults.items() if value})
-
-    args = parser.parse_args(argv)
+    # argparse only fills in defaults for attributes missing from the
+    # namespace, so seeding it applies the environment without mutating the
+    # shared parser.
+    args = parser.parse_args(
+        argv,
+        namespace=argparse.Namespace(**{key: value for key, value in env_defaults.items() if value}))
 
     # If user passed --ignore-ssl, set env var so grafana_config_from_env picks it up
     if getattr(args, "ignore_ssl", False):
@@ -228,7 +252,7 @@ def main(argv: list[str] | None = None) -> None:
         print(__version__)
         return
 
-    for env_name, (dest, _) in env_arguments.items():
+    for env_name, (dest, _) in _ENV_ARGUMENTS.items():
         value = getattr(args, dest, None)
         if value is not None:
             os.environ[env_name] = value
@@ -268,7 +292,7 @@ def main(argv: list[str] | None = None) -> None:
                 print(f"Grafana connection: FAILED - {exc}")
                 return 2
 
-        exit_code = asyncio.run(_check())
+        exit_code = asyncio.run(_run_closing_clients(_check()))
         raise SystemExit(exit_code)
 
     # By default require Grafana on startup, unless explicitly disabled with --no-require-grafana
@@ -346,7 +370,7 @@ def main(argv: list[str] | None = None) -> None:
             print("Grafana startup check: OK")
             return 0
 
-        code = asyncio.run(_startup_check())
+        code = asyncio.run(_run_closing_clients(_startup_check()))
         if code != 0:
             raise SystemExit(code)
 
@@ -66,29 +66,27 @@ def ensure_streamable_http_accept_patch() -> None:
         request: Request,
     ) -> tuple[bool, bool]:
         accept_header = request.headers.get("accept", "")
-        if not accept_header.strip():
+        if not accept_header or accept_header.isspace():
             return True, True
 
         media_types = _normalize_media_types(accept_header)
         if not media_types:
             return True, True
 
-        wildcard_all = any(media in {"*/*", "*"} for media in media_types)
-
-        has_json = any(
-            media.startswith(CONTENT_TYPE_JSON)
-            or _is_application_wildcard(media)
-            or media.startswith(f"{CONTENT_TYPE_JSON}+")
-            for media in media_types
-        )
-        has_sse = any(
-            media.startswith(CONTENT_TYPE_SSE)
-            or _is_text_wildcard(media)
-            for media in media_types
-        )
-
-        if wildcard_all:
-            return True, True
+        # Single pass over the (already lowercased) media types; a full
+        # wildcard settles the answer immediately.
+        has_json = has_sse = False
+        for media in media_types:
+            if media == "*/*" or media == "*":
+                return True, True
+            if not has_json and (
+                    media.startswith(CONTENT_TYPE_JSON)
+                    or _is_application_wildcard(media)):
+                has_json = True
+            elif not has_sse and (
+                    media.startswith(CONTENT_TYPE_SSE)
+                    or _is_text_wildcard(media)):
+                has_sse = True
 
         if not has_json and has_sse:
             has_json = True
@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
 from mcp.server import FastMCP
 
+from .grafana_client import shared_client_scope
 from .instructions import load_instructions
 from .patches import (
     ensure_sse_post_alias_patch,
@@ -21,6 +23,18 @@ from .tools import register_all
 LOGGER = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def _grafana_client_lifespan(_: FastMCP) -> AsyncIterator[None]:
+    """Close the pooled Grafana connections once the last active lifespan exits.
+
+    The MCP SDK enters the lifespan per session, so overlapping sessions share
+    the pool and only the final exit closes it.
+    """
+
+    async with shared_client_scope():
+        yield
+
+
 def _normalize_mount_path(base_path: str) -> str:
     """Ensure the base path is absolute without trailing slash (except root)."""
 
@@ -169,6 +183,7 @@ def create_app(
         streamable_http_path=resolved_streamable_http_path,
         log_level=log_level.upper(),
         debug=debug,
+        lifespan=_grafana_client_lifespan,
     )
     register_all(app)
     _register_streamable_http_alias(app)
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, Mapping
+from typing import AbstractSet, Dict, Iterable, Mapping
 
 
 _MATCH_TYPE_ALIASES: Dict[str, str] = {
@@ -57,10 +57,17 @@ class Selector:
     """Collection of matchers that must all evaluate to true."""
 
     filters: Iterable[LabelMatcher]
+    _required_labels: AbstractSet[str] = field(
+        default=frozenset(), init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if not isinstance(self.filters, tuple):
             self.filters = tuple(self.filters)
+        # "=" and "=~" can never match an absent label, so a missing key
+        # rejects the label set before any per-matcher work.
+        self._required_labels = frozenset(
+            matcher.name for matcher in self.filters
+            if _MATCH_TYPE_ALIASES.get(matcher.type) in ("=", "=~"))
 
     def to_promql(self) -> str:
         parts = []
@@ -72,20 +79,16 @@ class Selector:
         return f"{{{inner}}}"
 
     def matches(self, labels: Mapping[str, str]) -> bool:
-        for matcher in self.filters:
-            if not matcher.matches(labels):
-                return False
-        return True
+        if not labels.keys() >= self._required_labels:
+            return False
+        return all(matcher.matches(labels) for matcher in self.filters)
 
 
 def matches_all(selectors: Iterable[Selector],
                 labels: Mapping[str, str]) -> bool:
     """Return True if every selector matches the provided labels."""
 
-    for selector in selectors:
-        if not selector.matches(labels):
-            return False
-    return True
+    return all(selector.matches(labels) for selector in selectors)
 
 
 __all__ = ["LabelMatcher", "Selector", "matches_all"]
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
+from functools import lru_cache
 import re
-from typing import Any, Dict, Optional
+from time import time_ns
+from typing import Any, Dict, Optional, Tuple
 
 from mcp.server.fastmcp import Context, FastMCP
 
@@ -17,60 +19,65 @@ _RELATIVE_TIME_PATTERN = re.compile(
     re.IGNORECASE)
 
 
-_RELATIVE_UNIT_TO_DELTA = {
-    "s": lambda amount: timedelta(seconds=amount),
-    "m": lambda amount: timedelta(minutes=amount),
-    "h": lambda amount: timedelta(hours=amount),
-    "d": lambda amount: timedelta(days=amount),
-    "w": lambda amount: timedelta(weeks=amount),
+_RELATIVE_SEGMENT_PATTERN = re.compile(r"([+-])(\d+)([smhdw])", re.IGNORECASE)
+
+
+_UTC = timezone.utc
+
+_UNIT_MS: Dict[str, int] = {
+    "s": 1_000,
+    "m": 60_000,
+    "h": 3_600_000,
+    "d": 86_400_000,
+    "w": 604_800_000,
 }
+_SIGN: Dict[str, int] = {"+": 1, "-": -1}
+
+
+def _now_ms() -> int:
+    return time_ns() // 1_000_000
+
+
+@lru_cache(maxsize=512)
+def _parse_time_spec(text: str) -> Tuple[bool, int]:
+    """Parse a non-empty time string into ``(is_relative, milliseconds)``.
+
+    Relative ``now[+-N<unit>]...`` expressions yield their total offset from
+    the current time; RFC3339 timestamps yield absolute epoch milliseconds.
+    The result only depends on *text*, so repeated expressions are parsed once.
+    """
 
+    if _RELATIVE_TIME_PATTERN.fullmatch(text):
+        # Sum the signed segments after the leading "now"; the pattern above
+        # only admits known units, so the table lookups cannot miss.
+        return True, sum(
+            _SIGN[sign] * int(amount) * _UNIT_MS[unit.lower()]
+            for sign, amount, unit in _RELATIVE_SEGMENT_PATTERN.findall(text[3:]))
 
-def _parse_relative_time(expression: str) -> datetime | None:
-    match = _RELATIVE_TIME_PATTERN.fullmatch(expression)
-    if not match:
-        return None
-
-    current = datetime.now(timezone.utc)
-    # Extract segments after the leading "now"
-    for segment in re.finditer(
-            r"([+-])(\d+)([smhdw])", expression[3:], re.IGNORECASE):
-        sign, value_str, unit = segment.groups()
-        amount = int(value_str)
-        delta_factory = _RELATIVE_UNIT_TO_DELTA.get(unit.lower())
-        if delta_factory is None:
-            raise ValueError(
-                f"Unsupported relative time unit '{unit}' in expression '{expression}'")
-        delta = delta_factory(amount)
-        if sign == "+":
-            current += delta
-        else:
-            current -= delta
-    return current
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    dt = datetime.fromisoformat(text)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=_UTC)
+    return False, int(dt.timestamp() * 1000)
 
 
 def _parse_time(value: Any, field_name: str) -> int:
     if isinstance(value, (int, float)):
-        return int(float(value))
-    if isinstance(value, str):
-        cleaned = value.strip()
-        if not cleaned:
-            raise ValueError(f"{field_name} must not be empty")
-        relative = _parse_relative_time(cleaned)
-        if relative is not None:
-            return int(relative.timestamp() * 1000)
-        if cleaned.endswith("Z"):
-            cleaned = cleaned[:-1] + "+00:00"
-        try:
-            dt = datetime.fromisoformat(cleaned)
-        except ValueError as exc:
-            raise ValueError(
-                f"Invalid RFC3339 timestamp for {field_name}: {value}") from exc
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return int(dt.timestamp() * 1000)
-    raise ValueError(
-        f"Unsupported timestamp type for {field_name}: {type(value)!r}")
+        # int() truncates floats directly and keeps large ints exact.
+        return int(value)
+    if not isinstance(value, str):
+        raise ValueError(
+            f"Unsupported timestamp type for {field_name}: {type(value)!r}")
+    cleaned = value.strip()
+    if not cleaned:
+        raise ValueError(f"{field_name} must not be empty")
+    try:
+        is_relative, milliseconds = _parse_time_spec(cleaned)
+    except ValueError as exc:
+        raise ValueError(
+            f"Invalid RFC3339 timestamp for {field_name}: {value}") from exc
+    return _now_ms() + milliseconds if is_relative else milliseconds
 
 
 async def _get_assertions(ctx: Context, args: Dict[str, Any]) -> str:
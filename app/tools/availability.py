@@ -5,13 +5,15 @@ from __future__ import annotations
 import asyncio
 import logging
 from dataclasses import dataclass, field
-from typing import Any, FrozenSet, Iterable, Set
+from typing import Any, Coroutine, FrozenSet, Iterable, Set, TypeVar
 
 from ..config import GrafanaConfig
-from ..grafana_client import GrafanaAPIError, GrafanaClient
+from ..grafana_client import GrafanaAPIError, GrafanaClient, aclose_shared_clients
 
 LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 
 def _normalize_items(values: Iterable[Any]) -> FrozenSet[str]:
     normalized: Set[str] = set()
@@ -136,10 +138,14 @@ async def _fetch_plugin_ids(client: GrafanaClient) -> Set[str]:
 
 async def _collect_capabilities(config: GrafanaConfig) -> GrafanaCapabilities:
     client = GrafanaClient(config)
-    datasource_types, plugin_ids = await asyncio.gather(
-        _fetch_datasource_types(client),
-        _fetch_plugin_ids(client),
-    )
+    try:
+        datasource_types, plugin_ids = await asyncio.gather(
+            _fetch_datasource_types(client),
+            _fetch_plugin_ids(client),
+        )
+    finally:
+        # Detection runs on a throwaway loop; do not leave its pool behind.
+        await aclose_shared_clients()
     LOGGER.debug(
         "Detected Grafana capabilities",
         extra={
@@ -152,6 +158,16 @@ async def _collect_capabilities(config: GrafanaConfig) -> GrafanaCapabilities:
         plugin_ids=frozenset(plugin_ids))
 
 
+def _run_in_new_loop(coro: Coroutine[Any, Any, _T]) -> _T:
+    """Run *coro* to completion on a private event loop and close it."""
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
 def detect_capabilities(config: GrafanaConfig) -> GrafanaCapabilities:
     """Synchronously detect Grafana capabilities for tool registration."""
 
@@ -162,16 +178,13 @@ def detect_capabilities(config: GrafanaConfig) -> GrafanaCapabilities:
         if "asyncio.run" not in message:
             LOGGER.warning("Capability detection failed", exc_info=True)
             return GrafanaCapabilities()
-        loop = asyncio.new_event_loop()
         try:
-            return loop.run_until_complete(_collect_capabilities(config))
+            return _run_in_new_loop(_collect_capabilities(config))
         except Exception:  # pragma: no cover - defensive
             LOGGER.warning(
                 "Capability detection failed inside fallback loop",
                 exc_info=True)
             return GrafanaCapabilities()
-        finally:
-            loop.close()
     except Exception:  # pragma: no cover - defensive
         LOGGER.warning("Capability detection failed", exc_info=True)
         return GrafanaCapabilities()
@@ -5,38 +5,68 @@ from __future__ import annotations
 import copy
 import os
 import re
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 
 from pydantic import BaseModel, ConfigDict, Field
 
 from mcp.server.fastmcp import Context, FastMCP
 
+from .. import _json
 from ..context import get_grafana_config
 from ..grafana_client import GrafanaAPIError, GrafanaClient
 
 
 _CACHE_KEY = "_dashboard_payload_cache"
+# Per-session bound on cached dashboards and how long an entry stays fresh.
+_CACHE_MAX_ENTRIES = 128
+_CACHE_TTL_SECONDS = 60.0
 
 
-def _dashboard_cache(ctx: Context) -> Dict[str, Any]:
+def _json_clone(payload: Any) -> Any:
+    """Deep-copy JSON-shaped data, via an orjson round trip when available."""
+
+    try:
+        encoded = _json.dumps(payload)
+    except ValueError:
+        # NaN or infinities would not survive the round trip.
+        encoded = None
+    if encoded is not None:
+        return _json.loads(encoded)
+    return copy.deepcopy(payload)
+
+
+def _dashboard_cache(ctx: Context) -> OrderedDict[str, Tuple[float, Dict[str, Any]]]:
     session = ctx.request_context.session
     cache = getattr(session, _CACHE_KEY, None)
     if cache is None:
-        cache = {}
+        cache = OrderedDict()
         setattr(session, _CACHE_KEY, cache)
     return cache
 
 
 def _cache_dashboard(ctx: Context, uid: str, payload: Dict[str, Any]) -> None:
     cache = _dashboard_cache(ctx)
-    cache[uid] = copy.deepcopy(payload)
+    cache[uid] = (time.monotonic() + _CACHE_TTL_SECONDS, _json_clone(payload))
+    cache.move_to_end(uid)
+    while len(cache) > _CACHE_MAX_ENTRIES:
+        cache.popitem(last=False)
 
 
 def _cached_dashboard(ctx: Context, uid: str) -> Optional[Dict[str, Any]]:
     cache = _dashboard_cache(ctx)
-    payload = cache.get(uid)
-    return copy.deepcopy(payload) if isinstance(payload, dict) else None
+    entry = cache.get(uid)
+    if entry is None:
+        return None
+    expires_at, payload = entry
+    if expires_at <= time.monotonic():
+        del cache[uid]
+        return None
+    cache.move_to_end(uid)
+    return _json_clone(payload)
 
 
 async def _get_dashboard(ctx: Context, uid: str, *, use_cache: bool = True) -> Dict[str, Any]:
@@ -50,7 +80,7 @@ async def _get_dashboard(ctx: Context, uid: str, *, use_cache: bool = True) -> D
     if not isinstance(dashboard, dict):
         raise ValueError("Unexpected Grafana response when fetching dashboard")
     _cache_dashboard(ctx, uid, dashboard)
-    return copy.deepcopy(dashboard)
+    return _json_clone(dashboard)
 
 
 async def _post_dashboard(
@@ -161,7 +191,7 @@ def _apply_dashboard_defaults(dashboard_obj: Dict[str, Any]) -> None:
                     datasource["uid"] = prom_uid
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class JSONPathSegment:
     key: str
     index: int = 0
@@ -170,37 +200,44 @@ class JSONPathSegment:
     is_wildcard: bool = False
 
 
-_SEGMENT_RE = re.compile(r"([^.\\[\\]/]+)(?:\\[((?:\\d+)|\*)\\])?(?:(/-))?")
+_SEGMENT_RE = re.compile(r"([^.\[\]/]+)(?:\[(\d+|\*)\])?(/-)?", re.ASCII)
 
 
-def _parse_json_path(path: str) -> List[JSONPathSegment]:
+@lru_cache(maxsize=256)
+def _parse_json_path(path: str) -> Tuple[JSONPathSegment, ...]:
+    """Split a JSONPath into segments; results are immutable and cached."""
+
     if path.startswith("$."):
         path = path[2:]
     path = path.lstrip(".")
     segments: List[JSONPathSegment] = []
-    for match in _SEGMENT_RE.finditer(path):
-        key = match.group(1)
-        if not key:
-            continue
-        index_str = match.group(2)
-        is_append = bool(match.group(3))
-        segment = JSONPathSegment(key=key)
-        if index_str is not None:
-            segment.is_array = True
-            if index_str == "*":
-                segment.is_wildcard = True
-            else:
-                try:
-                    segment.index = int(index_str)
-                except ValueError as exc:  # pragma: no cover - defensive
-                    raise ValueError(
-                        f"Invalid array index in JSONPath: {index_str}") from exc
-        segment.is_append = is_append
-        if segment.is_append and segment.is_wildcard:
+    # Tokenize left to right: each segment must start exactly where the
+    # previous one (plus its "." separator) ended.
+    pos, end = 0, len(path)
+    while pos < end:
+        match = _SEGMENT_RE.match(path, pos)
+        if match is None:
+            raise ValueError(f"Invalid JSONPath segment at offset {pos}: {path!r}")
+        key, index_str, append = match.groups()
+        pos = match.end()
+        if pos < end:
+            if path[pos] != ".":
+                raise ValueError(f"Invalid JSONPath segment at offset {pos}: {path!r}")
+            pos += 1
+        is_array = index_str is not None
+        is_wildcard = index_str == "*"
+        is_append = bool(append)
+        if is_append and is_wildcard:
             raise ValueError(
                 "Cannot combine append syntax with wildcard JSONPath segments")
-        segments.append(segment)
-    return segments
+        segments.append(JSONPathSegment(
+            key=key,
+            index=int(index_str) if is_array and not is_wildcard else 0,
+            is_array=is_array,
+            is_append=is_append,
+            is_wildcard=is_wildcard,
+        ))
+    return tuple(segments)
 
 
 def _validate_array(current: Dict[str, Any],
@@ -241,9 +278,7 @@ def _navigate_segment(
 def _set_at_segment(current: Dict[str, Any],
                     segment: JSONPathSegment, value: Any) -> None:
     if segment.is_append:
-        arr = _validate_array(current, segment)
-        arr.append(value)
-        current[segment.key] = arr
+        _validate_array(current, segment).append(value)
         return
     if segment.is_wildcard:
         raise ValueError(
@@ -324,6 +359,22 @@ def _normalize_patch_operations(
     return normalized
 
 
+def _patch_set(data: Dict[str, Any], path: str, operation: Mapping[str, Any]) -> None:
+    _apply_json_path(data, path, operation.get("value"), remove=False)
+
+
+def _patch_remove(data: Dict[str, Any], path: str, operation: Mapping[str, Any]) -> None:
+    _apply_json_path(data, path, None, remove=True)
+
+
+# ``add`` and ``replace`` share semantics: both assign (or append) at the path.
+_PATCH_HANDLERS = {
+    "add": _patch_set,
+    "replace": _patch_set,
+    "remove": _patch_remove,
+}
+
+
 async def _update_dashboard_with_patches(
     ctx: Context,
     uid: str,
@@ -337,19 +388,18 @@ async def _update_dashboard_with_patches(
     dashboard_obj = source.get("dashboard")
     if not isinstance(dashboard_obj, dict):
         raise ValueError("Dashboard payload does not contain a JSON object")
-    working_copy: Dict[str, Any] = copy.deepcopy(dashboard_obj)
+    working_copy: Dict[str, Any] = _json_clone(dashboard_obj)
     for idx, operation in enumerate(normalized_operations):
         op = str(operation.get("op", ""))
         path = str(operation.get("path", ""))
         if not op or not path:
             raise ValueError(f"Operation {idx} missing op or path")
-        if op not in {"replace", "add", "remove"}:
+        handler = _PATCH_HANDLERS.get(op)
+        if handler is None:
             raise ValueError(
                 f"Unsupported patch operation '{op}' at index {idx}")
-        remove = op == "remove"
-        value = operation.get("value") if not remove else None
         try:
-            _apply_json_path(working_copy, path, value, remove)
+            handler(working_copy, path, operation)
         except Exception as exc:  # pragma: no cover - defensive
             raise ValueError(
                 f"Failed to apply operation {idx} ({op} {path}): {exc}") from exc
@@ -465,54 +515,50 @@ async def _get_panel_queries(ctx: Context, uid: str, *, use_cache: bool = True)
     return results
 
 
+def _walk_json_path(
+        value: Any, segments: Sequence[JSONPathSegment], position: int = 0) -> Iterator[Any]:
+    """Yield every value reached by ``segments[position:]``, depth first."""
+
+    if position == len(segments):
+        yield value
+        return
+    segment = segments[position]
+    if not isinstance(value, dict):
+        raise ValueError(
+            f"Segment '{segment.key}' at position {position} cannot be applied to non-object value"
+        )
+    if segment.is_append:
+        raise ValueError(
+            "Append syntax is not supported when evaluating JSONPath expressions")
+    if segment.key not in value:
+        raise ValueError(
+            f"Field '{segment.key}' not found while evaluating JSONPath")
+    child = value[segment.key]
+    if not segment.is_array:
+        yield from _walk_json_path(child, segments, position + 1)
+        return
+    if not isinstance(child, list):
+        raise ValueError(f"Field '{segment.key}' is not an array")
+    if segment.is_wildcard:
+        for item in child:
+            yield from _walk_json_path(item, segments, position + 1)
+        return
+    if not (0 <= segment.index < len(child)):
+        raise ValueError(
+            f"Index {segment.index} out of bounds for array '{segment.key}' (length {len(child)})"
+        )
+    yield from _walk_json_path(child[segment.index], segments, position + 1)
+
+
 def _evaluate_json_path(data: Dict[str, Any], path: str) -> Any:
     segments = _parse_json_path(path)
     if not segments:
         raise ValueError("JSONPath cannot be empty")
 
-    current_values: List[Any] = [data]
-    for idx, segment in enumerate(segments):
-        next_values: List[Any] = []
-        for value in current_values:
-            if not isinstance(value, dict):
-                raise ValueError(
-                    f"Segment '{segment.key}' at position {idx} cannot be applied to non-object value"
-                )
-
-            if segment.is_array:
-                if segment.key not in value:
-                    raise ValueError(
-                        f"Field '{segment.key}' not found while evaluating JSONPath")
-                array_value = value.get(segment.key)
-                if not isinstance(array_value, list):
-                    raise ValueError(f"Field '{segment.key}' is not an array")
-                if segment.is_append:
-                    raise ValueError(
-                        "Append syntax is not supported when evaluating JSONPath expressions")
-                if segment.is_wildcard:
-                    next_values.extend(array_value)
-                else:
-                    if not (0 <= segment.index < len(array_value)):
-                        raise ValueError(
-                            f"Index {segment.index} out of bounds for array '{segment.key}' (length {len(array_value)})"
-                        )
-                    next_values.append(array_value[segment.index])
-            else:
-                if segment.is_append:
-                    raise ValueError(
-                        "Append syntax is not supported when evaluating JSONPath expressions")
-                if segment.key not in value:
-                    raise ValueError(
-                        f"Field '{segment.key}' not found while evaluating JSONPath")
-                next_values.append(value.get(segment.key))
-
-        current_values = next_values
-
-    if not current_values:
-        return []
-    if len(current_values) == 1:
-        return current_values[0]
-    return current_values
+    values = list(_walk_json_path(data, segments))
+    if len(values) == 1:
+        return values[0]
+    return values
 
 
 def _safe_string(data: Dict[str, Any], key: str) -> str:
@@ -598,25 +644,22 @@ def _extract_basic_dashboard_info(
 
 def _build_summary(
         uid: str, dashboard: Dict[str, Any], meta: Any) -> Dict[str, Any]:
+    panels = _safe_array(dashboard, "panels") or ()
     summary: Dict[str, Any] = {
         "uid": uid,
-        "panels": [],
-        "panelCount": 0,
+        "panels": [_extract_panel_summary(panel) for panel in panels if isinstance(panel, dict)],
+        "panelCount": len(panels),
         "timeRange": _extract_time_range(dashboard),
     }
     _extract_basic_dashboard_info(dashboard, summary)
 
-    panels = _safe_array(dashboard, "panels") or []
-    summary["panelCount"] = len(panels)
-    summary["panels"] = [_extract_panel_summary(
-        panel) for panel in panels if isinstance(panel, dict)]
-
     templating = _safe_object(dashboard, "templating")
-    variables: List[Dict[str, Any]] = []
-    if templating:
-        for variable in _safe_array(templating, "list") or []:
-            if isinstance(variable, dict):
-                variables.append(_extract_variable_summary(variable))
+    variable_list = _safe_array(templating, "list") if templating else None
+    variables = [
+        _extract_variable_summary(variable)
+        for variable in variable_list or ()
+        if isinstance(variable, dict)
+    ]
     if variables:
         summary["variables"] = variables
 
@@ -666,8 +709,7 @@ def register(app: FastMCP) -> None:
         if ctx is None:
             raise ValueError("Context injection failed for update_dashboard")
 
-        dashboard_payload = copy.deepcopy(
-            dashboard) if dashboard is not None else None
+        dashboard_payload = _json_clone(dashboard) if dashboard is not None else None
         if dashboard_payload is not None:
             _apply_dashboard_defaults(dashboard_payload)
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Dict, List, Optional
 
 import httpx
@@ -166,12 +167,18 @@ async def _current_oncall_users(
     oncall = schedule.get("on_call_now")
     users: List[Dict[str, Any]] = []
     if isinstance(oncall, list):
-        for user_id in oncall:
-            try:
-                user = await _get_user(ctx, str(user_id))
-            except Exception:  # pragma: no cover - defensive
+        # User lookups are independent; fetch them concurrently, keeping order
+        # and skipping any that fail.
+        results = await asyncio.gather(
+            *(_get_user(ctx, str(user_id)) for user_id in oncall),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
                 continue
-            users.append(user)
+            users.append(result)
     return {
         "scheduleId": schedule.get("id"),
         "scheduleName": schedule.get("name"),
@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-import asyncio
 import re
+from asyncio import sleep as _sleep
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
@@ -14,9 +14,11 @@ from ..grafana_client import GrafanaClient
 
 
 _BASE_PATH = "/plugins/grafana-ml-app/resources/sift/api/v1"
+_DEFAULT_WINDOW = timedelta(minutes=30)
 
 _DURATION_RE = re.compile(
     r"(?P<value>\d+(?:\.\d+)?)(?P<unit>ns|us|µs|ms|s|m|h|d)")
+_DURATION_EXPR_RE = re.compile(f"(?:{_DURATION_RE.pattern})+")
 _UNIT_SECONDS = {
     "ns": 1e-9,
     "us": 1e-6,
@@ -37,7 +39,7 @@ def _time_range(start: Optional[datetime],
                 end: Optional[datetime]) -> tuple[datetime,
                                                   datetime]:
     end_dt = end or _now()
-    start_dt = start or end_dt - timedelta(minutes=30)
+    start_dt = start or end_dt - _DEFAULT_WINDOW
     if start_dt >= end_dt:
         raise ValueError("start time must be before end time")
     return start_dt, end_dt
@@ -133,7 +135,7 @@ async def _wait_for_completion(
         if _now() > deadline:
             raise TimeoutError(
                 "Timed out waiting for Sift investigation to finish")
-        await asyncio.sleep(5)
+        await _sleep(5)
 
 
 def _find_analysis(analyses: List[Dict[str, Any]],
@@ -162,10 +164,10 @@ def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
             raise ValueError(
                 "Relative time expressions must include a duration (e.g. now-5m)")
         total_seconds = 0.0
-        for match in _DURATION_RE.finditer(duration_expr):
-            unit = match.group("unit")
-            factor = _UNIT_SECONDS[unit]
-            total_seconds += float(match.group("value")) * factor
+        if _DURATION_EXPR_RE.fullmatch(duration_expr):
+            total_seconds = sum(
+                float(amount) * _UNIT_SECONDS[unit]
+                for amount, unit in _DURATION_RE.findall(duration_expr))
         if total_seconds == 0.0:
             raise ValueError(
                 f"Unable to parse duration expression '{duration_expr}'")
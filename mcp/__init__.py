@@ -17,7 +17,6 @@ import importlib.metadata as metadata
 import importlib.util
 import os
 import sys
-from pathlib import Path
 from types import ModuleType
 
 _FORCE_STUB_ENV = "GRAFANA_FASTMCP_USE_STUB"
@@ -34,6 +33,23 @@ def _should_use_stub() -> bool:
     return normalized not in {"", "0", "false", "no"}
 
 
+def _is_stub_init(init_file: str) -> bool:
+    """Return ``True`` when ``init_file`` is this vendored ``__init__`` module.
+
+    Installing this project as a wheel can place the stubs where the upstream
+    distribution lives, so loading that path again would recurse into us.  A
+    raw string comparison settles the usual case; a single ``stat`` catches
+    symlinked layouts without resolving every path component.
+    """
+
+    if init_file == __file__:
+        return True
+    try:
+        return os.path.samestat(os.stat(init_file), os.stat(__file__))
+    except OSError:
+        return False
+
+
 def _load_real_mcp() -> ModuleType | None:
     """Attempt to load the upstream :mod:`mcp` package from site-packages."""
 
@@ -42,15 +58,15 @@ def _load_real_mcp() -> ModuleType | None:
     except metadata.PackageNotFoundError:
         return None
 
-    package_root = Path(distribution.locate_file("mcp"))
-    init_file = package_root / "__init__.py"
-    if not init_file.exists():
+    package_root = os.fspath(distribution.locate_file("mcp"))
+    init_file = os.path.join(package_root, "__init__.py")
+    if not os.path.isfile(init_file) or _is_stub_init(init_file):
         return None
 
     spec = importlib.util.spec_from_file_location(
         __name__,
         init_file,
-        submodule_search_locations=[str(package_root)],
+        submodule_search_locations=[package_root],
     )
     if spec is None or spec.loader is None:
         return None
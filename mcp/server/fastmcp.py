@@ -7,8 +7,11 @@ import inspect
 import json
 import logging
 import sys
+import weakref
 from collections.abc import Mapping as ABCMapping, Sequence as ABCSequence
+from contextlib import AbstractAsyncContextManager, AsyncExitStack
 from dataclasses import dataclass, field
+from functools import lru_cache
 from types import SimpleNamespace
 try:  # pragma: no cover - Python < 3.10 fallback
     from types import UnionType  # type: ignore[attr-defined]
@@ -24,20 +27,70 @@ from typing import (
     Optional,
     Sequence,
     Tuple,
+    Union,
     get_args,
     get_origin,
     get_type_hints,
 )
 
-
-@dataclass
+try:  # pragma: no cover - optional speedup
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None  # type: ignore[assignment]
+
+_LOGGER = logging.getLogger(__name__)
+_STDIO_LOGGER = logging.getLogger("mcp.stdio")
+
+_EMPTY = inspect.Parameter.empty
+_VAR_POSITIONAL = inspect.Parameter.VAR_POSITIONAL
+_VAR_KEYWORD = inspect.Parameter.VAR_KEYWORD
+
+_UNION_ORIGINS: Tuple[Any, ...] = (
+    (Union,) if UnionType is None else (Union, UnionType))
+_ARRAY_ORIGINS: Tuple[Any, ...] = (list, List, Sequence, ABCSequence)
+_MAPPING_ORIGINS: Tuple[Any, ...] = (dict, Dict, Mapping, ABCMapping)
+
+# Direct lookups for the common scalar/container annotations.  The schemas are
+# shared (see ``_annotation_to_schema``) and must not be mutated.
+_STRING_SCHEMA: Dict[str, Any] = {"type": "string"}
+_INTEGER_SCHEMA: Dict[str, Any] = {"type": "integer"}
+_BOOLEAN_SCHEMA: Dict[str, Any] = {"type": "boolean"}
+_NUMBER_SCHEMA: Dict[str, Any] = {"type": "number"}
+_ARRAY_SCHEMA: Dict[str, Any] = {"type": "array", "items": {}}
+_OBJECT_SCHEMA: Dict[str, Any] = {"type": "object"}
+
+_STR_TO_SCHEMA: Dict[str, Dict[str, Any]] = {
+    "str": _STRING_SCHEMA,
+    "string": _STRING_SCHEMA,
+    "int": _INTEGER_SCHEMA,
+    "integer": _INTEGER_SCHEMA,
+    "bool": _BOOLEAN_SCHEMA,
+    "boolean": _BOOLEAN_SCHEMA,
+    "float": _NUMBER_SCHEMA,
+    "double": _NUMBER_SCHEMA,
+    "list": _ARRAY_SCHEMA,
+    "sequence": _ARRAY_SCHEMA,
+}
+_TYPE_TO_SCHEMA: Dict[Any, Dict[str, Any]] = {
+    str: _STRING_SCHEMA,
+    bool: _BOOLEAN_SCHEMA,
+    int: _INTEGER_SCHEMA,
+    float: _NUMBER_SCHEMA,
+    list: _ARRAY_SCHEMA,
+    ABCSequence: _ARRAY_SCHEMA,
+    dict: _OBJECT_SCHEMA,
+    ABCMapping: _OBJECT_SCHEMA,
+}
+
+
+@dataclass(slots=True)
 class Context:
     """Very small stand-in for the real MCP request context."""
 
     request_context: SimpleNamespace
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolDefinition:
     """Represents a registered tool with metadata for discovery."""
 
@@ -48,14 +101,68 @@ class ToolDefinition:
     parameters: Dict[str, Any]
     function: Callable[..., Awaitable[Any]]
     signature: inspect.Signature = field(repr=False)
+    is_coroutine: bool = field(default=True, repr=False)
+    accepts_ctx: bool = field(default=False, repr=False)
+    # ``(name, required)`` for every argument a client may pass, derived from
+    # ``signature`` once at registration.
+    argument_spec: Tuple[Tuple[str, bool], ...] = field(default=(), repr=False)
+    accepts_var_kwargs: bool = field(default=False, repr=False)
+
+
+def _argument_spec(
+        signature: inspect.Signature) -> Tuple[Tuple[Tuple[str, bool], ...], bool]:
+    """Return the client-facing arguments of ``signature`` and ``**kwargs`` support."""
+
+    spec = []
+    accepts_var_kwargs = False
+    for name, parameter in signature.parameters.items():
+        kind = parameter.kind
+        if kind is _VAR_KEYWORD:
+            accepts_var_kwargs = True
+            continue
+        if name == "ctx" or kind is _VAR_POSITIONAL:
+            continue
+        spec.append((name, parameter.default is _EMPTY))
+    return tuple(spec), accepts_var_kwargs
 
 
 def _annotation_to_schema(annotation: Any) -> Dict[str, Any]:
-    """Convert a Python annotation into a JSON-schema-ish mapping."""
+    """Convert a Python annotation into a JSON-schema-ish mapping.
+
+    Results are memoized per annotation and shared, so callers must treat the
+    returned mapping as read-only (``_build_schema`` copies it per tool).
+    """
+
+    try:
+        return _cached_annotation_schema(annotation)
+    except TypeError:  # unhashable annotation (e.g. Annotated with a dict)
+        return _annotation_to_schema_uncached(annotation)
+
+
+def _copy_schema(schema: Any) -> Any:
+    """Return ``schema`` with every nested dict and list freshly allocated."""
 
-    if annotation is inspect._empty or annotation is Any:
+    if isinstance(schema, dict):
+        return {key: _copy_schema(value) for key, value in schema.items()}
+    if isinstance(schema, list):
+        return [_copy_schema(value) for value in schema]
+    return schema
+
+
+@lru_cache(maxsize=None)
+def _cached_annotation_schema(annotation: Any) -> Dict[str, Any]:
+    return _annotation_to_schema_uncached(annotation)
+
+
+def _annotation_to_schema_uncached(annotation: Any) -> Dict[str, Any]:
+    if annotation is _EMPTY or annotation is Any:
         return {}
 
+    if isinstance(annotation, type):
+        hit = _TYPE_TO_SCHEMA.get(annotation)
+        if hit is not None:
+            return hit
+
     if isinstance(annotation, str):
         normalized = annotation.strip()
         if normalized.startswith("typing."):
@@ -67,14 +174,9 @@ def _annotation_to_schema(annotation: Any) -> Dict[str, Any]:
             inner = normalized[len("Optional["): -1]
             return _annotation_to_schema(inner)
         lower = normalized.lower()
-        if lower in {"str", "string"}:
-            return {"type": "string"}
-        if lower in {"int", "integer"}:
-            return {"type": "integer"}
-        if lower in {"bool", "boolean"}:
-            return {"type": "boolean"}
-        if lower in {"float", "double"}:
-            return {"type": "number"}
+        hit = _STR_TO_SCHEMA.get(lower)
+        if hit is not None:
+            return hit
         if lower.startswith(("list[", "sequence[")):
             open_bracket = normalized.find("[")
             close_bracket = normalized.rfind("]")
@@ -85,8 +187,6 @@ def _annotation_to_schema(annotation: Any) -> Dict[str, Any]:
             items_schema = _annotation_to_schema(
                 item_annotation) if item_annotation else {}
             return {"type": "array", "items": items_schema or {}}
-        if lower in {"list", "sequence"}:
-            return {"type": "array", "items": {}}
         if lower.startswith(("dict[", "dict", "mapping[", "mapping")):
             return {"type": "object"}
         return {}
@@ -94,12 +194,7 @@ def _annotation_to_schema(annotation: Any) -> Dict[str, Any]:
     origin = get_origin(annotation)
     args = get_args(annotation)
 
-    union_origin = getattr(__import__("typing"), "Union", None)
-    union_types = {union_origin}
-    if UnionType is not None:
-        union_types.add(UnionType)
-
-    if origin in union_types:
+    if origin in _UNION_ORIGINS:
         non_none = [arg for arg in args if arg is not type(None)]  # noqa: E721
         schemas = [
             schema for schema in (
@@ -110,16 +205,11 @@ def _annotation_to_schema(annotation: Any) -> Dict[str, Any]:
             return schemas[0]
         return {"anyOf": schemas}
 
-    if annotation in {str, "".__class__}:
-        return {"type": "string"}
-    if annotation is bool:
-        return {"type": "boolean"}
-    if annotation is int or (origin is int and not args):
-        return {"type": "integer"}
-    if annotation is float or (origin is float and not args):
-        return {"type": "number"}
-    array_origins: Tuple[Any, ...] = (list, List, Sequence, ABCSequence)
-    if annotation in array_origins or origin in array_origins:
+    if origin is int and not args:
+        return _INTEGER_SCHEMA
+    if origin is float and not args:
+        return _NUMBER_SCHEMA
+    if annotation in _ARRAY_ORIGINS or origin in _ARRAY_ORIGINS:
         item_schema: Dict[str, Any] = {}
         if args:
             if len(args) == 1:
@@ -132,13 +222,33 @@ def _annotation_to_schema(annotation: Any) -> Dict[str, Any]:
                 if not item_schema["anyOf"]:
                     item_schema = {}
         return {"type": "array", "items": item_schema or {}}
-    mapping_origins: Tuple[Any, ...] = (dict, Dict, Mapping, ABCMapping)
-    if annotation in mapping_origins or origin in mapping_origins:
+    if annotation in _MAPPING_ORIGINS or origin in _MAPPING_ORIGINS:
         return {"type": "object"}
 
     return {}
 
 
+_SIGNATURE_CACHE: "weakref.WeakKeyDictionary[Callable[..., Any], inspect.Signature]" = (
+    weakref.WeakKeyDictionary())
+
+
+def _signature_of(func: Callable[..., Any]) -> inspect.Signature:
+    """Return ``inspect.signature(func)``, memoized per function object."""
+
+    try:
+        return _SIGNATURE_CACHE[func]
+    except KeyError:
+        signature = inspect.signature(func)
+        _SIGNATURE_CACHE[func] = signature
+        return signature
+    except TypeError:  # not weak-referenceable
+        return inspect.signature(func)
+
+
+# Marker used by ``FastMCP._normalize_schema`` to flag keys that must be removed.
+_DROP = object()
+
+
 class FastMCP:
     """Tiny FastMCP façade for registering tools and listing them in tests."""
 
@@ -155,11 +265,15 @@ class FastMCP:
         streamable_http_path: str = "/mcp",
         log_level: str = "INFO",
         debug: bool = False,
+        lifespan: Optional[Callable[["FastMCP"], AbstractAsyncContextManager[Any]]] = None,
     ) -> None:
         self.name = name
         self.instructions = instructions
         self.debug = debug
         self._tools: List[ToolDefinition] = []
+        self._tools_by_name: Dict[str, ToolDefinition] = {}
+        self._tools_snapshot: Optional[Tuple[ToolDefinition, ...]] = None
+        self._tools_list_cache: Optional[List[Dict[str, Any]]] = None
         self._run_calls: List[tuple[str, Optional[str]]] = []
         self.settings = SimpleNamespace(
             host=host,
@@ -169,8 +283,9 @@ class FastMCP:
             sse_path=sse_path,
             message_path=message_path,
             streamable_http_path=streamable_http_path,
+            lifespan=lifespan,
         )
-        self._logger = logging.getLogger(__name__)
+        self._logger = _LOGGER
 
     # Decorator --------------------------------------------------------------
     def tool(
@@ -185,6 +300,8 @@ class FastMCP:
         def decorator(func: Callable[..., Awaitable[Any]]
                       ) -> Callable[..., Awaitable[Any]]:
             schema = self._normalize_schema(self._build_schema(func))
+            signature = _signature_of(func)
+            argument_spec, accepts_var_kwargs = _argument_spec(signature)
             tool_def = ToolDefinition(
                 name=name,
                 title=title,
@@ -192,16 +309,28 @@ class FastMCP:
                 inputSchema=schema,
                 parameters=schema,
                 function=func,
-                signature=inspect.signature(func),
+                signature=signature,
+                is_coroutine=inspect.iscoroutinefunction(func),
+                accepts_ctx="ctx" in signature.parameters,
+                argument_spec=argument_spec,
+                accepts_var_kwargs=accepts_var_kwargs,
             )
             self._tools.append(tool_def)
+            self._tools_by_name[name] = tool_def
+            self._tools_snapshot = None
+            self._tools_list_cache = None
             return func
 
         return decorator
 
     # Discovery --------------------------------------------------------------
-    async def list_tools(self) -> List[ToolDefinition]:
-        return list(self._tools)
+    async def list_tools(self) -> Tuple[ToolDefinition, ...]:
+        # Registration happens at startup, so the immutable snapshot is
+        # rebuilt at most once after the last ``tool()`` call.
+        snapshot = self._tools_snapshot
+        if snapshot is None:
+            snapshot = self._tools_snapshot = tuple(self._tools)
+        return snapshot
 
     # Execution --------------------------------------------------------------
     def run(self, transport: str, *, mount_path: Optional[str] = None) -> None:
@@ -224,29 +353,29 @@ class FastMCP:
     # Schema generation ------------------------------------------------------
     def _build_schema(
             self, func: Callable[..., Awaitable[Any]]) -> Dict[str, Any]:
-        signature = inspect.signature(func)
+        signature = _signature_of(func)
         try:
             type_hints = get_type_hints(func, include_extras=True)
         except Exception:  # pragma: no cover - defensive fallback
             type_hints = {}
         properties: Dict[str, Dict[str, Any]] = {}
-        required: List[str] = []
+        required: Optional[List[str]] = None
 
         for name, param in signature.parameters.items():
             if name == "ctx":
                 continue
-            if param.kind in {
-                    inspect.Parameter.VAR_POSITIONAL,
-                    inspect.Parameter.VAR_KEYWORD}:
+            kind = param.kind
+            if kind is _VAR_POSITIONAL or kind is _VAR_KEYWORD:
                 continue
 
+            # The memoized schemas are shared between tools, so each property
+            # gets its own copy that consumers may safely mutate.
             annotation = type_hints.get(name, param.annotation)
-            schema = _annotation_to_schema(annotation)
-            if param.kind is inspect.Parameter.KEYWORD_ONLY and not schema:
-                schema = {}
-            properties[name] = schema
+            properties[name] = _copy_schema(_annotation_to_schema(annotation))
 
-            if param.default is inspect._empty and param.kind is not inspect.Parameter.VAR_KEYWORD:
+            if param.default is _EMPTY:
+                if required is None:
+                    required = []
                 required.append(name)
 
         schema: Dict[str, Any] = {"type": "object", "properties": properties}
@@ -272,68 +401,134 @@ class FastMCP:
                     "null"],
             }
 
+        # Nodes are normalized bottom-up from an explicit worklist rather than
+        # by recursion; ``results`` maps ``id(node)`` to its normalized form.
+        results: Dict[int, Dict[str, Any]] = {}
+
         def normalize(node: Any) -> Dict[str, Any]:
             if not isinstance(node, dict):
                 return {"type": "object", "properties": {}}
+            return results[id(node)]
 
-            normalized: Dict[str, Any] = dict(node)
-            schema_type = normalized.get("type")
+        def has_array_type(schema_type: Any) -> bool:
+            if isinstance(schema_type, list):
+                return "array" in schema_type
+            return schema_type == "array"
+
+        def child_schemas(node: Dict[str, Any]) -> List[Dict[str, Any]]:
+            children: List[Any] = []
+            schema_type = node.get("type")
+            if has_array_type(schema_type):
+                items = node.get("items")
+                if isinstance(items, list):
+                    children.extend(items)
+                elif isinstance(items, dict):
+                    children.append(items)
+            elif schema_type == "object":
+                properties = node.get("properties")
+                if isinstance(properties, dict):
+                    children.extend(properties.values())
+            for key in ("anyOf", "oneOf", "allOf"):
+                options = node.get(key)
+                if isinstance(options, list):
+                    children.extend(options)
+            return [child for child in children if isinstance(child, dict)]
+
+        def normalize_list(options: List[Any]) -> List[Any]:
+            normalized_options = [normalize(option) for option in options]
+            if len(normalized_options) == len(options) and all(
+                    new is old for new, old in zip(normalized_options, options)):
+                return options
+            return normalized_options
+
+        def normalize_items(items: Any) -> Any:
+            if isinstance(items, list):
+                return normalize_list(items) or fallback_items_schema()
+            if isinstance(items, dict):
+                return normalize(items)
+            return fallback_items_schema()
+
+        def normalize_node(node: Dict[str, Any]) -> Dict[str, Any]:
+            # Copy-on-write: collect fixups first and hand back ``node`` itself
+            # when it is already well formed, so schemas emitted by
+            # ``_build_schema`` are not re-copied at registration time.
+            updates: Dict[str, Any] = {}
+            schema_type = node.get("type")
 
             if isinstance(schema_type, list):
                 if "array" in schema_type:
-                    items = normalized.get("items")
-                    if isinstance(items, list):
-                        normalized["items"] = [
-                            normalize(item) for item in items] or fallback_items_schema()
-                    elif isinstance(items, dict):
-                        normalized["items"] = normalize(items)
-                    else:
-                        normalized["items"] = fallback_items_schema()
+                    updates["items"] = normalize_items(node.get("items"))
             elif schema_type == "array":
-                items = normalized.get("items")
-                if isinstance(items, list):
-                    normalized["items"] = [
-                        normalize(item) for item in items] or fallback_items_schema()
-                elif isinstance(items, dict):
-                    normalized["items"] = normalize(items)
-                else:
-                    normalized["items"] = fallback_items_schema()
+                updates["items"] = normalize_items(node.get("items"))
             elif schema_type == "object":
-                properties = normalized.get("properties")
+                properties = node.get("properties")
                 if isinstance(properties, dict):
-                    normalized["properties"] = {
+                    normalized_properties = {
                         key: normalize(value) for key,
                         value in properties.items()}
+                    if all(normalized_properties[key] is value
+                           for key, value in properties.items()):
+                        normalized_properties = properties
+                    updates["properties"] = normalized_properties
                 else:
-                    normalized["properties"] = {}
+                    updates["properties"] = {}
             else:
                 if not isinstance(schema_type, str):
-                    normalized["type"] = "object"
-                    normalized.setdefault("properties", {})
+                    updates["type"] = "object"
+                    if "properties" not in node:
+                        updates["properties"] = {}
 
             for key in ("anyOf", "oneOf", "allOf"):
-                options = normalized.get(key)
+                options = node.get(key)
                 if isinstance(options, list):
-                    normalized[key] = [
-                        normalize(option) for option in options if isinstance(
-                            option, dict)]
+                    if all(isinstance(option, dict) for option in options):
+                        updates[key] = normalize_list(options)
+                    else:
+                        updates[key] = [
+                            normalize(option) for option in options if isinstance(
+                                option, dict)]
 
-            required = normalized.get("required")
+            required = node.get("required")
             if required is not None:
                 if isinstance(required, list):
                     filtered = [
                         name for name in required if isinstance(
                             name, str)]
-                    if filtered:
-                        normalized["required"] = filtered
-                    else:
-                        normalized.pop("required", None)
+                    if not filtered:
+                        updates["required"] = _DROP
+                    elif len(filtered) != len(required):
+                        updates["required"] = filtered
                 else:
-                    normalized.pop("required", None)
+                    updates["required"] = _DROP
 
+            changed = {
+                key: value for key, value in updates.items()
+                if value is _DROP or key not in node or node[key] is not value}
+            if not changed:
+                return node
+
+            normalized: Dict[str, Any] = dict(node)
+            for key, value in changed.items():
+                if value is _DROP:
+                    normalized.pop(key, None)
+                else:
+                    normalized[key] = value
             return normalized
 
-        return normalize(schema)
+        if not isinstance(schema, dict):
+            return normalize(schema)
+
+        # Pre-order walk; every child lands after its parent, so processing
+        # the list in reverse normalizes children before the nodes using them.
+        order: List[Dict[str, Any]] = []
+        stack: List[Dict[str, Any]] = [schema]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(child_schemas(node))
+        for node in reversed(order):
+            results[id(node)] = normalize_node(node)
+        return results[id(schema)]
 
 
 __all__ = ["Context", "FastMCP", "ToolDefinition"]
@@ -344,94 +539,170 @@ __all__ = ["Context", "FastMCP", "ToolDefinition"]
 
 MCP_PROTOCOL_VERSION = "2025-06-18"
 
+if orjson is not None:
+    # ``orjson.JSONDecodeError`` subclasses ``json.JSONDecodeError``, so the
+    # STDIO loop's error handling is the same for both parsers.
+    _loads = orjson.loads
+
+    def _dumps(payload: Any) -> bytes:
+        try:
+            return orjson.dumps(payload)
+        except TypeError:
+            # Non-string keys or custom types: defer to the stdlib rules.
+            return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+else:  # pragma: no cover - stdlib fallback
+    _loads = json.loads
+
+    def _dumps(payload: Any) -> bytes:
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
 
 class _STDIOHandler:
     """Lightweight STDIO transport for the Python 3.9 shim."""
 
     def __init__(self, app: FastMCP) -> None:
         self._app = app
-        self._logger = logging.getLogger("mcp.stdio")
-        self._tool_map: Dict[str, ToolDefinition] = {
-            tool.name: tool for tool in app._tools}
+        self._logger = _STDIO_LOGGER
         self._context = Context(
             request_context=SimpleNamespace(
                 session=SimpleNamespace()))
         self._initialized = False
+        self._dispatch: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            sys.intern(method): handler
+            for method, handler in (
+                ("initialize", self._handle_initialize),
+                ("ping", self._handle_ping),
+                ("tools/list", self._handle_tools_list),
+                ("tools/call", self._handle_tools_call),
+                ("logging/setLevel", self._handle_set_level),
+            )
+        }
+        # One event loop serves every tool call of the session instead of
+        # ``asyncio.run`` building and tearing one down per request.  It is
+        # created on first use; a finalizer closes it for handlers that are
+        # dropped without ``close()``.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._close_loop: Optional[weakref.finalize] = None
+        # The app's lifespan is entered on that loop when it is created and
+        # exited before it closes, so its cleanup still has a loop to run on.
+        self._lifespan = AsyncExitStack()
 
     # Public API -------------------------------------------------------------
     def run(self) -> None:
-        stdin = sys.stdin
-        for raw_line in stdin:
-            line = raw_line.strip()
-            if not line:
-                continue
-            try:
-                message = json.loads(line)
-            except json.JSONDecodeError as exc:
-                self._logger.warning("Failed to parse STDIO message: %s", exc)
-                self._write_error(None, -32700, f"Parse error: {exc}")
-                continue
+        try:
+            stdin = sys.stdin
+            for raw_line in stdin:
+                line = raw_line.strip()
+                if not line:
+                    continue
+                try:
+                    message = _loads(line)
+                except json.JSONDecodeError as exc:
+                    self._logger.warning("Failed to parse STDIO message: %s", exc)
+                    self._write_error(None, -32700, f"Parse error: {exc}")
+                    continue
 
+                try:
+                    response = self._handle_message(message)
+                    if response is not None:
+                        self._write_response(response)
+                except SystemExit:
+                    raise
+                except Exception as err:  # pragma: no cover - defensive
+                    self._logger.error(
+                        "Unhandled STDIO error: %s", err, exc_info=True)
+                    if isinstance(message, dict) and "id" in message:
+                        self._write_error(message.get("id"), -32603, str(err))
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Shut down the event loop shared by tool invocations."""
+
+        loop = self._loop
+        if loop is None or self._close_loop is None:
+            return
+        self._loop = None
+        if not loop.is_closed():
             try:
-                response = self._handle_message(message)
-                if response is not None:
-                    self._write_response(response)
-            except SystemExit:
-                raise
-            except Exception as err:  # pragma: no cover - defensive
-                self._logger.error(
-                    "Unhandled STDIO error: %s", err, exc_info=True)
-                if isinstance(message, dict) and "id" in message:
-                    self._write_error(message.get("id"), -32603, str(err))
+                loop.run_until_complete(self._lifespan.aclose())
+            finally:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+        self._close_loop()
+
+    def _run_awaitable(self, awaitable: Awaitable[Any]) -> Any:
+        loop = self._loop
+        if loop is None:
+            loop = self._loop = asyncio.new_event_loop()
+            # ``loop.close`` needs no running loop, so the finalizer is safe
+            # even when the handler is collected inside another loop.
+            self._close_loop = weakref.finalize(self, loop.close)
+            lifespan = getattr(self._app.settings, "lifespan", None)
+            if lifespan is not None:
+                loop.run_until_complete(
+                    self._lifespan.enter_async_context(lifespan(self._app)))
+        return loop.run_until_complete(awaitable)
 
     # Message handling -------------------------------------------------------
     def _handle_message(
-            self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            self, message: Any) -> Optional[Dict[str, Any] | List[Dict[str, Any]]]:
+        if isinstance(message, list):
+            return self._handle_batch(message)
+        return self._handle_single(message)
+
+    def _handle_batch(
+            self, messages: List[Any]) -> Optional[Dict[str, Any] | List[Dict[str, Any]]]:
+        # JSON-RPC 2.0 batches are answered with a single array holding the
+        # responses to every request; a batch of notifications yields nothing.
+        # An empty batch is itself invalid and gets one error object, not an array.
+        if not messages:
+            return self._error_response(None, -32600, "Invalid Request")
+        responses = []
+        for message in messages:
+            if not isinstance(message, dict):
+                responses.append(
+                    self._error_response(None, -32600, "Invalid Request"))
+                continue
+            response = self._handle_single(message)
+            if response is not None:
+                responses.append(response)
+        return responses or None
+
+    def _handle_single(
+            self, message: Any) -> Optional[Dict[str, Any]]:
         if not isinstance(message, dict):
             return None
 
         if "method" not in message:
             return None
 
+        request = _JSONRPCRequest.from_message(message)
         if "id" not in message:
-            self._handle_notification(message)
+            self._handle_notification(request)
             return None
 
-        return self._handle_request(message)
+        return self._handle_request(request)
 
-    def _handle_notification(self, message: Dict[str, Any]) -> None:
-        method = message.get("method")
-        if method == "logging/setLevel":
-            params = message.get("params") or {}
-            level = params.get("level")
-            if isinstance(level, str):
-                try:
-                    logging.getLogger().setLevel(level.upper())
-                except Exception:  # pragma: no cover - defensive
-                    self._logger.debug(
-                        "Failed to set log level to %s", level, exc_info=True)
+    def _handle_notification(self, request: _JSONRPCRequest) -> None:
+        if request.method == "logging/setLevel":
+            self._handle_set_level(request.params)
         # Other notifications are currently ignored.
 
-    def _handle_request(self, message: Dict[str, Any]) -> Dict[str, Any]:
-        method = message.get("method")
-        request_id = message.get("id")
-        params = message.get("params") or {}
+    def _handle_request(
+            self, message: _JSONRPCRequest | Dict[str, Any]) -> Dict[str, Any]:
+        request = message if isinstance(
+            message, _JSONRPCRequest) else _JSONRPCRequest.from_message(message)
+        method = request.method
+        request_id = request.id
+        params = request.params
+
+        handler = self._dispatch.get(method) if isinstance(method, str) else None
+        if handler is None:
+            return self._error_response(
+                request_id, -32601, f"Method '{method}' not implemented")
 
         try:
-            if method == "initialize":
-                result = self._handle_initialize(params)
-            elif method == "ping":
-                result = {}
-            elif method == "tools/list":
-                result = self._handle_tools_list(params)
-            elif method == "tools/call":
-                result = self._handle_tools_call(params)
-            elif method == "logging/setLevel":
-                self._handle_notification(message)
-                result = {}
-            else:
-                return self._error_response(
-                    request_id, -32601, f"Method '{method}' not implemented")
+            result = handler(params)
         except _JSONRPCError as exc:
             return self._error_response(
                 request_id, exc.code, exc.message, exc.data)
@@ -474,25 +745,40 @@ class _STDIOHandler:
             "instructions": instructions,
         }
 
+    def _handle_ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {}
+
+    def _handle_set_level(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        level = params.get("level")
+        if isinstance(level, str):
+            try:
+                logging.getLogger().setLevel(level.upper())
+            except Exception:  # pragma: no cover - defensive
+                self._logger.debug(
+                    "Failed to set log level to %s", level, exc_info=True)
+        return {}
+
     def _handle_tools_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
         if not self._initialized:
             raise _JSONRPCError(-32600, "Server not initialized")
 
-        tools_payload = []
-        for tool in self._app._tools:
-            entry = {
-                "name": tool.name,
-                "title": tool.title,
-                "description": tool.description,
-                "inputSchema": tool.inputSchema,
-                "parameters": tool.parameters,
-            }
-            annotations = {}
-            if tool.title:
-                annotations["title"] = tool.title
-            if annotations:
-                entry["annotations"] = annotations
-            tools_payload.append(entry)
+        # The payload only changes when a tool is registered, which resets
+        # the cache, so polling clients reuse the same entries.
+        tools_payload = self._app._tools_list_cache
+        if tools_payload is None:
+            tools_payload = []
+            for tool in self._app._tools:
+                entry = {
+                    "name": tool.name,
+                    "title": tool.title,
+                    "description": tool.description,
+                    "inputSchema": tool.inputSchema,
+                    "parameters": tool.parameters,
+                }
+                if tool.title:
+                    entry["annotations"] = {"title": tool.title}
+                tools_payload.append(entry)
+            self._app._tools_list_cache = tools_payload
 
         return {"tools": tools_payload}
 
@@ -504,7 +790,7 @@ class _STDIOHandler:
         if not isinstance(name, str):
             raise _JSONRPCError(-32602, "Tool name must be a string")
 
-        tool = self._tool_map.get(name)
+        tool = self._app._tools_by_name.get(name)
         if tool is None:
             raise _JSONRPCError(-32601, f"Tool '{name}' not found")
 
@@ -513,7 +799,7 @@ class _STDIOHandler:
             raise _JSONRPCError(-32602, "Tool arguments must be an object")
 
         bound_arguments = self._prepare_tool_arguments(tool, arguments)
-        result = asyncio.run(self._invoke_tool(tool, bound_arguments))
+        result = self._invoke_tool(tool, bound_arguments)
         content, structured = self._format_tool_result(result)
 
         response: Dict[str, Any] = {
@@ -527,41 +813,39 @@ class _STDIOHandler:
     # Tool helpers -----------------------------------------------------------
     def _prepare_tool_arguments(
             self, tool: ToolDefinition, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        signature = tool.signature
         prepared: Dict[str, Any] = {}
 
-        for name, parameter in signature.parameters.items():
-            if name == "ctx":
-                continue
-
-            if parameter.kind in {
-                    inspect.Parameter.VAR_POSITIONAL,
-                    inspect.Parameter.VAR_KEYWORD}:
-                continue
-
+        for name, required in tool.argument_spec:
             if name in arguments:
                 prepared[name] = arguments[name]
-            elif parameter.default is inspect._empty:
+            elif required:
                 raise _JSONRPCError(-32602,
                                     f"Missing required argument: {name}")
 
         # Include any unexpected arguments that the tool can accept via
         # **kwargs.
-        has_var_kwargs = any(
-            param.kind is inspect.Parameter.VAR_KEYWORD for param in signature.parameters.values())
-        if has_var_kwargs:
+        if tool.accepts_var_kwargs:
             for key, value in arguments.items():
                 if key not in prepared and key != "ctx":
                     prepared[key] = value
 
         return prepared
 
-    async def _invoke_tool(self, tool: ToolDefinition,
-                           arguments: Dict[str, Any]) -> Any:
-        kwargs = dict(arguments)
-        if "ctx" in tool.signature.parameters:
-            kwargs["ctx"] = self._context
-        return await tool.function(**kwargs)  # type: ignore[arg-type]
+    def _invoke_tool(self, tool: ToolDefinition,
+                     arguments: Dict[str, Any]) -> Any:
+        # ``arguments`` is the fresh dict built by ``_prepare_tool_arguments``,
+        # so the context can be injected without copying it first.
+        if tool.accepts_ctx:
+            arguments["ctx"] = self._context
+        if tool.is_coroutine:
+            return self._run_awaitable(tool.function(**arguments))
+
+        # Plain callables skip the event loop entirely unless they hand back
+        # an awaitable themselves.
+        result = tool.function(**arguments)
+        if inspect.isawaitable(result):
+            return self._run_awaitable(result)
+        return result
 
     def _format_tool_result(
             self, result: Any) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
@@ -581,9 +865,24 @@ class _STDIOHandler:
         return [content_block], structured
 
     # Response helpers -------------------------------------------------------
-    def _write_response(self, response: Dict[str, Any]) -> None:
-        sys.stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
-        sys.stdout.flush()
+    def _write_response(
+            self, response: Dict[str, Any] | List[Dict[str, Any]]) -> None:
+        # Write the payload and the line terminator separately: appending
+        # "\n" to a multi-megabyte dashboard dump would copy it once more.
+        # The encoded bytes go straight to the binary buffer, skipping the
+        # text layer's decode/re-encode; a batch is a single payload and
+        # therefore a single flush.
+        stdout = sys.stdout
+        buffer = getattr(stdout, "buffer", None)
+        payload = _dumps(response)
+        if buffer is not None:
+            buffer.write(payload)
+            buffer.write(b"\n")
+            buffer.flush()
+        else:  # replaced text streams (e.g. io.StringIO) have no buffer
+            stdout.write(payload.decode("utf-8"))
+            stdout.write("\n")
+            stdout.flush()
 
     def _write_error(
             self,
@@ -591,16 +890,8 @@ class _STDIOHandler:
             code: int,
             message: str,
             data: Optional[Any] = None) -> None:
-        sys.stdout.write(
-            json.dumps(
-                self._error_response(
-                    request_id,
-                    code,
-                    message,
-                    data),
-                ensure_ascii=False) +
-            "\n")
-        sys.stdout.flush()
+        self._write_response(
+            self._error_response(request_id, code, message, data))
 
     def _error_response(self,
                         request_id: Any,
@@ -614,6 +905,26 @@ class _STDIOHandler:
         return {"jsonrpc": "2.0", "id": request_id, "error": error}
 
 
+@dataclass(slots=True, frozen=True)
+class _JSONRPCRequest:
+    """Fields of an incoming JSON-RPC message, read once at the STDIO boundary.
+
+    Responses stay plain dicts: they are already in wire form and converting
+    them through a dataclass would copy potentially large tool results.
+    """
+
+    id: Any
+    method: Any
+    params: Dict[str, Any]
+
+    @classmethod
+    def from_message(cls, message: Dict[str, Any]) -> "_JSONRPCRequest":
+        return cls(
+            message.get("id"),
+            message.get("method"),
+            message.get("params") or {})
+
+
 class _JSONRPCError(RuntimeError):
     def __init__(
             self,
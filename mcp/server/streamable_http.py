@@ -15,12 +15,17 @@ class StreamableHTTPServerTransport:
         self.mcp_session_id = mcp_session_id or ""
 
     def _check_accept_headers(self, request) -> Tuple[bool, bool]:  # pragma: no cover - overwritten in tests
-        accept = getattr(request, "headers", {}).get("accept", "")
-        accept = (accept or "").strip().lower()
-        if not accept:
+        accept = getattr(request, "headers", {}).get("accept", "") or ""
+        if not accept or accept.isspace():
             return True, True
-        has_json = CONTENT_TYPE_JSON in accept
-        has_sse = CONTENT_TYPE_SSE in accept
+        # Lowercase individual media ranges rather than the whole header.
+        has_json = has_sse = False
+        for part in accept.split(","):
+            media = part.strip().lower()
+            if not has_json and CONTENT_TYPE_JSON in media:
+                has_json = True
+            elif not has_sse and CONTENT_TYPE_SSE in media:
+                has_sse = True
         return has_json or has_sse, has_sse
 
 
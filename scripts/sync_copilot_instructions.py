@@ -16,16 +16,45 @@ from __future__ import annotations
 import json
 import re
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any
+
+try:  # pragma: no cover - optional speedup
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None  # type: ignore[assignment]
+
+
+# One pass over the text: string literals are matched first and kept (group 1)
+# so that "//" or "/*" inside values such as URLs and globs survive, while
+# block and line comments are dropped.
+_JSONC_RE = re.compile(r'("(?:\\.|[^"\\])*")|/\*.*?\*/|//[^\n]*', re.DOTALL)
+_JSON_DECODER = json.JSONDecoder()
 
 
 def _strip_jsonc_comments(text: str) -> str:
-    # Remove /* ... */ block comments
-    text = re.sub(r"/\*.*?\*/", "", text, flags=re.DOTALL)
-    # Remove // line comments
-    text = re.sub(r"(^|\n)\s*//.*(?=\n|$)", "\1", text)
-    return text
+    return _JSONC_RE.sub(r"\1", text)
+
+
+def _dump_settings(settings: Any) -> bytes:
+    """Serialize settings as UTF-8 JSON with 2-space indent and a final newline."""
+
+    if orjson is not None:
+        return orjson.dumps(settings, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(settings, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+
+def _backup(settings_path: Path, raw: str) -> None:
+    """Write a timestamped copy of the current settings next to the original."""
+
+    try:
+        ts = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+        backup_path = settings_path.with_name(f"{settings_path.name}.{ts}.bak")
+        backup_path.write_text(raw, encoding="utf-8")
+        print(f"Backed up {settings_path} -> {backup_path}")
+    except Exception as exc:  # pragma: no cover - defensive
+        print(f"Warning: could not create backup of {settings_path}: {exc}", file=sys.stderr)
 
 
 def main() -> int:
@@ -44,16 +73,11 @@ def main() -> int:
 
     # Load existing settings (JSONC tolerant)
     settings: dict = {}
+    raw: str | None = None
+    raw_bytes: bytes | None = None
     if settings_path.exists():
-        raw = settings_path.read_text(encoding="utf-8")
-        # Backup the existing settings file before making modifications
-        try:
-            ts = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-            backup_path = settings_path.with_name(f"{settings_path.name}.{ts}.bak")
-            backup_path.write_text(raw, encoding="utf-8")
-            print(f"Backed up {settings_path} -> {backup_path}")
-        except Exception as exc:  # pragma: no cover - defensive
-            print(f"Warning: could not create backup of {settings_path}: {exc}", file=sys.stderr)
+        raw_bytes = settings_path.read_bytes()
+        raw = raw_bytes.decode("utf-8")
         try:
             settings = json.loads(_strip_jsonc_comments(raw))
         except json.JSONDecodeError as exc:
@@ -66,20 +90,15 @@ def main() -> int:
                 key_pattern = re.compile(r'("' + re.escape(key) + r'"\s*:\s*)', re.MULTILINE)
                 m = key_pattern.search(raw_text)
                 if m:
-                    # position after the colon
+                    # position after the colon (the pattern already consumed whitespace)
                     i = m.end()
-                    # skip whitespace
-                    while i < len(raw_text) and raw_text[i].isspace():
-                        i += 1
-                    if i < len(raw_text) and raw_text[i] == '"':
-                        # Find the end of the JSON string value, handling escapes
-                        j = i + 1
-                        while j < len(raw_text):
-                            if raw_text[j] == '"' and raw_text[j - 1] != '\\':
-                                break
-                            j += 1
-                        if j < len(raw_text):
-                            return raw_text[:m.end()] + json_str + raw_text[j + 1:]
+                    # Let the C scanner find where the current value ends; this
+                    # also handles escaped quotes and nested values correctly.
+                    try:
+                        _, end = _JSON_DECODER.raw_decode(raw_text, i)
+                        return raw_text[:i] + json_str + raw_text[end:]
+                    except json.JSONDecodeError:
+                        pass
                     # Otherwise, try to replace until next top-level comma or closing brace
                     end = i
                     depth = 0
@@ -107,6 +126,11 @@ def main() -> int:
                     return raw_text[:idx] + insertion + raw_text[idx:]
 
             new_raw = replace_or_insert(raw, "github.copilot.chat.instructions", json_value)
+            if new_raw == raw:
+                print(f"{settings_path} already up to date")
+                return 0
+            # Backup the existing settings file before making modifications
+            _backup(settings_path, raw)
             # Write back the text-preserving file
             settings_path.write_text(new_raw, encoding="utf-8")
             print(f"Updated {settings_path} (textual merge) with COPILOT.md content")
@@ -116,7 +140,14 @@ def main() -> int:
     settings["github.copilot.chat.instructions"] = copilot_text
 
     # Write back pretty JSON (no comments). Keep UTF-8 and final newline.
-    settings_path.write_text(json.dumps(settings, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    new_bytes = _dump_settings(settings)
+    if new_bytes == raw_bytes:
+        print(f"{settings_path} already up to date")
+        return 0
+    if raw is not None:
+        # Backup the existing settings file before making modifications
+        _backup(settings_path, raw)
+    settings_path.write_bytes(new_bytes)
     print(f"Updated {settings_path} with COPILOT.md content")
     return 0
 
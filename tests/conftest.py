@@ -2,10 +2,266 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import os
+from dataclasses import dataclass
+from types import ModuleType, SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Tuple, TypeVar
+
+import pytest
 
 # Ensure the lightweight MCP stubs remain active during the tests even when the
 # real package is installed in the environment.  The application code will load
 # the genuine dependency in production runs where the environment variable is
 # not set.
 os.environ.setdefault("GRAFANA_FASTMCP_USE_STUB", "1")
+
+# Settings read by ``app.main`` that would otherwise leak in from the shell.
+_SERVER_ENV_VARS = (
+    "GRAFANA_URL",
+    "GRAFANA_SERVICE_ACCOUNT_TOKEN",
+    "GRAFANA_API_KEY",
+    "GRAFANA_USERNAME",
+    "GRAFANA_PASSWORD",
+    "GRAFANA_ACCESS_TOKEN",
+    "GRAFANA_ID_TOKEN",
+    "ENV_FILE",
+    "STREAMABLE_HTTP_PATH",
+    "BASE_PATH",
+    "APP_ADDRESS",
+    "LOG_LEVEL",
+    "TRANSPORT",
+)
+
+
+_T = TypeVar("_T")
+_C = TypeVar("_C")
+
+
+class _Session:
+    """Bare session double; ``app.context`` may attach state to it."""
+
+
+@dataclass(frozen=True, slots=True)
+class _RequestContext:
+    session: Any
+    request: Any = None
+
+
+@dataclass(frozen=True, slots=True)
+class _ToolContext:
+    request_context: _RequestContext
+
+
+_TOOL_CTX = _ToolContext(request_context=_RequestContext(session=_Session()))
+_GRAFANA_CONFIG = SimpleNamespace(url="https://grafana.local")
+
+
+class RecordingClient:
+    """Async API client double that records calls and replays canned responses.
+
+    Every lookup method logs ``(path, params)`` in ``calls`` and answers with
+    ``responses[path]`` (or ``default``); exceptions stored as responses are
+    raised instead.  ``normalize`` rewrites paths before both steps, for
+    clients whose callers are inconsistent about leading or trailing slashes.
+    """
+
+    def __init__(
+            self, *, default: Any = None,
+            normalize: Callable[[str], str] | None = None) -> None:
+        self.responses: Dict[str, Any] = {}
+        self.calls: List[Tuple[str, Any]] = []
+        self._default = default
+        self._normalize = normalize
+
+    def _reply(self, path: str, params: Any) -> Any:
+        if self._normalize is not None:
+            path = self._normalize(path)
+        self.calls.append((path, params))
+        result = self.responses.get(path, self._default)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    async def request_json(self, path: str, params: Any = None) -> Any:
+        return self._reply(path, params)
+
+    get_json = request_json
+
+    async def request(self, *args: str, params: Any = None) -> Any:
+        # Accepts both ``request(path)`` and ``request(method, path)``.
+        return self._reply(args[-1], params)
+
+
+@pytest.fixture(scope="session")
+def _session_loop() -> Iterator[asyncio.AbstractEventLoop]:
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _apply_patches() -> None:
+    """Install the idempotent StreamableHTTP patches once for the whole session."""
+
+    from app.patches import (
+        ensure_streamable_http_accept_patch,
+        ensure_streamable_http_server_patch,
+    )
+
+    ensure_streamable_http_accept_patch()
+    ensure_streamable_http_server_patch()
+
+
+@pytest.fixture
+def run_sync(_session_loop: asyncio.AbstractEventLoop) -> Callable[[Awaitable[_T]], _T]:
+    """Run a coroutine to completion on one loop shared by the whole session.
+
+    Synchronous tests use this instead of ``asyncio.run``, which would build
+    and tear down a fresh event loop for every call.
+    """
+
+    return _session_loop.run_until_complete
+
+
+@pytest.fixture(scope="session")
+def tool_map(
+        _session_loop: asyncio.AbstractEventLoop) -> Callable[[Callable[[Any], None]], Dict[str, Any]]:
+    """Return a memoized ``register -> {tool name: tool}`` builder.
+
+    Each tool module's ``register`` function runs against a fresh ``FastMCP``
+    at most once per session, however many tests look tools up by name.
+    """
+
+    from mcp.server.fastmcp import FastMCP
+
+    @functools.cache
+    def build(register: Callable[[Any], None]) -> Dict[str, Any]:
+        app = FastMCP()
+        register(app)
+        return {tool.name: tool for tool in _session_loop.run_until_complete(app.list_tools())}
+
+    return build
+
+
+@pytest.fixture(scope="session")
+def register_all_tools(
+        _session_loop: asyncio.AbstractEventLoop) -> Callable[[Any], Dict[str, Any]]:
+    """Return a memoized ``capabilities -> {tool name: tool}`` builder.
+
+    ``register_all`` runs once per distinct ``GrafanaCapabilities`` value, with
+    capability detection pinned to that value for the duration of the call.
+    """
+
+    import app.tools as tools
+    from mcp.server.fastmcp import FastMCP
+
+    @functools.cache
+    def build(capabilities: Any) -> Dict[str, Any]:
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(tools, "_resolve_capabilities", lambda: capabilities)
+            app = FastMCP()
+            tools.register_all(app)
+        return {tool.name: tool for tool in _session_loop.run_until_complete(app.list_tools())}
+
+    return build
+
+
+@pytest.fixture(scope="session")
+def recording_client() -> type[RecordingClient]:
+    """The ``RecordingClient`` class, for modules that stub their API clients."""
+
+    return RecordingClient
+
+
+@pytest.fixture(scope="session")
+def tool_ctx() -> _ToolContext:
+    """Minimal MCP tool context shared by helper tests that never mutate it."""
+
+    return _TOOL_CTX
+
+
+@pytest.fixture
+def fresh_tool_ctx() -> _ToolContext:
+    """Tool context with its own session, for tests that cache state on it."""
+
+    return _ToolContext(request_context=_RequestContext(session=_Session()))
+
+
+@pytest.fixture
+def grafana_client_stub(
+        monkeypatch: pytest.MonkeyPatch) -> Callable[[ModuleType, _C], Tuple[_ToolContext, _C]]:
+    """Route a tool module's Grafana config and client lookups to test doubles.
+
+    Returns ``install(module, client)``, which patches ``get_grafana_config``
+    and ``GrafanaClient`` on ``module`` and hands back ``(tool_ctx, client)``.
+    """
+
+    def install(module: ModuleType, client: _C) -> Tuple[_ToolContext, _C]:
+        monkeypatch.setattr(module, "get_grafana_config", lambda _: _GRAFANA_CONFIG)
+        monkeypatch.setattr(module, "GrafanaClient", lambda cfg: client)
+        return _TOOL_CTX, client
+
+    return install
+
+
+@pytest.fixture
+def httpx_mock(
+        monkeypatch: pytest.MonkeyPatch) -> Callable[[Callable[[Any], Any]], List[Any]]:
+    """Serve every ``httpx.AsyncClient`` request from ``handler``.
+
+    Returns ``install(handler)``; clients are real ``httpx.AsyncClient``
+    instances wired to an ``httpx.MockTransport``, so headers, params and auth
+    go through httpx itself.  ``install`` returns the list of requests seen.
+    """
+
+    import httpx
+
+    def install(handler: Callable[[httpx.Request], httpx.Response]) -> List[httpx.Request]:
+        seen: List[httpx.Request] = []
+
+        def record(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return handler(request)
+
+        monkeypatch.setattr(
+            httpx, "AsyncClient",
+            functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(record)))
+        return seen
+
+    return install
+
+
+@pytest.fixture(params=["stdlib", "orjson"])
+def json_backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Run the test once with orjson forced off and once with it forced on."""
+
+    from app import _json
+
+    if request.param == "stdlib":
+        monkeypatch.setattr(_json, "orjson", None)
+    else:
+        pytest.importorskip("orjson")
+    return request.param
+
+
+@pytest.fixture
+def clean_grafana_env() -> Iterator[None]:
+    """Start without server settings and restore the whole environment afterwards.
+
+    ``main`` writes CLI overrides back into ``os.environ``, so the snapshot is
+    compared key by key on teardown instead of tracking individual setenv calls.
+    Tests may therefore assign ``os.environ`` directly.
+    """
+
+    snapshot = dict(os.environ)
+    for key in _SERVER_ENV_VARS:
+        os.environ.pop(key, None)
+    yield
+    for key in os.environ.keys() - snapshot.keys():
+        del os.environ[key]
+    for key, value in snapshot.items():
+        if os.environ.get(key) != value:
+            os.environ[key] = value
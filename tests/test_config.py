@@ -1,6 +1,9 @@
 """Unit tests for the configuration helpers."""
 
 import base64
+import os
+from typing import Iterator
+
 import pytest
 
 from app import config
@@ -18,11 +21,16 @@ ENV_VARS = [
 
 
 @pytest.fixture(autouse=True)
-def clear_grafana_env(monkeypatch: pytest.MonkeyPatch) -> None:
+def clear_grafana_env() -> Iterator[None]:
     """Ensure each test starts with a clean environment."""
 
-    for var in ENV_VARS:
-        monkeypatch.delenv(var, raising=False)
+    saved = {var: os.environ.pop(var, None) for var in ENV_VARS}
+    yield
+    for var, value in saved.items():
+        if value is None:
+            os.environ.pop(var, None)
+        else:
+            os.environ[var] = value
 
 
 def test_config_defaults_from_env() -> None:
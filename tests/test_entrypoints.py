@@ -17,14 +17,14 @@ def test_load_instructions_prefers_env_path(
     target = tmp_path / "instructions.md"
     target.write_text("Custom instructions", encoding="utf-8")
     monkeypatch.setenv("MCP_INSTRUCTIONS_PATH", str(target))
-    instructions.load_instructions.cache_clear()
+    instructions.clear_instructions_cache()
     assert instructions.load_instructions() == "Custom instructions"
 
 
 def test_load_instructions_falls_back_to_default(
         monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.delenv("MCP_INSTRUCTIONS_PATH", raising=False)
-    instructions.load_instructions.cache_clear()
+    instructions.clear_instructions_cache()
     content = instructions.load_instructions()
     assert "Dashboards" in content
 
@@ -8,7 +8,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, Mapping, Optional, Sequence, Union
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import FastMCP, _annotation_to_schema
 
 
 def _build_tool(app: FastMCP):
@@ -90,3 +90,48 @@ def test_schema_build_and_normalize_covers_edge_cases() -> None:
     # Optional collapses to inner schema in this shim
     # (Optional[int] -> {"type": "integer"})
     assert props["a_optional"]["type"] == "integer"
+
+
+def test_normalize_schema_returns_well_formed_schema_unchanged() -> None:
+    app = FastMCP()
+    schema = {
+        "type": "object",
+        "properties": {
+            "name": {"type": "string"},
+            "ids": {"type": "array", "items": {"type": "integer"}},
+        },
+        "required": ["name"],
+    }
+
+    assert app._normalize_schema(schema) is schema
+
+    fixed = app._normalize_schema({"type": "object", "properties": {"raw": {}}})
+    assert fixed["properties"]["raw"] == {"type": "object", "properties": {}}
+    assert app._normalize_schema(fixed) is fixed
+
+
+def test_annotation_to_schema_reuses_cached_results() -> None:
+    assert _annotation_to_schema(list[str]) is _annotation_to_schema(list[str])
+    assert _annotation_to_schema(Optional[int]) == {"type": "integer"}
+
+
+def test_tool_schemas_do_not_share_cached_property_dicts() -> None:
+    app = FastMCP()
+
+    @app.tool(name="first", title="First", description="First tool")
+    async def first(name: str, ids: list[str]) -> Dict[str, Any]:
+        return {}
+
+    @app.tool(name="second", title="Second", description="Second tool")
+    async def second(name: str, ids: list[str]) -> Dict[str, Any]:
+        return {}
+
+    first_props = app._tools_by_name["first"].inputSchema["properties"]
+    first_props["name"]["description"] = "changed"
+    first_props["ids"]["items"]["description"] = "changed"
+
+    second_props = app._tools_by_name["second"].inputSchema["properties"]
+    assert second_props["name"] == {"type": "string"}
+    assert second_props["ids"] == {"type": "array", "items": {"type": "string"}}
+    assert _annotation_to_schema(str) == {"type": "string"}
+    assert _annotation_to_schema(list[str]) == {"type": "array", "items": {"type": "string"}}
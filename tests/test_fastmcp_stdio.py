@@ -2,7 +2,13 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import asyncio
+import contextlib
+import io
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+
+import pytest
 
 from mcp.server.fastmcp import Context, FastMCP, _STDIOHandler
 
@@ -105,8 +111,8 @@ def test_stdio_call_tool_invokes_async_function() -> None:
     result = response["result"]
     assert result["isError"] is False
     assert result["structuredContent"] == {"result": "GRAFANA"}
-    assert any(block["text"].find("GRAFANA") >=
-               0 for block in result["content"])
+    assert len(result["content"]) == 1
+    assert "GRAFANA" in result["content"][0]["text"]
 
 
 def test_stdio_call_tool_missing_argument_raises_error() -> None:
@@ -127,3 +133,222 @@ def test_stdio_call_tool_missing_argument_raises_error() -> None:
     })
 
     assert response["error"]["code"] == -32602
+
+
+def test_stdio_call_tool_sees_tools_registered_after_handler_creation() -> None:
+    app = FastMCP(name="test", instructions=None)
+    handler = _STDIOHandler(app)
+    _initialize(handler)
+
+    @app.tool(name="late", title="Late", description="Registered late")
+    async def late() -> Dict[str, str]:
+        return {"status": "ok"}
+
+    response = handler._handle_request({
+        "jsonrpc": "2.0",
+        "id": 5,
+        "method": "tools/call",
+        "params": {"name": "late", "arguments": {}},
+    })
+
+    assert response["result"]["structuredContent"] == {"status": "ok"}
+
+
+def test_stdio_call_tool_invokes_sync_function_directly() -> None:
+    app = FastMCP(name="test", instructions=None)
+
+    @app.tool(name="sync", title="Sync", description="Synchronous tool")
+    def sync_tool(value: str, ctx: Optional[Context] = None) -> Dict[str, Any]:
+        return {"value": value, "has_ctx": ctx is not None}
+
+    assert app._tools_by_name["sync"].is_coroutine is False
+
+    handler = _STDIOHandler(app)
+    _initialize(handler)
+
+    response = handler._handle_request({
+        "jsonrpc": "2.0",
+        "id": 6,
+        "method": "tools/call",
+        "params": {"name": "sync", "arguments": {"value": "x"}},
+    })
+
+    assert response["result"]["structuredContent"] == {"value": "x", "has_ctx": True}
+
+
+def test_stdio_dispatches_ping_and_rejects_unknown_methods() -> None:
+    handler = _STDIOHandler(FastMCP(name="test", instructions=None))
+
+    ping = handler._handle_request({"jsonrpc": "2.0", "id": 7, "method": "ping"})
+    assert ping["result"] == {}
+
+    unknown = handler._handle_request({"jsonrpc": "2.0", "id": 8, "method": "nope"})
+    assert unknown["error"]["code"] == -32601
+
+
+def test_stdio_batch_returns_response_list() -> None:
+    handler = _STDIOHandler(FastMCP(name="test", instructions=None))
+
+    responses = handler._handle_message([
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+    ])
+
+    assert [response["id"] for response in responses] == [1, 2]
+    assert responses[1]["result"] == {"tools": []}
+    assert handler._handle_message([{"jsonrpc": "2.0", "method": "notifications/initialized"}]) is None
+
+
+def test_stdio_empty_batch_returns_single_error_object() -> None:
+    handler = _STDIOHandler(FastMCP(name="test", instructions=None))
+
+    response = handler._handle_message([])
+
+    assert isinstance(response, dict)
+    assert response["id"] is None
+    assert response["error"]["code"] == -32600
+
+
+def test_stdio_run_writes_one_json_line_per_response(
+        monkeypatch: pytest.MonkeyPatch) -> None:
+    handler = _STDIOHandler(FastMCP(name="test", instructions=None))
+    stdin = io.StringIO(
+        '{"jsonrpc": "2.0", "id": 1, "method": "ping"}\n'
+        "not json\n")
+    stdout = io.StringIO()
+    monkeypatch.setattr("sys.stdin", stdin)
+    monkeypatch.setattr("sys.stdout", stdout)
+
+    handler.run()
+
+    lines = stdout.getvalue().splitlines()
+    assert json.loads(lines[0]) == {"jsonrpc": "2.0", "id": 1, "result": {}}
+    assert json.loads(lines[1])["error"]["code"] == -32700
+
+
+def test_list_tools_returns_cached_snapshot_until_next_registration() -> None:
+    app = FastMCP(name="test", instructions=None)
+
+    @app.tool(name="first", title="First", description="First tool")
+    async def first() -> Dict[str, str]:
+        return {}
+
+    snapshot = asyncio.run(app.list_tools())
+    assert snapshot is asyncio.run(app.list_tools())
+
+    @app.tool(name="second", title="Second", description="Second tool")
+    async def second() -> Dict[str, str]:
+        return {}
+
+    assert [tool.name for tool in asyncio.run(app.list_tools())] == ["first", "second"]
+    assert [tool.name for tool in snapshot] == ["first"]
+
+
+def test_stdio_list_tools_reuses_payload_until_next_registration() -> None:
+    app = FastMCP(name="test", instructions=None)
+    handler = _STDIOHandler(app)
+    _initialize(handler)
+
+    @app.tool(name="first", title="First", description="First tool")
+    async def first() -> Dict[str, str]:
+        return {}
+
+    request = {"jsonrpc": "2.0", "id": 2, "method": "tools/list"}
+    tools = handler._handle_request(request)["result"]["tools"]
+    assert handler._handle_request(request)["result"]["tools"] is tools
+
+    @app.tool(name="second", title="Second", description="Second tool")
+    async def second() -> Dict[str, str]:
+        return {}
+
+    refreshed = handler._handle_request(request)["result"]["tools"]
+    assert [tool["name"] for tool in refreshed] == ["first", "second"]
+
+
+def test_stdio_call_tool_passes_optional_and_extra_arguments() -> None:
+    app = FastMCP(name="test", instructions=None)
+
+    @app.tool(name="extra", title="Extra", description="Accepts kwargs")
+    async def extra(value: str, limit: int = 5, **kwargs: Any) -> Dict[str, Any]:
+        return {"value": value, "limit": limit, "extra": kwargs}
+
+    handler = _STDIOHandler(app)
+    _initialize(handler)
+
+    response = handler._handle_request({
+        "jsonrpc": "2.0",
+        "id": 9,
+        "method": "tools/call",
+        "params": {"name": "extra", "arguments": {"value": "x", "other": 1}},
+    })
+
+    assert response["result"]["structuredContent"] == {"value": "x", "limit": 5, "extra": {"other": 1}}
+
+
+def test_stdio_tool_calls_share_one_event_loop() -> None:
+    app = FastMCP(name="test", instructions=None)
+    loops: list[asyncio.AbstractEventLoop] = []
+
+    @app.tool(name="loop", title="Loop", description="Records the running loop")
+    async def loop() -> Dict[str, str]:
+        loops.append(asyncio.get_running_loop())
+        return {}
+
+    handler = _STDIOHandler(app)
+    _initialize(handler)
+    request = {"jsonrpc": "2.0", "id": 3, "method": "tools/call", "params": {"name": "loop"}}
+    handler._handle_request(request)
+    handler._handle_request(request)
+    handler.close()
+
+    assert loops[0] is loops[1]
+    assert loops[0].is_closed()
+
+
+def test_stdio_handlers_keep_separate_sessions() -> None:
+    app = FastMCP(name="test", instructions=None)
+    sessions: list[Any] = []
+
+    @app.tool(name="session", title="Session", description="Records the session")
+    async def session(ctx: Optional[Context] = None) -> Dict[str, str]:
+        sessions.append(ctx.request_context.session)
+        return {}
+
+    request = {"jsonrpc": "2.0", "id": 3, "method": "tools/call", "params": {"name": "session"}}
+    for handler in (_STDIOHandler(app), _STDIOHandler(app)):
+        _initialize(handler)
+        handler._handle_request(request)
+        handler._handle_request(request)
+        handler.close()
+
+    assert sessions[0] is sessions[1]
+    assert sessions[1] is not sessions[2]
+    assert sessions[2] is sessions[3]
+
+
+def test_stdio_exits_lifespan_before_closing_loop() -> None:
+    events: list[str] = []
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: FastMCP) -> AsyncIterator[None]:
+        events.append("enter")
+        yield
+        # Runs as a coroutine, so the handler's loop is still open here.
+        events.append("exit")
+
+    app = FastMCP(name="test", instructions=None, lifespan=lifespan)
+
+    @app.tool(name="noop", title="Noop", description="No arguments")
+    async def noop() -> Dict[str, str]:
+        return {}
+
+    handler = _STDIOHandler(app)
+    _initialize(handler)
+    request = {"jsonrpc": "2.0", "id": 3, "method": "tools/call", "params": {"name": "noop"}}
+    handler._handle_request(request)
+    handler._handle_request(request)
+    assert events == ["enter"]
+
+    handler.close()
+    assert events == ["enter", "exit"]
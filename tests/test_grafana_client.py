@@ -2,6 +2,11 @@
 
 from __future__ import annotations
 
+import json
+import math
+from typing import Any, Callable
+
+import httpx
 import pytest
 
 from app import grafana_client
@@ -24,6 +29,10 @@ class DummyResponse:
     def json(self) -> object:
         return self._json_data
 
+    @property
+    def content(self) -> bytes:
+        return json.dumps(self._json_data).encode("utf-8")
+
 
 @pytest.fixture
 def anyio_backend() -> str:
@@ -71,6 +80,7 @@ def test_client_headers_include_tokens() -> None:
     assert headers["X-Test"] == "value"
     assert headers["User-Agent"].startswith(
         grafana_client.USER_AGENT.split("/")[0])
+    assert "X-Test" not in client._headers()
 
 
 def test_client_auth_uses_basic_auth(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -110,56 +120,150 @@ async def test_request_invokes_httpx_client(
 
     captured: dict[str, object] = {}
     response = DummyResponse(json_data={"ok": True})
+    ssl_context = object()
+
+    def fake_ssl_context(verify: object, cert: object) -> object:
+        captured["tls"] = (verify, cert)
+        return ssl_context
 
     class DummyAsyncClient:
+        is_closed = False
+
         def __init__(
                 self,
                 *,
                 timeout: object,
                 verify: object,
-                cert: object,
-                auth: object) -> None:
+                limits: object,
+                cookies: object) -> None:
             captured["init"] = {
                 "timeout": timeout,
                 "verify": verify,
-                "cert": cert,
-                "auth": auth,
+                "limits": limits,
             }
 
-        async def __aenter__(self) -> "DummyAsyncClient":
-            captured["enter"] = True
-            return self
-
-        async def __aexit__(self, exc_type, exc, tb) -> None:
-            captured["exit"] = True
-
         async def request(self,
                           method: str,
                           url: str,
                           *,
                           params: object = None,
                           json: object = None,
+                          content: bytes | None = None,
                           headers: dict[str,
-                                        str] | None = None) -> DummyResponse:
+                                        str] | None = None,
+                          auth: object = None,
+                          timeout: object = None) -> DummyResponse:
             captured["request"] = {
                 "method": method,
                 "url": url,
                 "params": params,
                 "json": json,
+                "content": content,
                 "headers": headers,
+                "auth": auth,
             }
             return response
 
     monkeypatch.setattr(grafana_client.httpx, "AsyncClient", DummyAsyncClient)
+    monkeypatch.setattr(grafana_client, "_ssl_context", fake_ssl_context)
 
     result = await client.request("POST", "/path", params={"q": "1"}, json={"body": 1}, headers={"X-Test": "value"})
 
     assert result is response
-    assert captured["init"]["verify"] == "ca.pem"
-    assert captured["init"]["cert"] == ("cert.pem", "key.pem")
+    assert captured["tls"] == ("ca.pem", ("cert.pem", "key.pem"))
+    assert captured["init"]["verify"] is ssl_context
     assert captured["request"]["url"] == "https://grafana.example/base/api/path"
     assert captured["request"]["headers"]["Authorization"] == "Bearer svc-token"
     assert captured["request"]["headers"]["X-Test"] == "value"
+    assert captured["request"]["auth"] is not None
+    if grafana_client._json.orjson is not None:
+        assert captured["request"]["json"] is None
+        assert json.loads(captured["request"]["content"]) == {"body": 1}
+        assert captured["request"]["headers"]["Content-Type"] == "application/json"
+    else:
+        assert captured["request"]["json"] == {"body": 1}
+
+
+@pytest.mark.anyio("asyncio")
+async def test_request_reuses_pooled_client(
+        monkeypatch: pytest.MonkeyPatch) -> None:
+    created: list[object] = []
+
+    class DummyAsyncClient:
+        is_closed = False
+
+        def __init__(self, **_: object) -> None:
+            created.append(self)
+
+        async def request(self, *_, **__) -> DummyResponse:
+            return DummyResponse()
+
+        async def aclose(self) -> None:
+            self.is_closed = True
+
+    monkeypatch.setattr(grafana_client.httpx, "AsyncClient", DummyAsyncClient)
+    config = GrafanaConfig(url="https://grafana.example")
+
+    await grafana_client.GrafanaClient(config).request("GET", "/one")
+    async with grafana_client.GrafanaClient(config) as client:
+        await client.request("GET", "/two")
+
+    assert len(created) == 1
+    assert not created[0].is_closed
+
+    await grafana_client.aclose_shared_clients()
+    assert created[0].is_closed
+
+    await grafana_client.GrafanaClient(config).request("GET", "/three")
+    await grafana_client.aclose_shared_clients()
+
+    assert len(created) == 2
+    assert created[1].is_closed
+
+
+@pytest.mark.anyio("asyncio")
+async def test_closing_one_client_keeps_pool_usable_for_others(
+        httpx_mock: Callable[..., Any]) -> None:
+    httpx_mock(lambda request: httpx.Response(200, json={"path": request.url.path}))
+    config = GrafanaConfig(url="https://grafana.example")
+    other = grafana_client.GrafanaClient(config)
+
+    try:
+        await other.get_json("/one")
+        pooled = other._get_client()
+        async with grafana_client.GrafanaClient(config) as client:
+            await client.get_json("/two")
+
+        assert not pooled.is_closed
+        assert other._get_client() is pooled
+        assert await other.get_json("/three") == {"path": "/api/three"}
+    finally:
+        await grafana_client.aclose_shared_clients()
+
+
+@pytest.mark.anyio("asyncio")
+async def test_pooled_client_does_not_replay_cookies_across_credentials(
+        httpx_mock: Callable[..., Any]) -> None:
+    seen = httpx_mock(lambda _: httpx.Response(
+        200, json={}, headers={"Set-Cookie": "grafana_session=alice; Path=/"}))
+
+    try:
+        await grafana_client.GrafanaClient(
+            GrafanaConfig(url="https://grafana.example", api_key="alice")).get_json("/user")
+        await grafana_client.GrafanaClient(
+            GrafanaConfig(url="https://grafana.example", api_key="bob")).get_json("/user")
+    finally:
+        await grafana_client.aclose_shared_clients()
+
+    assert [request.headers["Authorization"] for request in seen] == ["Bearer alice", "Bearer bob"]
+    assert "cookie" not in seen[1].headers
+
+
+def test_ssl_context_is_shared_per_settings() -> None:
+    context = grafana_client._ssl_context(False, None)
+
+    assert grafana_client._ssl_context(False, None) is context
+    assert context.verify_mode == grafana_client.ssl.CERT_NONE
 
 
 @pytest.mark.anyio("asyncio")
@@ -170,13 +274,9 @@ async def test_request_raises_on_error(
     error_response = DummyResponse(status_code=500, text="boom")
 
     class DummyAsyncClient:
-        def __init__(self, **_: object) -> None:
-            pass
+        is_closed = False
 
-        async def __aenter__(self) -> "DummyAsyncClient":
-            return self
-
-        async def __aexit__(self, exc_type, exc, tb) -> None:
+        def __init__(self, **_: object) -> None:
             pass
 
         async def request(self, *_, **__) -> DummyResponse:
@@ -240,3 +340,58 @@ async def test_get_json_returns_parsed_body(
     monkeypatch.setattr(grafana_client.GrafanaClient, "request", fake_request)
 
     assert await client.get_json("/path") == {"value": 1}
+
+
+@pytest.mark.anyio("asyncio")
+async def test_batch_get_json_overlaps_requests_in_order(
+        monkeypatch: pytest.MonkeyPatch) -> None:
+    client = grafana_client.GrafanaClient(
+        GrafanaConfig(url="https://grafana.example"))
+    in_flight = 0
+    peak = 0
+
+    async def fake_get_json(self: grafana_client.GrafanaClient, path: str, **_: object) -> str:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await grafana_client.asyncio.sleep(0)
+        in_flight -= 1
+        return path
+
+    monkeypatch.setattr(grafana_client.GrafanaClient, "get_json", fake_get_json)
+
+    result = await client.batch_get_json(["/a", "/b", "/c"], concurrency=2)
+
+    assert result == ["/a", "/b", "/c"]
+    assert peak == 2
+
+
+@pytest.mark.anyio("asyncio")
+async def test_request_rejects_non_finite_json_bodies(
+        json_backend: str, httpx_mock: Callable[..., Any]) -> None:
+    seen = httpx_mock(lambda _: httpx.Response(200, json={}))
+    client = grafana_client.GrafanaClient(GrafanaConfig(url="https://grafana.example"))
+
+    try:
+        for value in (float("nan"), float("inf")):
+            with pytest.raises(ValueError):
+                await client.post_json("/path", json={"threshold": [1.0, value]})
+    finally:
+        await grafana_client.aclose_shared_clients()
+
+    assert seen == []
+
+
+@pytest.mark.anyio("asyncio")
+async def test_get_json_accepts_nan_literals(
+        json_backend: str, httpx_mock: Callable[..., Any]) -> None:
+    httpx_mock(lambda _: httpx.Response(200, content=b'{"value": NaN, "ok": true}'))
+    client = grafana_client.GrafanaClient(GrafanaConfig(url="https://grafana.example"))
+
+    try:
+        result = await client.get_json("/path")
+    finally:
+        await grafana_client.aclose_shared_clients()
+
+    assert math.isnan(result["value"])
+    assert result["ok"] is True
@@ -2,18 +2,20 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 import pytest
 
-from app.instructions import load_instructions
+from app import instructions
+from app.instructions import clear_instructions_cache, load_instructions
 
 
 @pytest.fixture(autouse=True)
 def clear_cache():
-    load_instructions.cache_clear()  # type: ignore[attr-defined]
+    clear_instructions_cache()
     yield
-    load_instructions.cache_clear()  # type: ignore[attr-defined]
+    clear_instructions_cache()
 
 
 def test_load_instructions_defaults_to_builtin(
@@ -48,3 +50,31 @@ def test_load_instructions_applies_placeholders(
     assert "dash-123" in value
     assert "folder-xyz" in value
     assert "{{UNKNOWN}}" in value
+
+
+def test_load_instructions_reloads_when_file_changes(
+        tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    custom = tmp_path / "custom.md"
+    custom.write_text("First", encoding="utf-8")
+    monkeypatch.setenv("MCP_INSTRUCTIONS_PATH", str(custom))
+
+    assert load_instructions() == "First"
+
+    custom.write_text("Second", encoding="utf-8")
+    stat = custom.stat()
+    os.utime(custom, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert load_instructions() == "Second"
+
+
+def test_load_instructions_replaces_entry_when_file_changes(
+        tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    custom = tmp_path / "custom.md"
+    monkeypatch.setenv("MCP_INSTRUCTIONS_PATH", str(custom))
+
+    for index, text in enumerate(("First", "Second", "Third")):
+        custom.write_text(text, encoding="utf-8")
+        os.utime(custom, ns=(0, (index + 1) * 1_000_000_000))
+        assert load_instructions() == text
+
+    assert instructions._CACHE == {str(custom): (3_000_000_000, "Third")}
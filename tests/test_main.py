@@ -41,6 +41,20 @@ def test_main_prints_version_and_exits(
     assert captured.out.strip() == __version__
 
 
+def test_main_reuses_parser_without_leaking_env_defaults(
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str]) -> None:
+    monkeypatch.setenv("TRANSPORT", "sse")
+
+    main_module.main(["--version"])
+    capsys.readouterr()
+
+    parser = main_module._build_parser()
+    assert parser is main_module._build_parser()
+    assert parser.get_default("transport") == "stdio"
+
+
+@pytest.mark.usefixtures("clean_grafana_env")
 def test_main_runs_server_with_cli_overrides(
         monkeypatch: pytest.MonkeyPatch,
         tmp_path: Path) -> None:
@@ -75,23 +89,6 @@ def test_main_runs_server_with_cli_overrides(
 
     monkeypatch.setattr(main_module, "create_app", fake_create_app)
 
-    for key in [
-        "GRAFANA_URL",
-        "GRAFANA_SERVICE_ACCOUNT_TOKEN",
-        "GRAFANA_API_KEY",
-        "GRAFANA_USERNAME",
-        "GRAFANA_PASSWORD",
-        "GRAFANA_ACCESS_TOKEN",
-        "GRAFANA_ID_TOKEN",
-        "ENV_FILE",
-        "STREAMABLE_HTTP_PATH",
-        "BASE_PATH",
-        "APP_ADDRESS",
-        "LOG_LEVEL",
-        "TRANSPORT",
-    ]:
-        monkeypatch.delenv(key, raising=False)
-
     args = [
         "--env-file",
         str(env_path),
@@ -150,6 +147,7 @@ def test_main_runs_server_with_cli_overrides(
         assert os.environ[key] == expected
 
 
+@pytest.mark.usefixtures("clean_grafana_env")
 def test_main_logs_when_stdio_transport_ignores_base_path(
     monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -174,22 +172,6 @@ def test_main_logs_when_stdio_transport_ignores_base_path(
 
     monkeypatch.setattr(main_module, "create_app", lambda **kwargs: app)
 
-    for key in [
-        "GRAFANA_URL",
-        "GRAFANA_SERVICE_ACCOUNT_TOKEN",
-        "GRAFANA_API_KEY",
-        "GRAFANA_USERNAME",
-        "GRAFANA_PASSWORD",
-        "GRAFANA_ACCESS_TOKEN",
-        "GRAFANA_ID_TOKEN",
-        "STREAMABLE_HTTP_PATH",
-        "BASE_PATH",
-        "APP_ADDRESS",
-        "LOG_LEVEL",
-        "TRANSPORT",
-    ]:
-        monkeypatch.delenv(key, raising=False)
-
     caplog.set_level(logging.INFO)
 
     main_module.main([
@@ -205,6 +187,7 @@ def test_main_logs_when_stdio_transport_ignores_base_path(
     assert "Ignoring base path" in caplog.text
 
 
+@pytest.mark.usefixtures("clean_grafana_env")
 def test_main_frozen_defaults_to_stdio(
         monkeypatch: pytest.MonkeyPatch,
         tmp_path: Path) -> None:
@@ -231,23 +214,7 @@ def test_main_frozen_defaults_to_stdio(
     monkeypatch.setattr(main_module, "create_app", lambda **kwargs: app)
     monkeypatch.setattr(main_module.sys, "frozen", True, raising=False)
 
-    for key in [
-        "GRAFANA_URL",
-        "GRAFANA_SERVICE_ACCOUNT_TOKEN",
-        "GRAFANA_API_KEY",
-        "GRAFANA_USERNAME",
-        "GRAFANA_PASSWORD",
-        "GRAFANA_ACCESS_TOKEN",
-        "GRAFANA_ID_TOKEN",
-        "ENV_FILE",
-        "STREAMABLE_HTTP_PATH",
-        "BASE_PATH",
-        "APP_ADDRESS",
-        "LOG_LEVEL",
-    ]:
-        monkeypatch.delenv(key, raising=False)
-
-    monkeypatch.setenv("TRANSPORT", "sse")
+    os.environ["TRANSPORT"] = "sse"
 
     main_module.main([])
 
@@ -2,18 +2,11 @@
 
 from __future__ import annotations
 
-import builtins
 import json
 import sys
-from contextlib import asynccontextmanager
-from types import ModuleType, SimpleNamespace
+from types import SimpleNamespace
 
 import pytest
-from starlette.applications import Starlette
-from starlette.requests import Request
-from starlette.responses import Response
-from starlette.routing import Mount, Route
-from starlette.testclient import TestClient
 
 from app import patches
 from app.instructions import format_instructions
@@ -4,53 +4,74 @@ from __future__ import annotations
 
 import sys
 from types import ModuleType, SimpleNamespace
+from typing import Any, Callable, Mapping
 
+import httpx
 import pytest
 
-from app import server
+from app import grafana_client, server
+from app.config import GrafanaConfig
 
 
-@pytest.mark.parametrize(
-    "value, expected",
-    [
-        ("", "/"),
-        ("/", "/"),
-        ("api", "/api"),
-        ("/api/", "/api"),
-    ],
+_MOUNT_PATH_CASES = (
+    ("", "/"),
+    ("/", "/"),
+    ("api", "/api"),
+    ("/api/", "/api"),
 )
-def test_normalize_mount_path(value: str, expected: str) -> None:
-    assert server._normalize_mount_path(value) == expected
-
-
-@pytest.mark.parametrize(
-    "base, segment, expected",
-    [
-        ("/", "", "/"),
-        ("/", "stream", "/stream"),
-        ("/api", "messages", "/api/messages"),
-        ("/api/", "/nested/", "/api/nested"),
-        ("", "relative", "/relative"),
-    ],
+_JOIN_PATH_CASES = (
+    ("/", "", "/"),
+    ("/", "stream", "/stream"),
+    ("/api", "messages", "/api/messages"),
+    ("/api/", "/nested/", "/api/nested"),
+    ("", "relative", "/relative"),
 )
-def test_join_path(base: str, segment: str, expected: str) -> None:
-    assert server._join_path(base, segment) == expected
-
-
-@pytest.mark.parametrize(
-    "value, mount_path, default_segment, expected",
-    [
-        ("", "/", "mcp", "/mcp"),
-        ("/absolute", "/ignored", "mcp", "/absolute"),
-        ("relative", "/base", "mcp", "/base/relative"),
-        ("relative/", "/base", "mcp", "/base/relative"),
-    ],
+_STREAMABLE_HTTP_PATH_CASES = (
+    ("", "/", "mcp", "/mcp"),
+    ("/absolute", "/ignored", "mcp", "/absolute"),
+    ("relative", "/base", "mcp", "/base/relative"),
+    ("relative/", "/base", "mcp", "/base/relative"),
 )
-def test_normalize_streamable_http_path(
-    value: str, mount_path: str, default_segment: str, expected: str
-) -> None:
-    assert server._normalize_streamable_http_path(
-        value, mount_path, default_segment) == expected
+
+
+def test_normalize_mount_path() -> None:
+    for value, expected in _MOUNT_PATH_CASES:
+        assert server._normalize_mount_path(value) == expected, value
+
+
+def test_join_path() -> None:
+    for base, segment, expected in _JOIN_PATH_CASES:
+        assert server._join_path(base, segment) == expected, (base, segment)
+
+
+def test_normalize_streamable_http_path() -> None:
+    for value, mount_path, default_segment, expected in _STREAMABLE_HTTP_PATH_CASES:
+        assert server._normalize_streamable_http_path(
+            value, mount_path, default_segment) == expected, (value, mount_path)
+
+
+class _Settings:
+    __slots__ = (
+        "host",
+        "port",
+        "log_level",
+        "mount_path",
+        "sse_path",
+        "message_path",
+        "streamable_http_path",
+    )
+
+    def __init__(self, kwargs: Mapping[str, object]) -> None:
+        for name in self.__slots__:
+            setattr(self, name, kwargs[name])
+
+
+def _patch_many(
+        monkeypatch: pytest.MonkeyPatch,
+        target: object,
+        mapping: Mapping[str, object]) -> None:
+    for name, value in mapping.items():
+        monkeypatch.setattr(target, name, value)
 
 
 def test_create_app_configures_fastmcp(
@@ -63,41 +84,26 @@ def test_create_app_configures_fastmcp(
     def _increment_server() -> None:
         calls["server"] += 1
 
-    monkeypatch.setattr(
-        server,
-        "ensure_streamable_http_accept_patch",
-        _increment_accept)
-    monkeypatch.setattr(
-        server,
-        "ensure_streamable_http_server_patch",
-        _increment_server)
-
     instructions = object()
-    monkeypatch.setattr(server, "load_instructions", lambda: instructions)
-
     registered: list[object] = []
-    monkeypatch.setattr(
-        server,
-        "register_all",
-        lambda app: registered.append(app))
 
     class DummyFastMCP:
+        __slots__ = ("kwargs", "settings")
+
         def __init__(self, **kwargs: object) -> None:
             self.kwargs = kwargs
-            self.settings = SimpleNamespace(
-                host=kwargs["host"],
-                port=kwargs["port"],
-                log_level=kwargs["log_level"],
-                mount_path=kwargs["mount_path"],
-                sse_path=kwargs["sse_path"],
-                message_path=kwargs["message_path"],
-                streamable_http_path=kwargs["streamable_http_path"],
-            )
+            self.settings = _Settings(kwargs)
 
         def streamable_http_app(self) -> str:
             return "dummy-app"
 
-    monkeypatch.setattr(server, "FastMCP", DummyFastMCP)
+    _patch_many(monkeypatch, server, {
+        "ensure_streamable_http_accept_patch": _increment_accept,
+        "ensure_streamable_http_server_patch": _increment_server,
+        "load_instructions": lambda: instructions,
+        "register_all": registered.append,
+        "FastMCP": DummyFastMCP,
+    })
 
     app = server.create_app(
         host="127.0.0.1",
@@ -118,6 +124,37 @@ def test_create_app_configures_fastmcp(
     assert app.kwargs["message_path"] == "/api/v1/messages/"
     assert app.kwargs["streamable_http_path"] == "/api/v1/stream"
     assert app.kwargs["log_level"] == "DEBUG"
+    assert app.kwargs["lifespan"] is server._grafana_client_lifespan
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.mark.anyio("asyncio")
+async def test_lifespan_keeps_pool_open_while_another_session_is_active(
+        httpx_mock: Callable[..., Any]) -> None:
+    httpx_mock(lambda request: httpx.Response(200, json={"path": request.url.path}))
+    client = grafana_client.GrafanaClient(GrafanaConfig(url="https://grafana.example"))
+    first = server._grafana_client_lifespan(None)  # type: ignore[arg-type]
+    second = server._grafana_client_lifespan(None)  # type: ignore[arg-type]
+
+    try:
+        await first.__aenter__()
+        await second.__aenter__()
+        await client.get_json("/one")
+        pooled = client._get_client()
+
+        await first.__aexit__(None, None, None)
+        assert not pooled.is_closed
+        assert await client.get_json("/two") == {"path": "/api/two"}
+        assert client._get_client() is pooled
+
+        await second.__aexit__(None, None, None)
+        assert pooled.is_closed
+    finally:
+        await grafana_client.aclose_shared_clients()
 
 
 def test_register_streamable_http_alias_ignores_missing_routes() -> None:
@@ -129,11 +166,8 @@ def test_register_streamable_http_alias_ignores_missing_routes() -> None:
 
 
 def test_register_streamable_http_alias_adds_route(
-        monkeypatch: pytest.MonkeyPatch) -> None:
-    from starlette.applications import Starlette
-    from starlette.responses import PlainTextResponse
-    from starlette.routing import Route
-    from starlette.testclient import TestClient
+        monkeypatch: pytest.MonkeyPatch, run_sync: Callable[..., Any]) -> None:
+    from starlette.routing import Match, Route
 
     alias_calls: list[str] = []
 
@@ -144,8 +178,8 @@ def test_register_streamable_http_alias_adds_route(
         # type: ignore[no-untyped-def]
         async def __call__(self, scope, receive, send) -> None:
             alias_calls.append(scope["path"])
-            response = PlainTextResponse("alias-handled")
-            await response(scope, receive, send)
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"alias-handled"})
 
     module = ModuleType("mcp.server.fastmcp.server")
     module.StreamableHTTPASGIApp = DummyStreamableHTTPASGIApp
@@ -168,28 +202,36 @@ def test_register_streamable_http_alias_adds_route(
     assert alias_route.path == "/{prefix}/link_{link_id}/{rest:path}"
     assert alias_route.methods == {"DELETE", "GET", "HEAD", "POST"}
 
-    base_calls: list[str] = []
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/Grafana/link_123/update_dashboard",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+    }
+    match, child_scope = alias_route.matches(scope)
+    assert match is Match.FULL
+    assert child_scope["path_params"] == {
+        "prefix": "Grafana", "link_id": "123", "rest": "update_dashboard"}
+    scope.update(child_scope)
 
     # type: ignore[no-untyped-def]
-    async def base_endpoint(scope, receive, send) -> None:
-        base_calls.append(scope["path"])
-        response = PlainTextResponse("base")
-        await response(scope, receive, send)
-
-    app = Starlette(
-        routes=[
-            Route(
-                "/mcp",
-                endpoint=base_endpoint,
-                methods=["POST"]),
-            alias_route])
-    client = TestClient(app)
-
-    response = client.post("/Grafana/link_123/update_dashboard")
-    assert response.status_code == 200
-    assert response.text == "alias-handled"
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    messages: list[dict] = []
+
+    # type: ignore[no-untyped-def]
+    async def send(message) -> None:
+        messages.append(message)
+
+    run_sync(alias_route.handle(scope, receive, send))
+
+    assert messages[0]["type"] == "http.response.start"
+    assert messages[0]["status"] == 200
+    assert messages[1]["body"] == b"alias-handled"
     assert alias_calls == ["/mcp"]
-    assert base_calls == []
 
     server._register_streamable_http_alias(dummy)
     assert len(dummy._custom_starlette_routes) == 1
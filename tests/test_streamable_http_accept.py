@@ -2,65 +2,68 @@
 
 from __future__ import annotations
 
+from types import MappingProxyType
+from typing import Mapping
+
+import pytest
 from starlette.requests import Request
 
 from app.patches import ensure_streamable_http_accept_patch
 from mcp.server.streamable_http import StreamableHTTPServerTransport
 
 
-def _make_request(accept_header: str | None) -> Request:
-    scope = {
-        "type": "http",
-        "asgi": {"version": "3.0", "spec_version": "2.3"},
-        "http_version": "1.1",
-        "method": "POST",
-        "scheme": "http",
-        "path": "/mcp",
-        "raw_path": b"/mcp",
-        "root_path": "",
-        "query_string": b"",
-        "headers": [],
-        "client": ("testclient", 1234),
-        "server": ("testserver", 80),
-    }
-
-    if accept_header is not None:
-        scope["headers"].append((b"accept", accept_header.encode("latin-1")))
-
-    async def receive() -> dict[str, object]:
-        return {"type": "http.request", "body": b"", "more_body": False}
-
-    return Request(scope, receive)
-
-
-def test_event_stream_only_accept_header_is_allowed() -> None:
-    ensure_streamable_http_accept_patch()
-    transport = StreamableHTTPServerTransport(mcp_session_id="abc123")
-
-    request = _make_request("text/event-stream")
-    has_json, has_sse = transport._check_accept_headers(request)
+_BASE_SCOPE: Mapping[str, object] = MappingProxyType({
+    "type": "http",
+    "asgi": {"version": "3.0", "spec_version": "2.3"},
+    "http_version": "1.1",
+    "method": "POST",
+    "scheme": "http",
+    "path": "/mcp",
+    "raw_path": b"/mcp",
+    "root_path": "",
+    "query_string": b"",
+    "client": ("testclient", 1234),
+    "server": ("testserver", 80),
+})
 
-    assert has_sse is True
-    assert has_json is True
 
+async def _receive() -> dict[str, object]:
+    return {"type": "http.request", "body": b"", "more_body": False}
 
-def test_wildcard_accept_header_is_allowed() -> None:
-    ensure_streamable_http_accept_patch()
-    transport = StreamableHTTPServerTransport(mcp_session_id="abc123")
 
-    request = _make_request("*/*")
-    has_json, has_sse = transport._check_accept_headers(request)
+def _make_request(accept_header: str | None) -> Request:
+    scope = dict(_BASE_SCOPE)
+    scope["headers"] = [(b"accept", accept_header.encode("latin-1"))] if accept_header is not None else []
+    return Request(scope, _receive)
 
-    assert has_sse is True
-    assert has_json is True
 
+@pytest.fixture(scope="module")
+def transport() -> StreamableHTTPServerTransport:
+    return StreamableHTTPServerTransport(mcp_session_id="abc123")
 
-def test_missing_event_stream_is_detected() -> None:
-    ensure_streamable_http_accept_patch()
-    transport = StreamableHTTPServerTransport(mcp_session_id="abc123")
 
-    request = _make_request("application/json")
-    has_json, has_sse = transport._check_accept_headers(request)
+def test_accept_patch_is_applied_once_per_session() -> None:
+    patched = StreamableHTTPServerTransport._check_accept_headers
+    assert hasattr(StreamableHTTPServerTransport, "_original_check_accept_headers")
 
-    assert has_json is True
-    assert has_sse is False
+    ensure_streamable_http_accept_patch()
+    assert StreamableHTTPServerTransport._check_accept_headers is patched
+
+
+@pytest.mark.parametrize(
+    "accept, expected_json, expected_sse",
+    [
+        pytest.param("text/event-stream", True, True, id="event-stream-only"),
+        pytest.param("*/*", True, True, id="wildcard"),
+        pytest.param("application/json", True, False, id="missing-event-stream"),
+    ],
+)
+def test_accept_header_detection(
+        transport: StreamableHTTPServerTransport,
+        accept: str,
+        expected_json: bool,
+        expected_sse: bool) -> None:
+    has_json, has_sse = transport._check_accept_headers(_make_request(accept))
+
+    assert has_json is expected_json
+    assert has_sse is expected_sse
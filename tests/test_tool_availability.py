@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable
 
 import pytest
 
@@ -11,6 +11,26 @@ from app.config import GrafanaConfig
 from app.tools import availability
 
 
+# Shared, never mutated: capability detection only reads the payloads.  They
+# stay plain lists of dicts because that is the JSON shape the parser accepts.
+_DATASOURCES_PAYLOAD: list[dict[str, Any]] = [
+    {"type": "loki"},
+    {"type": "Prometheus"},
+    {"type": None},
+    {"missing": True},
+]
+_PLUGINS_PAYLOAD: list[dict[str, Any]] = [
+    {"id": "grafana-ml-app"},
+    {"id": "Grafana-IRM-App"},
+    {"id": None},
+]
+
+
+# Capability detection only reads the config, so the instances are shared.
+_CONFIG_URL = GrafanaConfig(url="https://grafana.example.com")
+_CONFIG_EMPTY = GrafanaConfig()
+
+
 class DummyGrafanaClient:
     def __init__(self, config: GrafanaConfig) -> None:
         self.config = config
@@ -22,18 +42,9 @@ class DummyGrafanaClient:
                                     Any] | None = None) -> Any:
         self.calls.append(path)
         if path == "/datasources":
-            return [
-                {"type": "loki"},
-                {"type": "Prometheus"},
-                {"type": None},
-                {"missing": True},
-            ]
+            return _DATASOURCES_PAYLOAD
         if path == "/plugins":
-            return [
-                {"id": "grafana-ml-app"},
-                {"id": "Grafana-IRM-App"},
-                {"id": None},
-            ]
+            return _PLUGINS_PAYLOAD
         raise AssertionError(f"Unexpected path requested: {path}")
 
 
@@ -41,8 +52,7 @@ def test_detect_capabilities_normalizes_values(
         monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(availability, "GrafanaClient", DummyGrafanaClient)
 
-    config = GrafanaConfig(url="https://grafana.example.com")
-    capabilities = availability.detect_capabilities(config)
+    capabilities = availability.detect_capabilities(_CONFIG_URL)
 
     assert capabilities.has_datasource_type("LOKI")
     assert capabilities.has_datasource_type("prometheus")
@@ -53,55 +63,38 @@ def test_detect_capabilities_normalizes_values(
     assert not capabilities.has_plugin("grafana-asserts-app")
 
 
-def test_detect_capabilities_handles_event_loop(
+def test_detect_capabilities_falls_back_when_loop_is_running(
         monkeypatch: pytest.MonkeyPatch) -> None:
     calls: list[str] = []
-    collected = False
-
-    async def fake_collect(
-            config: GrafanaConfig) -> availability.GrafanaCapabilities:
-        nonlocal collected
-        collected = True
-        return availability.GrafanaCapabilities(
-            plugin_ids=frozenset({"fallback"}))
-
-    monkeypatch.setattr(availability, "_collect_capabilities", fake_collect)
-
-    original_run = asyncio.run
-    real_new_loop = asyncio.new_event_loop
+    fallback = availability.GrafanaCapabilities(plugin_ids=frozenset({"fallback"}))
 
-    def fake_run(coro: object) -> availability.GrafanaCapabilities:
-        if hasattr(coro, "close"):
-            coro.close()  # type: ignore[attr-defined]
+    def fake_run(coro: Any) -> availability.GrafanaCapabilities:
+        calls.append("asyncio.run")
+        coro.close()
         raise RuntimeError(
             "asyncio.run() cannot be called from a running event loop")
 
-    class DummyLoop:
-        def run_until_complete(
-                self,
-                coro: object) -> availability.GrafanaCapabilities:
-            calls.append("loop_run")
-            temp_loop = real_new_loop()
-            try:
-                asyncio.set_event_loop(temp_loop)
-                return temp_loop.run_until_complete(
-                    coro)  # type: ignore[arg-type]
-            finally:
-                asyncio.set_event_loop(None)
-                temp_loop.close()
-
-        def close(self) -> None:
-            calls.append("loop_close")
+    def fake_run_in_new_loop(coro: Any) -> availability.GrafanaCapabilities:
+        calls.append("fallback")
+        coro.close()
+        return fallback
 
     monkeypatch.setattr(asyncio, "run", fake_run)
-    monkeypatch.setattr(asyncio, "new_event_loop", lambda: DummyLoop())
+    monkeypatch.setattr(availability, "_run_in_new_loop", fake_run_in_new_loop)
 
-    capabilities = availability.detect_capabilities(GrafanaConfig())
+    assert availability.detect_capabilities(_CONFIG_EMPTY) is fallback
+    assert calls == ["asyncio.run", "fallback"]
 
-    assert isinstance(capabilities, availability.GrafanaCapabilities)
-    assert capabilities.plugin_ids == frozenset({"fallback"})
-    assert collected is True
-    assert calls == ["loop_run", "loop_close"]
+
+def test_run_in_new_loop_returns_result_and_closes_loop() -> None:
+    loops: list[asyncio.AbstractEventLoop] = []
+
+    async def probe() -> str:
+        loops.append(asyncio.get_running_loop())
+        return "done"
+
+    assert availability._run_in_new_loop(probe()) == "done"
+    assert loops[0].is_closed()
 
 
 def test_detect_capabilities_handles_runtime_error(
@@ -113,7 +106,7 @@ def test_detect_capabilities_handles_runtime_error(
 
     monkeypatch.setattr(asyncio, "run", fake_run)
 
-    capabilities = availability.detect_capabilities(GrafanaConfig())
+    capabilities = availability.detect_capabilities(_CONFIG_EMPTY)
 
     assert isinstance(capabilities, availability.GrafanaCapabilities)
     assert not capabilities.datasource_types
@@ -135,71 +128,92 @@ def test_normalize_items_handles_mixed_values() -> None:
     assert normalized == frozenset({"loki", "prometheus", "123"})
 
 
-@pytest.mark.parametrize("payload, expected",
-                         [([{"type": "Loki"},
-                            {"type": "  prometheus  "},
-                             {"type": None},
-                             "ignored"],
-                             {"loki",
-                              "prometheus"}),
-                             ({"datasources": [{"type": "Tempo"}]},
-                              {"tempo"}),
-                             ({"items": [{"type": "Zipkin"}]},
-                              {"zipkin"}),
-                             ({"unexpected": True},
-                              set()),
-                             ("not-iterable",
-                              set()),
-                          ],
-                         )
-def test_fetch_datasource_types_parses_payloads(
-        payload: Any, expected: set[str]) -> None:
-    class PayloadClient:
-        def __init__(self, value: Any) -> None:
-            self.value = value
-
-        async def get_json(
-                self, path: str, params: dict[str, Any] | None = None) -> Any:
-            assert path == "/datasources"
-            return self.value
-
-    client = PayloadClient(payload)
-    result = asyncio.run(availability._fetch_datasource_types(
-        client))  # type: ignore[arg-type]
-    assert result == expected
-
-
-@pytest.mark.parametrize("payload, expected",
-                         [([{"id": "grafana-ml-app"},
-                            {"id": " Grafana-IRM-App "},
-                             {"id": None},
-                             123],
-                             {"grafana-ml-app",
-                              "grafana-irm-app"}),
-                             ({"items": [{"id": "grafana-asserts-app"}]},
-                              {"grafana-asserts-app"}),
-                             ({"plugins": [{"id": "grafana-pyroscope-app"}]},
-                              {"grafana-pyroscope-app"}),
-                             ({"unexpected": True},
-                              set()),
-                             (123,
-                              set()),
-                          ],
-                         )
-def test_fetch_plugin_ids_parses_payloads(
-        payload: Any, expected: set[str]) -> None:
-    class PayloadClient:
-        def __init__(self, value: Any) -> None:
-            self.value = value
-
-        async def get_json(
-                self, path: str, params: dict[str, Any] | None = None) -> Any:
-            assert path == "/plugins"
-            return self.value
-
-    client = PayloadClient(payload)
-    result = asyncio.run(availability._fetch_plugin_ids(
-        client))  # type: ignore[arg-type]
+_NONE: frozenset[str] = frozenset()
+
+_FETCH_CASES = [
+    pytest.param(
+        availability._fetch_datasource_types,
+        "/datasources",
+        [{"type": "Loki"}, {"type": "  prometheus  "}, {"type": None}, "ignored"],
+        frozenset({"loki", "prometheus"}),
+        id="datasources-list"),
+    pytest.param(
+        availability._fetch_datasource_types,
+        "/datasources",
+        {"datasources": [{"type": "Tempo"}]},
+        frozenset({"tempo"}),
+        id="datasources-key"),
+    pytest.param(
+        availability._fetch_datasource_types,
+        "/datasources",
+        {"items": [{"type": "Zipkin"}]},
+        frozenset({"zipkin"}),
+        id="datasources-items"),
+    pytest.param(
+        availability._fetch_datasource_types,
+        "/datasources",
+        {"unexpected": True},
+        _NONE,
+        id="datasources-unexpected"),
+    pytest.param(
+        availability._fetch_datasource_types,
+        "/datasources",
+        "not-iterable",
+        _NONE,
+        id="datasources-scalar"),
+    pytest.param(
+        availability._fetch_plugin_ids,
+        "/plugins",
+        [{"id": "grafana-ml-app"}, {"id": " Grafana-IRM-App "}, {"id": None}, 123],
+        frozenset({"grafana-ml-app", "grafana-irm-app"}),
+        id="plugins-list"),
+    pytest.param(
+        availability._fetch_plugin_ids,
+        "/plugins",
+        {"items": [{"id": "grafana-asserts-app"}]},
+        frozenset({"grafana-asserts-app"}),
+        id="plugins-items"),
+    pytest.param(
+        availability._fetch_plugin_ids,
+        "/plugins",
+        {"plugins": [{"id": "grafana-pyroscope-app"}]},
+        frozenset({"grafana-pyroscope-app"}),
+        id="plugins-key"),
+    pytest.param(
+        availability._fetch_plugin_ids,
+        "/plugins",
+        {"unexpected": True},
+        _NONE,
+        id="plugins-unexpected"),
+    pytest.param(
+        availability._fetch_plugin_ids,
+        "/plugins",
+        123,
+        _NONE,
+        id="plugins-scalar"),
+]
+
+
+class PayloadClient:
+    def __init__(self, path: str, value: Any) -> None:
+        self.path = path
+        self.value = value
+
+    async def get_json(
+            self, path: str, params: dict[str, Any] | None = None) -> Any:
+        assert path == self.path
+        return self.value
+
+
+@pytest.mark.parametrize("fetcher, path, payload, expected", _FETCH_CASES)
+def test_fetch_helpers_parse_payloads(
+        fetcher: Callable[..., Any],
+        path: str,
+        payload: Any,
+        expected: frozenset[str],
+        run_sync: Callable[..., Any]) -> None:
+    client = PayloadClient(path, payload)
+    result = run_sync(fetcher(client))
     assert result == expected
 
 
@@ -222,8 +236,7 @@ def test_collect_capabilities_uses_grafana_client(
 
     monkeypatch.setattr(availability, "GrafanaClient", DummyClient)
 
-    config = GrafanaConfig(url="https://grafana.example.com")
-    capabilities = availability.detect_capabilities(config)
+    capabilities = availability.detect_capabilities(_CONFIG_URL)
 
     assert calls == ["/datasources", "/plugins"]
     assert capabilities.datasource_types == frozenset({"loki"})
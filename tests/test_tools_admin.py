@@ -2,14 +2,12 @@
 
 from __future__ import annotations
 
-import asyncio
 from types import SimpleNamespace
-from typing import Any
+from typing import Any, Callable
 
 import pytest
 
 from app.tools import admin
-from mcp.server.fastmcp import FastMCP
 
 
 class DummyClient:
@@ -21,39 +19,42 @@ class DummyClient:
         return {"path": path, "params": params}
 
 
+# Read-only for the helpers under test, so every test shares one instance.
+_CONFIG = SimpleNamespace(url="https://grafana.local")
+
+
 @pytest.fixture
-def dummy_ctx(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
-    config = SimpleNamespace(url="https://grafana.local")
-    monkeypatch.setattr(admin, "get_grafana_config", lambda _: config)
+def dummy_ctx(monkeypatch: pytest.MonkeyPatch, tool_ctx: Any) -> Any:
+    monkeypatch.setattr(admin, "get_grafana_config", lambda _: _CONFIG)
     monkeypatch.setattr(admin, "GrafanaClient", DummyClient)
-    ctx = SimpleNamespace(
-        request_context=SimpleNamespace(
-            session=SimpleNamespace(),
-            request=None))
-    return ctx
+    return tool_ctx
 
 
-def test_list_teams_calls_grafana_api(dummy_ctx: SimpleNamespace) -> None:
-    result = asyncio.run(admin._list_teams("prod", dummy_ctx))
+def test_list_teams_calls_grafana_api(
+        dummy_ctx: Any, run_sync: Callable[..., Any]) -> None:
+    result = run_sync(admin._list_teams("prod", dummy_ctx))
     assert result == {"path": "/teams/search", "params": {"query": "prod"}}
 
-    result_no_query = asyncio.run(admin._list_teams(None, dummy_ctx))
+    result_no_query = run_sync(admin._list_teams(None, dummy_ctx))
     assert result_no_query == {"path": "/teams/search", "params": None}
 
 
-def test_list_users(dummy_ctx: SimpleNamespace) -> None:
-    result = asyncio.run(admin._list_users(dummy_ctx))
+def test_list_users(
+        dummy_ctx: Any, run_sync: Callable[..., Any]) -> None:
+    result = run_sync(admin._list_users(dummy_ctx))
     assert result == {"path": "/org/users", "params": None}
 
 
-def test_admin_tools_require_context(monkeypatch: pytest.MonkeyPatch) -> None:
-    app = FastMCP()
-    admin.register(app)
+@pytest.fixture(scope="module")
+def admin_tools(tool_map: Callable[..., dict[str, Any]]) -> dict[str, Any]:
+    """Register the admin tools once for every test in this module."""
+
+    return tool_map(admin.register)
+
 
-    tools = asyncio.run(app.list_tools())
-    tool_names = {tool.name for tool in tools}
-    assert {"list_teams", "list_users_by_org"}.issubset(tool_names)
+def test_admin_tools_require_context(
+        admin_tools: dict[str, Any], run_sync: Callable[..., Any]) -> None:
+    assert {"list_teams", "list_users_by_org"}.issubset(admin_tools)
 
-    list_teams_tool = next(tool for tool in tools if tool.name == "list_teams")
     with pytest.raises(ValueError):
-        asyncio.run(list_teams_tool.function(query="foo", ctx=None))
+        run_sync(admin_tools["list_teams"].function(query="foo", ctx=None))
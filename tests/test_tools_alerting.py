@@ -2,45 +2,47 @@
 
 from __future__ import annotations
 
-import asyncio
 from types import SimpleNamespace
-from typing import Any, Dict, Iterable
+from typing import Any, Callable, Dict, Iterable
 
 import pytest
 
 from app.grafana_client import GrafanaAPIError
 from app.tools import alerting
 from app.tools._label_matching import LabelMatcher
-from mcp.server.fastmcp import FastMCP
 
 
 class DummyClient:
     def __init__(self, *_: Any, **__: Any) -> None:
-        self.responses: Dict[str, Any] = {}
+        # path -> (is_exception, value); classified once in ``respond``.
+        self.responses: Dict[str, tuple[bool, Any]] = {}
         self.calls: list[tuple[str, Any]] = []
 
+    def respond(self, path: str, value: Any) -> None:
+        self.responses[path] = (isinstance(value, Exception), value)
+
     async def get_json(self, path: str, params: Any = None) -> Any:
         self.calls.append((path, params))
-        if path in self.responses:
-            result = self.responses[path]
-            if isinstance(result, Exception):
-                raise result
-            return result
-        return self.responses.get(path)
+        entry = self.responses.get(path)
+        if entry is None:
+            return None
+        is_exc, value = entry
+        if is_exc:
+            raise value
+        return value
+
+
+# Read-only for the helpers under test, so every test shares one instance.
+_CONFIG = SimpleNamespace(url="https://grafana.local")
 
 
 @pytest.fixture
 def ctx(
-        monkeypatch: pytest.MonkeyPatch) -> tuple[SimpleNamespace, DummyClient]:
-    config = SimpleNamespace(url="https://grafana.local")
+        monkeypatch: pytest.MonkeyPatch, tool_ctx: Any) -> tuple[Any, DummyClient]:
     client = DummyClient()
-    monkeypatch.setattr(alerting, "get_grafana_config", lambda _: config)
+    monkeypatch.setattr(alerting, "get_grafana_config", lambda _: _CONFIG)
     monkeypatch.setattr(alerting, "GrafanaClient", lambda cfg: client)
-    ctx = SimpleNamespace(
-        request_context=SimpleNamespace(
-            session=SimpleNamespace(),
-            request=None))
-    return ctx, client
+    return tool_ctx, client
 
 
 def test_parse_label_matchers_and_selectors() -> None:
@@ -61,9 +63,10 @@ def test_parse_label_matchers_and_selectors() -> None:
 
 
 def test_fetch_alert_rules_and_filtering(
-        ctx: tuple[SimpleNamespace, DummyClient]) -> None:
+        ctx: tuple[Any, DummyClient],
+        run_sync: Callable[..., Any]) -> None:
     ctx_obj, client = ctx
-    client.responses["/prometheus/grafana/api/v1/rules"] = {
+    client.respond("/prometheus/grafana/api/v1/rules", {
         "data": {
             "groups": [
                 {
@@ -74,9 +77,9 @@ def test_fetch_alert_rules_and_filtering(
                 }
             ]
         }
-    }
+    })
     selectors = [LabelMatcher(name="job", value="api")]
-    rules = asyncio.run(alerting._fetch_alert_rules(client))
+    rules = run_sync(alerting._fetch_alert_rules(client))
     filtered = alerting._filter_rules_by_selectors(
         rules, [alerting.Selector(selectors)])
     assert filtered == [rules[0]]
@@ -89,44 +92,49 @@ def test_fetch_alert_rules_and_filtering(
     summarized = [alerting._summarize_alert_rule(rule) for rule in filtered]
     assert summarized[0]["uid"] == "1"
 
-    listing = asyncio.run(alerting._list_alert_rules(ctx_obj, limit=1, page=1, label_selectors=[
-                          {"filters": [{"name": "job", "value": "api"}]}]))
+    listing = run_sync(alerting._list_alert_rules(ctx_obj, limit=1, page=1, label_selectors=[
+                       {"filters": [{"name": "job", "value": "api"}]}]))
     assert listing[0]["title"] == "Rule A"
 
 
 def test_get_alert_rule_handles_404(
-        monkeypatch: pytest.MonkeyPatch, ctx: tuple[SimpleNamespace, DummyClient]) -> None:
+        monkeypatch: pytest.MonkeyPatch, ctx: tuple[Any, DummyClient],
+        run_sync: Callable[..., Any]) -> None:
     ctx_obj, client = ctx
-    client.responses["/v1/provisioning/alert-rules/rule"] = GrafanaAPIError(
-        404, "not found")
+    client.respond("/v1/provisioning/alert-rules/rule", GrafanaAPIError(
+        404, "not found"))
     with pytest.raises(ValueError):
-        asyncio.run(alerting._get_alert_rule(ctx_obj, "rule"))
+        run_sync(alerting._get_alert_rule(ctx_obj, "rule"))
 
 
 def test_list_contact_points_and_validation(
-        ctx: tuple[SimpleNamespace, DummyClient]) -> None:
+        ctx: tuple[Any, DummyClient],
+        run_sync: Callable[..., Any]) -> None:
     ctx_obj, client = ctx
-    client.responses["/v1/provisioning/contact-points"] = [
+    client.respond("/v1/provisioning/contact-points", [
         {"uid": "1", "name": "Email", "type": "email"},
         {"uid": "2", "name": "Pager", "type": "pagerduty"},
-    ]
-    result = asyncio.run(
+    ])
+    result = run_sync(
         alerting._list_contact_points(
             ctx_obj, limit=1, name="Email"))
     assert result == [{"uid": "1", "name": "Email", "type": "email"}]
     with pytest.raises(ValueError):
-        asyncio.run(
+        run_sync(
             alerting._list_contact_points(
                 ctx_obj,
                 limit=-1,
                 name=None))
 
 
-def test_alerting_tools_require_context() -> None:
-    app = FastMCP()
-    alerting.register(app)
-    tools = asyncio.run(app.list_tools())
-    no_ctx_tool = next(
-        tool for tool in tools if tool.name == "list_alert_rules")
+@pytest.fixture(scope="module")
+def alerting_tools(tool_map: Callable[..., Dict[str, Any]]) -> Dict[str, Any]:
+    """Register the alerting tools once for every test in this module."""
+
+    return tool_map(alerting.register)
+
+
+def test_alerting_tools_require_context(
+        alerting_tools: Dict[str, Any], run_sync: Callable[..., Any]) -> None:
     with pytest.raises(ValueError):
-        asyncio.run(no_ctx_tool.function(ctx=None))
+        run_sync(alerting_tools["list_alert_rules"].function(ctx=None))
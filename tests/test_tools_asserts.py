@@ -2,33 +2,29 @@
 
 from __future__ import annotations
 
-import asyncio
-from datetime import datetime, timedelta, timezone
+import time
+from datetime import datetime, timezone
 from types import SimpleNamespace
+from typing import Any, Callable, Dict
 
 import pytest
 
 from app.tools import asserts as asserts_module
 from app.tools.asserts import _parse_time
-from mcp.server.fastmcp import FastMCP
+
+
+_EXPECTED_ISO_MS = int(datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc).timestamp() * 1000)
+_HOUR_MS = 3_600_000
+_MINUTE_MS = 60_000
 
 
 def _now_ms() -> int:
-    return int(datetime.now(timezone.utc).timestamp() * 1000)
+    return time.time_ns() // 1_000_000
 
 
 def test_parse_time_accepts_iso_strings() -> None:
     timestamp = _parse_time("2024-01-02T03:04:05+00:00", "startTime")
-    assert timestamp == int(
-        datetime(
-            2024,
-            1,
-            2,
-            3,
-            4,
-            5,
-            tzinfo=timezone.utc).timestamp() *
-        1000)
+    assert timestamp == _EXPECTED_ISO_MS
 
 
 def test_parse_time_accepts_relative_now() -> None:
@@ -40,16 +36,22 @@ def test_parse_time_accepts_relative_now() -> None:
 
 def test_parse_time_accepts_now_minus_duration() -> None:
     result = _parse_time("now-1h", "startTime")
-    expected = datetime.now(timezone.utc) - timedelta(hours=1)
-    difference_ms = abs(result - int(expected.timestamp() * 1000))
+    difference_ms = abs(result - (_now_ms() - _HOUR_MS))
     assert difference_ms < 5000  # allow a small delta for runtime delay
 
 
 def test_parse_time_accepts_combined_offsets() -> None:
     result = _parse_time("now-1h+30m", "startTime")
-    expected = datetime.now(timezone.utc) - \
-        timedelta(hours=1) + timedelta(minutes=30)
-    assert abs(result - int(expected.timestamp() * 1000)) < 5000
+    expected = _now_ms() - _HOUR_MS + 30 * _MINUTE_MS
+    assert abs(result - expected) < 5000
+
+
+def test_parse_time_spec_caches_relative_offsets() -> None:
+    asserts_module._parse_time_spec.cache_clear()
+    assert asserts_module._parse_time_spec("now-1h+30m") == (True, -_HOUR_MS + 30 * _MINUTE_MS)
+    assert asserts_module._parse_time_spec("now-1h+30m") == (True, -_HOUR_MS + 30 * _MINUTE_MS)
+    assert asserts_module._parse_time_spec("2024-01-02T03:04:05Z") == (False, _EXPECTED_ISO_MS)
+    assert asserts_module._parse_time_spec.cache_info().hits == 1
 
 
 def test_parse_time_rejects_unknown_units() -> None:
@@ -73,7 +75,7 @@ def test_parse_time_rejects_invalid_isoformat() -> None:
 
 
 def test_get_assertions_builds_request(
-        monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch: pytest.MonkeyPatch, run_sync: Callable[..., Any]) -> None:
     captured: dict[str, object] = {}
 
     class DummyClient:
@@ -102,7 +104,7 @@ def test_get_assertions_builds_request(
         "site": "us-east",
         "namespace": "default",
     }
-    result = asyncio.run(asserts_module._get_assertions(ctx, args))
+    result = run_sync(asserts_module._get_assertions(ctx, args))
     assert result == "summary"
     assert captured["path"].endswith("assertions/llm-summary")
     payload = captured["json"]
@@ -110,13 +112,10 @@ def test_get_assertions_builds_request(
 
 
 def test_get_assertions_tool_requires_context(
-        monkeypatch: pytest.MonkeyPatch) -> None:
-    app = FastMCP()
-    asserts_module.register(app)
-    tool = next(tool for tool in asyncio.run(app.list_tools())
-                if tool.name == "get_assertions")
+        tool_map: Callable[..., Dict[str, Any]], run_sync: Callable[..., Any]) -> None:
+    tool = tool_map(asserts_module.register)["get_assertions"]
     with pytest.raises(ValueError):
-        asyncio.run(tool.function(
+        run_sync(tool.function(
             startTime="now",
             endTime="now",
             entityType="service",
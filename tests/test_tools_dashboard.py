@@ -2,55 +2,57 @@
 
 from __future__ import annotations
 
-import asyncio
-import re
-from copy import deepcopy
+import json
+import math
 from types import SimpleNamespace
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 import pytest
 
 from app.tools import dashboard
-from mcp.server.fastmcp import FastMCP
 
 
-@pytest.fixture
-def sample_dashboard() -> Dict[str, Any]:
-    return {"dashboard": {"title": "Example",
-                          "description": "Sample",
-                          "tags": ["infra"],
-                          "refresh": "5m",
-                          "time": {"from": "now-1h",
-                                   "to": "now"},
-                          "panels": [{"id": 1,
-                                      "title": "CPU",
-                                      "type": "graph",
-                                      "description": "CPU usage",
-                                      "targets": [{"expr": "sum(rate(http_requests_total[5m]))"}],
-                                      "datasource": {"uid": "ds1",
-                                                     "type": "prometheus"},
-                                      },
-                                     {"id": 2,
-                                      "title": "Logs",
-                                      "type": "logs",
-                                      "targets": [],
-                                      },
-                                     ],
-                          "templating": {"list": [{"name": "env",
-                                                   "type": "query",
-                                                   "label": "Environment"}]},
-                          },
-            "meta": {"folderUid": "folder"},
-            }
-
-
-@pytest.fixture(autouse=True)
-def patch_json_path_regex(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr(
-        dashboard,
-        "_SEGMENT_RE",
-        re.compile(r"([^\.\[\]/]+)(?:\[((?:\d+)|\*)\])?(?:(/-))?"),
-    )
+# Built once; tests get fresh copies via _clone_sample(), so they may mutate freely.
+_SAMPLE_DASHBOARD: Dict[str, Any] = {
+    "dashboard": {
+        "title": "Example",
+        "description": "Sample",
+        "tags": ["infra"],
+        "refresh": "5m",
+        "time": {"from": "now-1h", "to": "now"},
+        "panels": [
+            {
+                "id": 1,
+                "title": "CPU",
+                "type": "graph",
+                "description": "CPU usage",
+                "targets": [{"expr": "sum(rate(http_requests_total[5m]))"}],
+                "datasource": {"uid": "ds1", "type": "prometheus"},
+            },
+            {
+                "id": 2,
+                "title": "Logs",
+                "type": "logs",
+                "targets": [],
+            },
+        ],
+        "templating": {"list": [{"name": "env", "type": "query", "label": "Environment"}]},
+    },
+    "meta": {"folderUid": "folder"},
+}
+_SAMPLE_JSON = json.dumps(_SAMPLE_DASHBOARD)
+
+
+def _clone_sample() -> Dict[str, Any]:
+    return json.loads(_SAMPLE_JSON)
+
+
+@pytest.fixture(scope="module")
+def sample_dashboard() -> Iterator[Dict[str, Any]]:
+    """Shared read-only sample; tests that mutate must use _clone_sample()."""
+    sample = _clone_sample()
+    yield sample
+    assert json.dumps(sample) == _SAMPLE_JSON, "sample_dashboard was mutated"
 
 
 def test_parse_json_path_and_navigation() -> None:
@@ -58,11 +60,11 @@ def test_parse_json_path_and_navigation() -> None:
     assert segments[0].is_array and segments[0].index == 0
     append_segments = dashboard._parse_json_path("panels/-")
     assert append_segments[-1].is_append is True
+    assert dashboard._parse_json_path("panels[0]") is segments
 
     data = {"panels": [{"targets": [{}]}]}
     dashboard._apply_json_path(
-        data, "panels[0].targets[0]", {
-            "expr": "1"}, remove=False)
+        data, "panels[0].targets[0]", {"expr": "1"}, remove=False)
     assert data["panels"][0]["targets"][0]["expr"] == "1"
     dashboard._apply_json_path(
         data, "panels[0].targets/-", {"expr": "2"}, remove=False)
@@ -72,6 +74,9 @@ def test_parse_json_path_and_navigation() -> None:
 
 
 def test_parse_json_path_errors() -> None:
+    for malformed in ("panels[x]", "panels..title", "panels/title"):
+        with pytest.raises(ValueError):
+            dashboard._parse_json_path(malformed)
     with pytest.raises(ValueError):
         dashboard._apply_json_path({}, "", None, remove=False)
     with pytest.raises(ValueError):
@@ -98,14 +103,18 @@ def test_build_summary(sample_dashboard: Dict[str, Any]) -> None:
 
 
 class DummyDashboardClient:
-    def __init__(self, payload: Dict[str, Any]) -> None:
-        self.payload = deepcopy(payload)
+    def __init__(self, payload: Dict[str, Any], *, readonly: bool = False) -> None:
+        self._payload_json = json.dumps(payload)
+        # Read-only clients hand out one decoded copy instead of a fresh one per call.
+        self._shared = json.loads(self._payload_json) if readonly else None
         self.post_calls: list[tuple[str, Dict[str, Any], Dict[str, Any]]] = []
         self.get_calls: List[str] = []
 
     async def get_json(self, path: str) -> Dict[str, Any]:
         self.get_calls.append(path)
-        return deepcopy(self.payload)
+        if self._shared is not None:
+            return self._shared
+        return json.loads(self._payload_json)
 
     async def post_json(
         self,
@@ -120,32 +129,35 @@ class DummyDashboardClient:
 
 
 @pytest.fixture
-def dashboard_tools(monkeypatch: pytest.MonkeyPatch,
-                    sample_dashboard: Dict[str,
-                                           Any]) -> tuple[Dict[str,
-                                                               Any],
-                                                          DummyDashboardClient,
-                                                          SimpleNamespace]:
-    client = DummyDashboardClient(sample_dashboard)
+def dashboard_tools(
+        monkeypatch: pytest.MonkeyPatch,
+        sample_dashboard: Dict[str, Any], fresh_tool_ctx: Any,
+        tool_map: Callable[..., Dict[str, Any]]) -> tuple[Dict[str, Any], DummyDashboardClient, Any]:
+    # _get_dashboard clones whatever the client returns, so tools never mutate it.
+    client = DummyDashboardClient(sample_dashboard, readonly=True)
     config = SimpleNamespace()
     monkeypatch.setattr(dashboard, "get_grafana_config", lambda _: config)
     monkeypatch.setattr(dashboard, "GrafanaClient", lambda cfg: client)
-    ctx = SimpleNamespace(
-        request_context=SimpleNamespace(
-            session=SimpleNamespace()))
-    app = FastMCP()
-    dashboard.register(app)
-    tool_map = {tool.name: tool for tool in asyncio.run(app.list_tools())}
-    return tool_map, client, ctx
+    return tool_map(dashboard.register), client, fresh_tool_ctx
 
 
-def test_update_dashboard_with_patches(
-        monkeypatch: pytest.MonkeyPatch, sample_dashboard: Dict[str, Any]) -> None:
-    captured: Dict[str, Any] = {}
+_FAKE_POST_RESULT: Dict[str, Any] = {
+    "status": "success",
+    "type": "dashboard_operation_result",
+    "operation": "update",
+    "grafana_response": {"status": "ok"},
+}
+
+
+async def _fake_get_dashboard(
+        ctx: Any, uid: str, *, use_cache: bool = True) -> Dict[str, Any]:
+    return _clone_sample()
 
-    async def fake_get(ctx: Any, uid: str, *
-    , use_cache: bool = True) -> Dict[str, Any]:
-        return deepcopy(sample_dashboard)
+
+def _patch_dashboard_io(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
+    """Serve the sample dashboard and record what would be posted."""
+
+    captured: Dict[str, Any] = {}
 
     async def fake_post(
         ctx: Any,
@@ -155,35 +167,37 @@ def test_update_dashboard_with_patches(
         overwrite: bool,
         user_id: int | None,
     ) -> Dict[str, Any]:
-        captured["dashboard"] = dashboard_json
-        captured["folder"] = folder
-        captured["message"] = message
-        captured["overwrite"] = overwrite
-        captured["user_id"] = user_id
-        return {
-            "status": "success",
-            "type": "dashboard_operation_result",
-            "operation": "update",
-            "grafana_response": {"status": "ok"}
-        }
+        captured.update(
+            dashboard=dashboard_json,
+            folder=folder,
+            message=message,
+            overwrite=overwrite,
+            user_id=user_id,
+        )
+        return _FAKE_POST_RESULT
 
-    monkeypatch.setattr(dashboard, "_get_dashboard", fake_get)
+    monkeypatch.setattr(dashboard, "_get_dashboard", _fake_get_dashboard)
     monkeypatch.setattr(dashboard, "_post_dashboard", fake_post)
+    return captured
 
-    ctx = SimpleNamespace(
-        request_context=SimpleNamespace(
-            session=SimpleNamespace()))
-    operations = [
-        {"op": "replace", "path": "title", "value": "Updated"},
-        {"op": "add", "path": "panels/-", "value": {"id": 3}},
-        {"op": "remove", "path": "description"},
-    ]
 
-    result = asyncio.run(
+# Canned patch operations; the update helpers copy each mapping, so tuples are safe to share.
+_REPLACE_TITLE_OPS = ({"op": "replace", "path": "title", "value": "Updated"},)
+_PATCH_OPS = _REPLACE_TITLE_OPS + (
+    {"op": "add", "path": "panels/-", "value": {"id": 3}},
+    {"op": "remove", "path": "description"},
+)
+
+
+def test_update_dashboard_with_patches(
+        monkeypatch: pytest.MonkeyPatch, tool_ctx: Any, run_sync: Callable[..., Any]) -> None:
+    captured = _patch_dashboard_io(monkeypatch)
+
+    result = run_sync(
         dashboard._update_dashboard_with_patches(
-            ctx,
+            tool_ctx,
             "uid123",
-            operations,
+            _PATCH_OPS,
             folder_uid=None,
             message="msg",
             user_id=7,
@@ -200,40 +214,10 @@ def test_update_dashboard_with_patches(
 
 
 def test_update_dashboard_with_structured_operations(
-    monkeypatch: pytest.MonkeyPatch, sample_dashboard: Dict[str, Any]
+    monkeypatch: pytest.MonkeyPatch, tool_ctx: Any, run_sync: Callable[..., Any],
 ) -> None:
-    captured: Dict[str, Any] = {}
-
-    async def fake_get(ctx: Any, uid: str, *
-    , use_cache: bool = True) -> Dict[str, Any]:
-        return deepcopy(sample_dashboard)
+    captured = _patch_dashboard_io(monkeypatch)
 
-    async def fake_post(
-        ctx: Any,
-        dashboard_json: Dict[str, Any],
-        folder: str | None,
-        message: str | None,
-        overwrite: bool,
-        user_id: int | None,
-    ) -> Dict[str, Any]:
-        captured["dashboard"] = dashboard_json
-        captured["folder"] = folder
-        captured["message"] = message
-        captured["overwrite"] = overwrite
-        captured["user_id"] = user_id
-        return {
-            "status": "success",
-            "type": "dashboard_operation_result",
-            "operation": "update",
-            "grafana_response": {"status": "ok"}
-        }
-
-    monkeypatch.setattr(dashboard, "_get_dashboard", fake_get)
-    monkeypatch.setattr(dashboard, "_post_dashboard", fake_post)
-
-    ctx = SimpleNamespace(
-        request_context=SimpleNamespace(
-            session=SimpleNamespace()))
     operations = [
         dashboard.DashboardPatchOperation(
             op="replace",
@@ -249,9 +233,9 @@ def test_update_dashboard_with_structured_operations(
             path="description"),
     ]
 
-    result = asyncio.run(
+    result = run_sync(
         dashboard._update_dashboard_with_patches(
-            ctx,
+            tool_ctx,
             "uid123",
             operations,
             folder_uid=None,
@@ -285,35 +269,13 @@ def test_apply_dashboard_defaults(monkeypatch: pytest.MonkeyPatch) -> None:
 
 
 def test_update_dashboard_full(
-        monkeypatch: pytest.MonkeyPatch, sample_dashboard: Dict[str, Any]) -> None:
-    captured: Dict[str, Any] = {}
-
-    async def fake_post(
-        ctx: Any,
-        dashboard_json: Dict[str, Any],
-        folder: str | None,
-        message: str | None,
-        overwrite: bool,
-        user_id: int | None,
-    ) -> Dict[str, Any]:
-        captured["dashboard"] = dashboard_json
-        captured["folder"] = folder
-        captured["overwrite"] = overwrite
-        return {
-            "status": "success",
-            "type": "dashboard_operation_result",
-            "operation": "update",
-            "grafana_response": {"status": "ok"}
-        }
+        monkeypatch: pytest.MonkeyPatch, sample_dashboard: Dict[str, Any],
+        tool_ctx: Any, run_sync: Callable[..., Any]) -> None:
+    captured = _patch_dashboard_io(monkeypatch)
 
-    monkeypatch.setattr(dashboard, "_post_dashboard", fake_post)
-    ctx = SimpleNamespace(
-        request_context=SimpleNamespace(
-            session=SimpleNamespace()))
-
-    result = asyncio.run(
+    result = run_sync(
         dashboard._update_dashboard(
-            ctx,
+            tool_ctx,
             sample_dashboard["dashboard"],
             None,
             None,
@@ -332,9 +294,9 @@ def test_update_dashboard_full(
     assert captured["overwrite"] is True
 
     with pytest.raises(ValueError):
-        asyncio.run(
+        run_sync(
             dashboard._update_dashboard(
-                ctx,
+                tool_ctx,
                 None,
                 None,
                 None,
@@ -344,11 +306,9 @@ def test_update_dashboard_full(
                 None))
 
 
-def test_post_dashboard_conflict(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_post_dashboard_conflict(
+        monkeypatch: pytest.MonkeyPatch, tool_ctx: Any, run_sync: Callable[..., Any]) -> None:
     config = SimpleNamespace()
-    ctx = SimpleNamespace(
-        request_context=SimpleNamespace(
-            session=SimpleNamespace()))
 
     class DummyClient:
         async def post_json(self,
@@ -363,9 +323,9 @@ def test_post_dashboard_conflict(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(dashboard, "GrafanaClient", lambda cfg: DummyClient())
 
     with pytest.raises(ValueError) as excinfo:
-        asyncio.run(
+        run_sync(
             dashboard._post_dashboard(
-                ctx,
+                tool_ctx,
                 {"title": "Existing", "panels": []},
                 folder_uid=None,
                 message=None,
@@ -377,45 +337,38 @@ def test_post_dashboard_conflict(monkeypatch: pytest.MonkeyPatch) -> None:
 
 
 def test_get_panel_queries(
-        sample_dashboard: Dict[str, Any], monkeypatch: pytest.MonkeyPatch) -> None:
+        sample_dashboard: Dict[str, Any], monkeypatch: pytest.MonkeyPatch,
+        tool_ctx: Any, run_sync: Callable[..., Any]) -> None:
     async def fake_get(ctx: Any, uid: str, *
     , use_cache: bool = True) -> Dict[str, Any]:
         return sample_dashboard
 
     monkeypatch.setattr(dashboard, "_get_dashboard", fake_get)
-    ctx = SimpleNamespace(
-        request_context=SimpleNamespace(
-            session=SimpleNamespace()))
-    queries = asyncio.run(dashboard._get_panel_queries(ctx, "uid123"))
+    queries = run_sync(dashboard._get_panel_queries(tool_ctx, "uid123"))
     assert queries[0]["datasource"]["uid"] == "ds1"
 
 
-def test_dashboard_tools_require_context() -> None:
-    app = FastMCP()
-    dashboard.register(app)
-
-    async def gather() -> List[str]:
-        tools = await app.list_tools()
-        return [tool.name for tool in tools]
-
-    tool_names = asyncio.run(gather())
-    assert "get_dashboard_by_uid" in tool_names
-    tool_map = {tool.name: tool for tool in asyncio.run(app.list_tools())}
+def test_dashboard_tools_require_context(
+        tool_map: Callable[..., Dict[str, Any]],
+        run_sync: Callable[..., Any]) -> None:
+    tools = tool_map(dashboard.register)
+    assert "get_dashboard_by_uid" in tools
     with pytest.raises(ValueError):
-        asyncio.run(
-            tool_map["get_dashboard_by_uid"].function(
+        run_sync(
+            tools["get_dashboard_by_uid"].function(
                 uid="uid", ctx=None))
 
 
 def test_dashboard_tool_functions_execute(
-        dashboard_tools: tuple[Dict[str, Any], DummyDashboardClient, SimpleNamespace]) -> None:
+        dashboard_tools: tuple[Dict[str, Any], DummyDashboardClient, Any],
+        run_sync: Callable[..., Any]) -> None:
     tools, client, ctx = dashboard_tools
-    result = asyncio.run(
+    result = run_sync(
         tools["get_dashboard_by_uid"].function(
             uid="abc", ctx=ctx))
     assert result["dashboard"]["title"] == "Example"
 
-    update_result = asyncio.run(
+    update_result = run_sync(
         tools["update_dashboard"].function(
             dashboard={"title": "New", "panels": []},
             ctx=ctx,
@@ -430,43 +383,86 @@ def test_dashboard_tool_functions_execute(
     # Original Grafana response
     assert update_result["grafana_response"]["status"] == "ok"
 
-    summary = asyncio.run(
+    summary = run_sync(
         tools["get_dashboard_summary"].function(
             uid="abc", ctx=ctx))
     assert summary["panelCount"] == 2
 
-    property_value = asyncio.run(
+    property_value = run_sync(
         tools["get_dashboard_property"].function(
             uid="abc", jsonPath="panels[0].title", ctx=ctx))
     assert property_value == "CPU"
 
-    queries = asyncio.run(
+    queries = run_sync(
         tools["get_dashboard_panel_queries"].function(
             uid="abc", ctx=ctx))
     assert queries[0]["query"] == "sum(rate(http_requests_total[5m]))"
 
-    operations = [{"op": "replace", "path": "title", "value": "Updated"}]
-    asyncio.run(
+    run_sync(
         tools["update_dashboard"].function(
             uid="abc",
-            operations=operations,
+            operations=_REPLACE_TITLE_OPS,
             ctx=ctx,
         )
     )
-    assert client.post_calls
+    assert client.post_calls[-1][1]["dashboard"]["title"] == "Updated"
+
+    fetches = len(client.get_calls)
+    refetched = run_sync(
+        tools["get_dashboard_by_uid"].function(
+            uid="abc", forceRefresh=True, ctx=ctx))
+    assert len(client.get_calls) == fetches + 1
+    assert refetched["dashboard"]["title"] == "Example"
 
 
 def test_dashboard_cache_reuse(
-        dashboard_tools: tuple[Dict[str, Any], DummyDashboardClient, SimpleNamespace]) -> None:
+        dashboard_tools: tuple[Dict[str, Any], DummyDashboardClient, Any],
+        run_sync: Callable[..., Any]) -> None:
     tools, client, ctx = dashboard_tools
-    asyncio.run(tools["get_dashboard_by_uid"].function(uid="abc", ctx=ctx))
+    run_sync(tools["get_dashboard_by_uid"].function(uid="abc", ctx=ctx))
     initial_fetches = len(client.get_calls)
-    asyncio.run(tools["get_dashboard_summary"].function(uid="abc", ctx=ctx))
+    run_sync(tools["get_dashboard_summary"].function(uid="abc", ctx=ctx))
     assert len(client.get_calls) == initial_fetches
 
-    asyncio.run(
+    run_sync(
         tools["get_dashboard_by_uid"].function(
             uid="abc",
             forceRefresh=True,
             ctx=ctx))
     assert len(client.get_calls) == initial_fetches + 1
+
+
+def test_dashboard_cache_is_bounded_and_expires(
+        monkeypatch: pytest.MonkeyPatch, fresh_tool_ctx: Any) -> None:
+    clock = [100.0]
+    monkeypatch.setattr(dashboard.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(dashboard, "_CACHE_MAX_ENTRIES", 2)
+
+    for uid in ("a", "b"):
+        dashboard._cache_dashboard(fresh_tool_ctx, uid, {"dashboard": {"uid": uid}})
+    assert dashboard._cached_dashboard(fresh_tool_ctx, "a") == {"dashboard": {"uid": "a"}}
+    dashboard._cache_dashboard(fresh_tool_ctx, "c", {"dashboard": {"uid": "c"}})
+    assert dashboard._cached_dashboard(fresh_tool_ctx, "b") is None
+
+    clock[0] += dashboard._CACHE_TTL_SECONDS
+    assert dashboard._cached_dashboard(fresh_tool_ctx, "a") is None
+
+
+def test_json_clone_copies_json_and_falls_back_for_other_keys() -> None:
+    original = {"panels": [{"id": 1, "targets": [{"expr": "up"}]}]}
+    clone = dashboard._json_clone(original)
+    assert clone == original
+    assert clone["panels"][0] is not original["panels"][0]
+
+    non_json = {1: {"nested": [1, 2]}}
+    copied = dashboard._json_clone(non_json)
+    assert copied == non_json
+    assert copied[1] is not non_json[1]
+
+
+def test_json_clone_keeps_non_finite_floats(json_backend: str) -> None:
+    original = {"thresholds": [float("nan"), float("inf"), None]}
+    clone = dashboard._json_clone(original)
+    assert math.isnan(clone["thresholds"][0])
+    assert clone["thresholds"][1:] == [float("inf"), None]
+    assert clone["thresholds"] is not original["thresholds"]
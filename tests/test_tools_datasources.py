@@ -2,9 +2,7 @@
 
 from __future__ import annotations
 
-import asyncio
-from types import SimpleNamespace
-from typing import Any
+from typing import Any, Callable
 
 import pytest
 
@@ -21,18 +19,21 @@ class DummyClient:
         return self.payload
 
 
+_DATASOURCES = (
+    {"id": 1, "uid": "a", "name": "A", "type": "prometheus", "isDefault": True},
+    {"id": 2, "uid": "b", "name": "B", "type": "loki", "isDefault": False},
+)
+_EXPECTED_LOKI = (_DATASOURCES[1],)
+_EXPECTED_LOOKUP_CALLS = (
+    ("/datasources/uid/abc", None),
+    ("/datasources/name/primary", None),
+)
+
+
 @pytest.fixture
 def setup_datasources(
-        monkeypatch: pytest.MonkeyPatch) -> tuple[SimpleNamespace, DummyClient]:
-    config = SimpleNamespace(url="https://grafana.local")
-    client = DummyClient()
-    monkeypatch.setattr(datasources, "get_grafana_config", lambda _: config)
-    monkeypatch.setattr(datasources, "GrafanaClient", lambda cfg: client)
-    ctx = SimpleNamespace(
-        request_context=SimpleNamespace(
-            session=SimpleNamespace(),
-            request=None))
-    return ctx, client
+        grafana_client_stub: Callable[..., Any]) -> tuple[Any, DummyClient]:
+    return grafana_client_stub(datasources, DummyClient())
 
 
 def test_filter_datasources_matches_type() -> None:
@@ -45,35 +46,27 @@ def test_filter_datasources_matches_type() -> None:
     assert datasources._filter_datasources(input_data, None) == input_data
 
 
-def test_list_datasources_returns_summaries(setup_datasources) -> None:
+def test_list_datasources_returns_summaries(setup_datasources, run_sync: Callable[..., Any]) -> None:
     ctx, client = setup_datasources
-    client.payload = [
-        {"id": 1, "uid": "a", "name": "A", "type": "prometheus", "isDefault": True},
-        {"id": 2, "uid": "b", "name": "B", "type": "loki", "isDefault": False},
-    ]
-    result = asyncio.run(datasources._list_datasources(ctx, "loki"))
-    assert result == [
-        {"id": 2, "uid": "b", "name": "B", "type": "loki", "isDefault": False}
-    ]
+    client.payload = list(_DATASOURCES)
+    result = run_sync(datasources._list_datasources(ctx, "loki"))
+    assert tuple(result) == _EXPECTED_LOKI
     assert client.calls == [("/datasources", None)]
 
 
 def test_list_datasources_rejects_unexpected_payload(
-        setup_datasources) -> None:
+        setup_datasources, run_sync: Callable[..., Any]) -> None:
     ctx, client = setup_datasources
     client.payload = {"not": "a list"}
     with pytest.raises(ValueError):
-        asyncio.run(datasources._list_datasources(ctx, None))
+        run_sync(datasources._list_datasources(ctx, None))
 
 
-def test_get_datasource_by_uid_and_name(setup_datasources) -> None:
+def test_get_datasource_by_uid_and_name(setup_datasources, run_sync: Callable[..., Any]) -> None:
     ctx, client = setup_datasources
     client.payload = {"uid": "abc"}
-    result_uid = asyncio.run(datasources._get_by_uid(ctx, "abc"))
-    result_name = asyncio.run(datasources._get_by_name(ctx, "primary"))
+    result_uid = run_sync(datasources._get_by_uid(ctx, "abc"))
+    result_name = run_sync(datasources._get_by_name(ctx, "primary"))
     assert result_uid == {"uid": "abc"}
     assert result_name == {"uid": "abc"}
-    assert client.calls == [
-        ("/datasources/uid/abc", None),
-        ("/datasources/name/primary", None),
-    ]
+    assert tuple(client.calls) == _EXPECTED_LOOKUP_CALLS
@@ -2,15 +2,12 @@
 
 from __future__ import annotations
 
-import asyncio
-from types import SimpleNamespace
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
 import pytest
 
 from app.grafana_client import GrafanaAPIError
 from app.tools import incident
-from mcp.server.fastmcp import FastMCP
 
 
 class DummyClient:
@@ -26,16 +23,8 @@ class DummyClient:
 
 @pytest.fixture
 def ctx(
-        monkeypatch: pytest.MonkeyPatch) -> tuple[SimpleNamespace, DummyClient]:
-    config = SimpleNamespace(url="https://grafana.local")
-    client = DummyClient()
-    monkeypatch.setattr(incident, "get_grafana_config", lambda _: config)
-    monkeypatch.setattr(incident, "GrafanaClient", lambda cfg: client)
-    ctx = SimpleNamespace(
-        request_context=SimpleNamespace(
-            session=SimpleNamespace(),
-            request=None))
-    return ctx, client
+        grafana_client_stub: Callable[..., Any]) -> tuple[Any, DummyClient]:
+    return grafana_client_stub(incident, DummyClient())
 
 
 def test_build_query_string_handles_flags() -> None:
@@ -46,9 +35,9 @@ def test_build_query_string_handles_flags() -> None:
 
 
 def test_list_incidents_builds_payload(
-        ctx: tuple[SimpleNamespace, DummyClient]) -> None:
+        ctx: tuple[Any, DummyClient], run_sync: Callable[..., Any]) -> None:
     ctx_obj, client = ctx
-    result = asyncio.run(
+    result = run_sync(
         incident._list_incidents(
             ctx_obj,
             limit=5,
@@ -60,7 +49,7 @@ def test_list_incidents_builds_payload(
     assert payload["query"]["limit"] == 5
     assert "status:open" in payload["query"]["queryString"]
 
-    asyncio.run(
+    run_sync(
         incident._list_incidents(
             ctx_obj,
             limit=-1,
@@ -70,9 +59,9 @@ def test_list_incidents_builds_payload(
 
 
 def test_create_incident_and_add_activity(
-        ctx: tuple[SimpleNamespace, DummyClient]) -> None:
+        ctx: tuple[Any, DummyClient], run_sync: Callable[..., Any]) -> None:
     ctx_obj, client = ctx
-    asyncio.run(
+    run_sync(
         incident._create_incident(
             ctx_obj,
             {
@@ -87,7 +76,7 @@ def test_create_incident_and_add_activity(
             },
         )
     )
-    asyncio.run(
+    run_sync(
         incident._add_activity(
             ctx_obj,
             {"incidentId": "123", "body": "Update", "eventTime": "now"},
@@ -101,21 +90,19 @@ def test_create_incident_and_add_activity(
 
 
 def test_get_incident_handles_errors(
-        monkeypatch: pytest.MonkeyPatch, ctx: tuple[SimpleNamespace, DummyClient]) -> None:
+        monkeypatch: pytest.MonkeyPatch, ctx: tuple[Any, DummyClient],
+        tool_map: Callable[..., Dict[str, Any]], run_sync: Callable[..., Any]) -> None:
     ctx_obj, client = ctx
-    asyncio.run(incident._get_incident(ctx_obj, "42"))
+    run_sync(incident._get_incident(ctx_obj, "42"))
     path, payload = client.calls[-1]
     assert path.endswith("GetIncident")
     assert payload == {"incidentID": "42"}
 
-    app = FastMCP()
-    incident.register(app)
-    tools = asyncio.run(app.list_tools())
-    get_tool = next(tool for tool in tools if tool.name == "get_incident")
+    get_tool = tool_map(incident.register)["get_incident"]
 
     def raise_not_found(*_: Any, **__: Any) -> Dict[str, Any]:
         raise GrafanaAPIError(404, "not found")
 
     monkeypatch.setattr(incident, "_get_incident", raise_not_found)
     with pytest.raises(ValueError):
-        asyncio.run(get_tool.function(incidentId="999", ctx=ctx_obj))
+        run_sync(get_tool.function(incidentId="999", ctx=ctx_obj))
@@ -55,3 +55,11 @@ def test_matches_all_returns_false_on_first_failure() -> None:
     ]
     assert matches_all(selectors, {"job": "grafana", "env": "prod"}) is True
     assert matches_all(selectors, {"job": "grafana", "env": "stage"}) is False
+
+
+def test_selector_rejects_missing_required_label_without_matching() -> None:
+    regex = LabelMatcher(name="cluster", value="[", type="=~")
+    selector = Selector([regex, LabelMatcher(name="env", value="prod", type="!=")])
+    # The invalid regex is never compiled because "cluster" is absent.
+    assert selector.matches({"env": "dev"}) is False
+    assert Selector([LabelMatcher(name="env", value="prod", type="!=")]).matches({}) is True
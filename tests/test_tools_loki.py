@@ -2,15 +2,14 @@
 
 from __future__ import annotations
 
-import asyncio
 from datetime import timedelta, timezone
 from types import SimpleNamespace
-from typing import Any, Dict, List
+from typing import Any, Callable
 
+import httpx
 import pytest
 
 from app.tools import loki
-from mcp.server.fastmcp import FastMCP
 
 
 def test_time_range_defaults_to_last_hour() -> None:
@@ -43,22 +42,9 @@ def test_format_log_entries_handles_json_and_numbers() -> None:
     assert entries[1]["value"] == 123.0
 
 
-class FakeLokiClient:
-    def __init__(self) -> None:
-        self.calls: list[tuple[str, Dict[str, Any]]] = []
-        self.responses: Dict[str, Any] = {}
-
-    async def request_json(
-            self, path: str, params: Dict[str, Any] | None = None) -> Any:
-        self.calls.append((path, params or {}))
-        response = self.responses.get(path)
-        if isinstance(response, Exception):
-            raise response
-        return response
-
-
 def test_loki_client_headers_and_request(
-        monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch: pytest.MonkeyPatch, httpx_mock: Callable[..., Any],
+        run_sync: Callable[..., Any]) -> None:
     config = SimpleNamespace(
         url="https://grafana.local",
         api_key="token",
@@ -69,70 +55,42 @@ def test_loki_client_headers_and_request(
     )
     monkeypatch.setattr(loki, "get_grafana_config", lambda ctx: config)
 
-    class DummyResponse:
-        def __init__(self, status_code: int, payload: Dict[str, Any]) -> None:
-            self.status_code = status_code
-            self._payload = payload
-            self.text = "{}"
-
-        def json(self) -> Dict[str, Any]:
-            return self._payload
-
-    class DummyAsyncClient:
-        def __init__(self, *args: Any, **kwargs: Any) -> None:
-            self.kwargs = kwargs
-            self.calls: list[tuple[str, Dict[str, Any] | None]] = []
-
-        async def __aenter__(self) -> "DummyAsyncClient":
-            return self
-
-        async def __aexit__(self, exc_type, exc, tb) -> None:
-            return None
-
-        async def get(self,
-                      url: str,
-                      params: Dict[str,
-                                   Any] | None = None,
-                      headers: Dict[str,
-                                    Any] | None = None) -> DummyResponse:
-            self.calls.append((url, params))
-            if "error" in url:
-                return DummyResponse(500, {})
-            return DummyResponse(200, {"status": "success", "data": {}})
-
-    dummy_client = DummyAsyncClient()
-    monkeypatch.setattr(
-        loki.httpx,
-        "AsyncClient",
-        lambda *args,
-        **kwargs: dummy_client)
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "error" in request.url.path:
+            return httpx.Response(500, text="{}")
+        return httpx.Response(200, json={"status": "success", "data": {}})
+
+    requests = httpx_mock(handler)
 
     client = loki.LokiClient(SimpleNamespace(), "datasource")
     headers = client._headers
     assert headers["Authorization"] == "Bearer token"
-    result = asyncio.run(client.request_json("/success", params={"q": 1}))
+    result = run_sync(client.request_json("/success", params={"q": 1}))
     assert result["status"] == "success"
+    assert requests[0].url.params["q"] == "1"
+    assert requests[0].headers["X-Access-Token"] == "access"
     with pytest.raises(ValueError):
-        asyncio.run(client.request("/error"))
+        run_sync(client.request("/error"))
 
 
 @pytest.fixture
 def ctx(
-        monkeypatch: pytest.MonkeyPatch) -> tuple[SimpleNamespace, FakeLokiClient]:
-    fake_client = FakeLokiClient()
+        monkeypatch: pytest.MonkeyPatch,
+        recording_client: Callable[..., Any]) -> tuple[SimpleNamespace, Any]:
+    fake_client = recording_client()
 
-    async def create_client(_ctx: Any, _uid: str) -> FakeLokiClient:
+    async def create_client(_ctx: Any, _uid: str) -> Any:
         return fake_client
 
     monkeypatch.setattr(loki, "_create_loki_client", create_client)
     return SimpleNamespace(), fake_client
 
 
-def test_list_label_items(ctx: tuple[SimpleNamespace, FakeLokiClient]) -> None:
+def test_list_label_items(ctx: tuple[SimpleNamespace, Any], run_sync: Callable[..., Any]) -> None:
     ctx_obj, client = ctx
     client.responses["/loki/api/v1/labels"] = {
         "status": "success", "data": ["job", "env"]}
-    labels = asyncio.run(
+    labels = run_sync(
         loki._list_label_items(
             ctx_obj,
             "uid",
@@ -145,7 +103,7 @@ def test_list_label_items(ctx: tuple[SimpleNamespace, FakeLokiClient]) -> None:
 
     client.responses["/loki/api/v1/labels"] = {"status": "error"}
     with pytest.raises(ValueError):
-        asyncio.run(
+        run_sync(
             loki._list_label_items(
                 ctx_obj,
                 "uid",
@@ -155,13 +113,13 @@ def test_list_label_items(ctx: tuple[SimpleNamespace, FakeLokiClient]) -> None:
 
 
 def test_query_range_and_stats(
-        ctx: tuple[SimpleNamespace, FakeLokiClient]) -> None:
+        ctx: tuple[SimpleNamespace, Any], run_sync: Callable[..., Any]) -> None:
     ctx_obj, client = ctx
     client.responses["/loki/api/v1/query_range"] = {
         "status": "success",
         "data": {"result": [{"stream": {}, "values": []}]},
     }
-    result = asyncio.run(
+    result = run_sync(
         loki._query_range(
             ctx_obj,
             "uid",
@@ -174,7 +132,7 @@ def test_query_range_and_stats(
     params = client.calls[-1][1]
     assert params["limit"] == "5"
 
-    asyncio.run(
+    run_sync(
         loki._query_range(
             ctx_obj,
             "uid",
@@ -189,7 +147,7 @@ def test_query_range_and_stats(
 
     client.responses["/loki/api/v1/index/stats"] = {
         "summary": {"bytesProcessed": 10}}
-    stats = asyncio.run(
+    stats = run_sync(
         loki._query_stats(
             ctx_obj,
             "uid",
@@ -197,12 +155,3 @@ def test_query_range_and_stats(
             None,
             None))
     assert stats["summary"]["bytesProcessed"] == 10
-
-
-def test_loki_tools_require_context() -> None:
-    app = FastMCP()
-    loki.register(app)
-    tools = asyncio.run(app.list_tools())
-    tool = next(tool for tool in tools if tool.name == "query_loki_logs")
-    with pytest.raises(ValueError):
-        asyncio.run(tool.function(datasourceUid="uid", logql="{}", ctx=None))
@@ -2,14 +2,12 @@
 
 from __future__ import annotations
 
-import asyncio
 from types import SimpleNamespace
-from typing import Dict
+from typing import Any, Callable, Dict
 
 import pytest
 
 from app.tools import navigation
-from mcp.server.fastmcp import FastMCP
 
 
 @pytest.fixture
@@ -26,40 +24,34 @@ def test_ensure_base_url_strips_trailing_slash(ctx: SimpleNamespace) -> None:
     assert navigation._ensure_base_url(ctx) == "https://grafana.local"
 
 
-@pytest.mark.parametrize("base, params, expected",
-                         [("https://grafana.local/d/uid",
-                           {"viewPanel": "1"},
-                             "https://grafana.local/d/uid?viewPanel=1"),
-                             ("https://grafana.local/d/uid?viewPanel=1",
-                              {"foo": "bar"},
-                              "https://grafana.local/d/uid?viewPanel=1&foo=bar"),
-                             ("https://grafana.local",
-                              {},
-                              "https://grafana.local"),
-                          ],
-                         )
+_APPEND_QUERY_CASES = (
+    ("https://grafana.local/d/uid", {"viewPanel": "1"},
+     "https://grafana.local/d/uid?viewPanel=1"),
+    ("https://grafana.local/d/uid?viewPanel=1", {"foo": "bar"},
+     "https://grafana.local/d/uid?viewPanel=1&foo=bar"),
+    ("https://grafana.local", {}, "https://grafana.local"),
+)
+
+
+@pytest.mark.parametrize("base, params, expected", _APPEND_QUERY_CASES)
 def test_append_query_handles_existing_parameters(
         base: str, params: Dict[str, str], expected: str) -> None:
     assert navigation._append_query(base, params) == expected
 
 
 def test_generate_deeplink_supports_multiple_resource_types(
-        ctx: SimpleNamespace) -> None:
-    app = FastMCP()
-    navigation.register(app)
-
-    tools = asyncio.run(app.list_tools())
-    deeplink_tool = next(
-        tool for tool in tools if tool.name == "generate_deeplink")
+        ctx: SimpleNamespace, tool_map: Callable[..., Dict[str, Any]],
+        run_sync: Callable[..., Any]) -> None:
+    deeplink_tool = tool_map(navigation.register)["generate_deeplink"]
 
-    result_dashboard = asyncio.run(
+    result_dashboard = run_sync(
         deeplink_tool.function(
             resourceType="dashboard",
             dashboardUid="abc",
             ctx=ctx))
     assert result_dashboard == "https://grafana.local/d/abc"
 
-    result_panel = asyncio.run(
+    result_panel = run_sync(
         deeplink_tool.function(
             resourceType="panel",
             dashboardUid="abc",
@@ -73,7 +65,7 @@ def test_generate_deeplink_supports_multiple_resource_types(
     assert "from=now-1h" in result_panel
     assert "var-service=payments" in result_panel
 
-    result_explore = asyncio.run(
+    result_explore = run_sync(
         deeplink_tool.function(
             resourceType="explore",
             datasourceUid="loki",
@@ -81,14 +73,14 @@ def test_generate_deeplink_supports_multiple_resource_types(
     assert result_explore.startswith("https://grafana.local/explore?")
 
     with pytest.raises(ValueError):
-        asyncio.run(deeplink_tool.function(resourceType="dashboard", ctx=ctx))
+        run_sync(deeplink_tool.function(resourceType="dashboard", ctx=ctx))
     with pytest.raises(ValueError):
-        asyncio.run(
+        run_sync(
             deeplink_tool.function(
                 resourceType="panel",
                 dashboardUid="abc",
                 ctx=ctx))
     with pytest.raises(ValueError):
-        asyncio.run(deeplink_tool.function(resourceType="explore", ctx=ctx))
+        run_sync(deeplink_tool.function(resourceType="explore", ctx=ctx))
     with pytest.raises(ValueError):
-        asyncio.run(deeplink_tool.function(resourceType="unknown", ctx=ctx))
+        run_sync(deeplink_tool.function(resourceType="unknown", ctx=ctx))
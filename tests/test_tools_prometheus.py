@@ -2,16 +2,13 @@
 
 from __future__ import annotations
 
-import asyncio
 from datetime import datetime, timedelta, timezone
-from types import SimpleNamespace
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Optional
 
 import pytest
 
 from app.tools import prometheus
 from app.tools._label_matching import LabelMatcher, Selector
-from mcp.server.fastmcp import FastMCP
 
 
 def test_parse_duration_and_time_expression() -> None:
@@ -31,23 +28,12 @@ def test_parse_duration_and_time_expression() -> None:
         prometheus._parse_duration("invalid")
 
 
-class DummyPrometheusClient:
-    def __init__(self) -> None:
-        self.calls: list[tuple[str, Optional[Dict[str, Any]]]] = []
-        self.responses: Dict[str, Dict[str, Any]] = {}
-
-    async def request_json(
-            self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        normalized = path if path.startswith("/") else f"/{path}"
-        self.calls.append((normalized, params))
-        return self.responses.get(
-            normalized, {
-                "status": "success", "data": {}})
-
-
 @pytest.fixture
-def prom_client(monkeypatch: pytest.MonkeyPatch) -> DummyPrometheusClient:
-    client = DummyPrometheusClient()
+def prom_client(
+        monkeypatch: pytest.MonkeyPatch, recording_client: Callable[..., Any]) -> Any:
+    client = recording_client(
+        default={"status": "success", "data": {}},
+        normalize=lambda path: path if path.startswith("/") else f"/{path}")
 
     async def ensure(_: Any, __: str) -> None:
         return None
@@ -61,18 +47,18 @@ def prom_client(monkeypatch: pytest.MonkeyPatch) -> DummyPrometheusClient:
     return client
 
 
-@pytest.fixture
-def ctx() -> SimpleNamespace:
-    return SimpleNamespace()
+@pytest.fixture(scope="session")
+def ctx(tool_ctx: Any) -> Any:
+    return tool_ctx
 
 
 def test_query_prometheus_range(
         monkeypatch: pytest.MonkeyPatch,
-        prom_client: DummyPrometheusClient,
-        ctx: SimpleNamespace) -> None:
+        prom_client: Any,
+        ctx: Any, run_sync: Callable[..., Any]) -> None:
     prom_client.responses["/api/v1/query_range"] = {
         "status": "success", "data": {"resultType": "matrix"}}
-    result = asyncio.run(
+    result = run_sync(
         prometheus._query_prometheus(
             ctx,
             "uid",
@@ -90,7 +76,7 @@ def test_query_prometheus_range(
 
     prom_client.responses["/api/v1/query_range"] = {"status": "error"}
     with pytest.raises(ValueError):
-        asyncio.run(
+        run_sync(
             prometheus._query_prometheus(
                 ctx,
                 "uid",
@@ -103,22 +89,31 @@ def test_query_prometheus_range(
         )
 
 
+_FIXED_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class _FixedDateTime(datetime):
+    @classmethod
+    def now(cls, tz: Optional[timezone] = None) -> datetime:
+        return _FIXED_NOW if tz else _FIXED_NOW.replace(tzinfo=None)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch: pytest.MonkeyPatch) -> datetime:
+    """Pin ``prometheus.datetime.now`` to ``_FIXED_NOW`` and return it."""
+
+    monkeypatch.setattr(prometheus, "datetime", _FixedDateTime)
+    return _FIXED_NOW
+
+
 def test_query_prometheus_instant(
-        monkeypatch: pytest.MonkeyPatch,
-        prom_client: DummyPrometheusClient,
-        ctx: SimpleNamespace) -> None:
+        frozen_now: datetime,
+        prom_client: Any,
+        ctx: Any, run_sync: Callable[..., Any]) -> None:
     prom_client.responses["/api/v1/query"] = {
         "status": "success", "data": {
             "resultType": "vector"}}
-    fixed_now = datetime(2024, 1, 1, tzinfo=timezone.utc)
-
-    class FixedDateTime(datetime):
-        @classmethod
-        def now(cls, tz: Optional[timezone] = None) -> datetime:
-            return fixed_now if tz else fixed_now.replace(tzinfo=None)
-
-    monkeypatch.setattr(prometheus, "datetime", FixedDateTime)
-    result = asyncio.run(
+    result = run_sync(
         prometheus._query_prometheus(
             ctx,
             "uid",
@@ -131,15 +126,15 @@ def test_query_prometheus_instant(
     )
     assert result["resultType"] == "vector"
     _, params = prom_client.calls[-1]
-    assert float(params["time"]) == pytest.approx(fixed_now.timestamp())
+    assert params["time"] == str(frozen_now.timestamp())
 
 
 def test_metadata_and_label_helpers(
-        prom_client: DummyPrometheusClient,
-        ctx: SimpleNamespace) -> None:
+        prom_client: Any,
+        ctx: Any, run_sync: Callable[..., Any]) -> None:
     prom_client.responses["/api/v1/metadata"] = {
         "status": "success", "data": {"metric": {}}}
-    meta = asyncio.run(
+    meta = run_sync(
         prometheus._metadata(
             ctx,
             "uid",
@@ -150,7 +145,7 @@ def test_metadata_and_label_helpers(
     selector = Selector([LabelMatcher(name="job", value="api")])
     prom_client.responses["/api/v1/labels"] = {
         "status": "success", "data": ["job", "instance"]}
-    labels = asyncio.run(
+    labels = run_sync(
         prometheus._label_names(
             ctx,
             "uid",
@@ -161,7 +156,7 @@ def test_metadata_and_label_helpers(
 
     prom_client.responses["/api/v1/label/__name__/values"] = {
         "status": "success", "data": ["up", "process_start_time_seconds"]}
-    values = asyncio.run(
+    values = run_sync(
         prometheus._label_values(
             ctx,
             "uid",
@@ -174,8 +169,8 @@ def test_metadata_and_label_helpers(
 
 def test_metric_names_filters_and_paginates(
         monkeypatch: pytest.MonkeyPatch,
-        prom_client: DummyPrometheusClient,
-        ctx: SimpleNamespace) -> None:
+        prom_client: Any,
+        ctx: Any, run_sync: Callable[..., Any]) -> None:
     async def fake_label_values(*args: Any, **kwargs: Any) -> list[str]:
         return [
             "http_requests_total",
@@ -183,7 +178,7 @@ def test_metric_names_filters_and_paginates(
             "process_start_time_seconds"]
 
     monkeypatch.setattr(prometheus, "_label_values", fake_label_values)
-    names = asyncio.run(
+    names = run_sync(
         prometheus._metric_names(
             ctx,
             "uid",
@@ -192,24 +187,16 @@ def test_metric_names_filters_and_paginates(
             page=2))
     assert names == []
     with pytest.raises(ValueError):
-        asyncio.run(prometheus._metric_names(ctx, "uid", None, -1, 1))
+        run_sync(prometheus._metric_names(ctx, "uid", None, -1, 1))
 
 
 def test_query_prometheus_range_defaults(
-        monkeypatch: pytest.MonkeyPatch,
-        prom_client: DummyPrometheusClient,
-        ctx: SimpleNamespace) -> None:
+        frozen_now: datetime,
+        prom_client: Any,
+        ctx: Any, run_sync: Callable[..., Any]) -> None:
     prom_client.responses["/api/v1/query_range"] = {
         "status": "success", "data": {}}
-    fixed_now = datetime(2024, 1, 1, tzinfo=timezone.utc)
-
-    class FixedDateTime(datetime):
-        @classmethod
-        def now(cls, tz: Optional[timezone] = None) -> datetime:
-            return fixed_now if tz else fixed_now.replace(tzinfo=None)
-
-    monkeypatch.setattr(prometheus, "datetime", FixedDateTime)
-    asyncio.run(
+    run_sync(
         prometheus._query_prometheus(
             ctx,
             "uid",
@@ -221,18 +208,18 @@ def test_query_prometheus_range_defaults(
         )
     )
     _, params = prom_client.calls[-1]
-    expected_start = (fixed_now - timedelta(minutes=5)).timestamp()
-    expected_end = fixed_now.timestamp()
-    assert float(params["start"]) == pytest.approx(expected_start)
-    assert float(params["end"]) == pytest.approx(expected_end)
+    expected_start = (frozen_now - timedelta(minutes=5)).timestamp()
+    expected_end = frozen_now.timestamp()
+    assert params["start"] == str(expected_start)
+    assert params["end"] == str(expected_end)
     assert params["step"] == "60"
 
 
 def test_query_prometheus_range_invalid_step(
-        prom_client: DummyPrometheusClient,
-        ctx: SimpleNamespace) -> None:
+        prom_client: Any,
+        ctx: Any, run_sync: Callable[..., Any]) -> None:
     with pytest.raises(ValueError):
-        asyncio.run(
+        run_sync(
             prometheus._query_prometheus(
                 ctx,
                 "uid",
@@ -243,17 +230,3 @@ def test_query_prometheus_range_invalid_step(
                 query_type="range",
             )
         )
-
-
-def test_prometheus_tools_require_context() -> None:
-    app = FastMCP()
-    prometheus.register(app)
-    tools = asyncio.run(app.list_tools())
-    tool = next(tool for tool in tools if tool.name == "query_prometheus")
-    with pytest.raises(ValueError):
-        asyncio.run(
-            tool.function(
-                datasourceUid="uid",
-                expr="up",
-                startTime="now",
-                ctx=None))
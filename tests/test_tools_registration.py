@@ -2,81 +2,70 @@
 
 from __future__ import annotations
 
-import asyncio
+from types import ModuleType
+from typing import Any, Callable, Dict
 
 import pytest
 
-import app.tools as tools
-from app.tools import register_all
+from app.tools import loki, oncall, prometheus, pyroscope
 from app.tools.availability import GrafanaCapabilities
-from mcp.server.fastmcp import FastMCP
 
 
-def _capabilities_with(
-    *,
-    datasource_types: set[str],
-        plugin_ids: set[str]) -> GrafanaCapabilities:
-    return GrafanaCapabilities(
-        datasource_types=frozenset(datasource_types),
-        plugin_ids=frozenset(plugin_ids),
-    )
+_ALL_DATASOURCES = frozenset({"loki", "prometheus", "pyroscope"})
+_ALL_PLUGINS = frozenset({"grafana-irm-app", "grafana-asserts-app", "grafana-ml-app"})
 
+_FULL_CAPS = GrafanaCapabilities(datasource_types=_ALL_DATASOURCES, plugin_ids=_ALL_PLUGINS)
+_NO_LOKI_CAPS = GrafanaCapabilities(
+    datasource_types=frozenset({"prometheus", "pyroscope"}), plugin_ids=_ALL_PLUGINS)
+_NO_ONCALL_CAPS = GrafanaCapabilities(
+    datasource_types=_ALL_DATASOURCES, plugin_ids=frozenset({"grafana-ml-app"}))
 
-def _tool_names(app: FastMCP) -> set[str]:
-    registered = asyncio.run(app.list_tools())
-    return {tool.name for tool in registered}
 
+@pytest.mark.parametrize(
+    "capabilities, missing_names",
+    [
+        (_NO_LOKI_CAPS, ("query_loki_logs",)),
+        (_NO_ONCALL_CAPS, ("list_oncall_schedules", "create_incident")),
+    ],
+)
+def test_register_all_skips_unavailable_tools(
+        capabilities: GrafanaCapabilities, missing_names: tuple[str, ...],
+        register_all_tools: Callable[[Any], Dict[str, Any]]) -> None:
+    names = register_all_tools(capabilities).keys()
 
-def test_register_all_skips_loki_without_datasource(
-        monkeypatch: pytest.MonkeyPatch) -> None:
-    capabilities = _capabilities_with(
-        datasource_types={
-            "prometheus", "pyroscope"}, plugin_ids={
-            "grafana-irm-app", "grafana-asserts-app", "grafana-ml-app"}, )
-    monkeypatch.setattr(tools, "_resolve_capabilities", lambda: capabilities)
-
-    app = FastMCP()
-    register_all(app)
-    names = _tool_names(app)
-
-    assert "query_loki_logs" not in names
-    assert "search" in names
-
-
-def test_register_all_skips_oncall_without_plugin(
-        monkeypatch: pytest.MonkeyPatch) -> None:
-    capabilities = _capabilities_with(
-        datasource_types={"loki", "prometheus", "pyroscope"},
-        plugin_ids={"grafana-ml-app"},
-    )
-    monkeypatch.setattr(tools, "_resolve_capabilities", lambda: capabilities)
-
-    app = FastMCP()
-    register_all(app)
-    names = _tool_names(app)
-
-    assert "list_oncall_schedules" not in names
-    assert "create_incident" not in names
+    for missing in missing_names:
+        assert missing not in names
     assert "search" in names
 
 
 def test_all_tools_define_array_item_schemas(
-        monkeypatch: pytest.MonkeyPatch) -> None:
-    capabilities = _capabilities_with(
-        datasource_types={
-            "loki", "prometheus", "pyroscope"}, plugin_ids={
-            "grafana-irm-app", "grafana-asserts-app", "grafana-ml-app"}, )
-    monkeypatch.setattr(tools, "_resolve_capabilities", lambda: capabilities)
-
-    app = FastMCP()
-    register_all(app)
-
-    registered_tools = asyncio.run(app.list_tools())
-    for tool in registered_tools:
-        properties = tool.inputSchema.get("properties", {})
-        for name, schema in properties.items():
-            if schema.get("type") == "array":
-                items_schema = schema.get("items")
-                assert isinstance(items_schema, dict) and items_schema, (
-                    f"Tool {tool.name} parameter '{name}' must define a non-empty items schema",
-                )
+        register_all_tools: Callable[[Any], Dict[str, Any]]) -> None:
+    array_params = [
+        (tool.name, name, schema)
+        for tool in register_all_tools(_FULL_CAPS).values()
+        for name, schema in tool.inputSchema.get("properties", {}).items()
+        if schema.get("type") == "array"
+    ]
+    assert array_params
+
+    for tool_name, name, schema in array_params:
+        items_schema = schema.get("items")
+        assert isinstance(items_schema, dict) and items_schema, (
+            f"Tool {tool_name} parameter '{name}' must define a non-empty items schema")
+
+
+@pytest.mark.parametrize(
+    "module, tool_name, kwargs",
+    [
+        (loki, "query_loki_logs", {"datasourceUid": "uid", "logql": "{}"}),
+        (oncall, "list_oncall_schedules", {}),
+        (prometheus, "query_prometheus", {"datasourceUid": "uid", "expr": "up", "startTime": "now"}),
+        (pyroscope, "fetch_pyroscope_profile", {"dataSourceUid": "uid", "profileType": "cpu"}),
+    ],
+)
+def test_tools_require_context(
+        module: ModuleType, tool_name: str, kwargs: Dict[str, Any],
+        tool_map: Callable[..., Dict[str, Any]], run_sync: Callable[..., Any]) -> None:
+    tool = tool_map(module.register)[tool_name]
+    with pytest.raises(ValueError):
+        run_sync(tool.function(ctx=None, **kwargs))
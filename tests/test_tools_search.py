@@ -3,10 +3,10 @@
 from __future__ import annotations
 
 import asyncio
+from typing import Any, Callable, Dict
+
 import pytest
 
-import app.tools as tools
-from app.tools import register_all
 from app.tools.availability import GrafanaCapabilities
 from app.tools.search import (
     _fetch_dashboard,
@@ -14,58 +14,43 @@ from app.tools.search import (
     _parse_dashboard_url,
     _resolve_dashboard_lookup,
 )
-from mcp.server.fastmcp import FastMCP
-
 
-@pytest.fixture(autouse=True)
-def _allow_all_capabilities(monkeypatch: pytest.MonkeyPatch) -> None:
-    capabilities = GrafanaCapabilities(
-        datasource_types=frozenset({"loki", "prometheus", "pyroscope"}),
-        plugin_ids=frozenset({"grafana-irm-app", "grafana-asserts-app", "grafana-ml-app"}),
-    )
-    monkeypatch.setattr(tools, "_resolve_capabilities", lambda: capabilities)
 
+_ALL_CAPABILITIES = GrafanaCapabilities(
+    datasource_types=frozenset({"loki", "prometheus", "pyroscope"}),
+    plugin_ids=frozenset({"grafana-irm-app", "grafana-asserts-app", "grafana-ml-app"}),
+)
+_EXPECTED_ITEM_TYPES = frozenset({"string", "integer", "object"})
 
-def test_search_tool_is_registered() -> None:
-    app = FastMCP()
-    register_all(app)
 
-    tools = asyncio.run(app.list_tools())
-    tool_names = {tool.name for tool in tools}
+@pytest.fixture(scope="session")
+def registered_tools(register_all_tools: Callable[[Any], Dict[str, Any]]) -> Dict[str, Any]:
+    return register_all_tools(_ALL_CAPABILITIES)
 
-    assert "search" in tool_names
-    assert "search_dashboards" in tool_names
-    assert "fetch" in tool_names
 
+def test_search_tool_is_registered(registered_tools: Dict[str, Any]) -> None:
+    assert "search" in registered_tools
+    assert "search_dashboards" in registered_tools
+    assert "fetch" in registered_tools
 
-def test_search_tool_metadata() -> None:
-    app = FastMCP()
-    register_all(app)
 
-    tools = asyncio.run(app.list_tools())
-    tool = next((tool for tool in tools if tool.name == "search"), None)
+def test_search_tool_metadata(registered_tools: Dict[str, Any]) -> None:
+    tool = registered_tools.get("search")
     assert tool is not None
     assert "General purpose search" in (tool.description or "")
 
 
-def test_fetch_tool_metadata() -> None:
-    app = FastMCP()
-    register_all(app)
-
-    tools = asyncio.run(app.list_tools())
-    tool = next((tool for tool in tools if tool.name == "fetch"), None)
+def test_fetch_tool_metadata(registered_tools: Dict[str, Any]) -> None:
+    tool = registered_tools.get("fetch")
     assert tool is not None
     assert "Retrieve detailed Grafana resource data" in (
         tool.description or "")
 
 
-def test_search_and_dashboards_tools_require_only_query() -> None:
-    app = FastMCP()
-    register_all(app)
-
-    tools = asyncio.run(app.list_tools())
+def test_search_and_dashboards_tools_require_only_query(
+        registered_tools: Dict[str, Any]) -> None:
     for tool_name in ("search", "search_dashboards"):
-        tool = next((tool for tool in tools if tool.name == tool_name), None)
+        tool = registered_tools.get(tool_name)
         assert tool is not None
 
         schema = tool.inputSchema
@@ -73,12 +58,9 @@ def test_search_and_dashboards_tools_require_only_query() -> None:
         assert set(schema.get("properties", {})) == {"query"}
 
 
-def test_fetch_schema_exposes_string_identifiers() -> None:
-    app = FastMCP()
-    register_all(app)
-
-    tools = asyncio.run(app.list_tools())
-    tool = next((tool for tool in tools if tool.name == "fetch"), None)
+def test_fetch_schema_exposes_string_identifiers(
+        registered_tools: Dict[str, Any]) -> None:
+    tool = registered_tools.get("fetch")
     assert tool is not None
 
     schema = tool.inputSchema
@@ -88,12 +70,9 @@ def test_fetch_schema_exposes_string_identifiers() -> None:
     assert id_schema.get("type") == "string"
 
 
-def test_fetch_schema_defines_array_items_for_ids() -> None:
-    app = FastMCP()
-    register_all(app)
-
-    tools = asyncio.run(app.list_tools())
-    tool = next((tool for tool in tools if tool.name == "fetch"), None)
+def test_fetch_schema_defines_array_items_for_ids(
+        registered_tools: Dict[str, Any]) -> None:
+    tool = registered_tools.get("fetch")
     assert tool is not None
 
     schema = tool.inputSchema
@@ -112,7 +91,7 @@ def test_fetch_schema_defines_array_items_for_ids() -> None:
     else:
         item_types = {items_schema.get("type")}
 
-    assert {"string", "integer", "object"}.issubset(item_types)
+    assert _EXPECTED_ITEM_TYPES.issubset(item_types)
 
 
 def test_parse_dashboard_url_handles_relative_and_absolute_paths() -> None:
@@ -167,19 +146,20 @@ class DummyClient:
     def __init__(self) -> None:
         self.paths: list[str] = []
 
-    async def get_json(self,
-                       path: str,
-                       params: dict[str,
-                                    object] | None = None) -> dict[str,
-                                                                   str]:
+    def get_json(self,
+                 path: str,
+                 params: dict[str, object] | None = None) -> asyncio.Future[dict[str, str]]:
+        # A pre-resolved future is awaitable without building a coroutine frame.
         self.paths.append(path)
-        return {"path": path}
+        future: asyncio.Future[dict[str, str]] = asyncio.get_running_loop().create_future()
+        future.set_result({"path": path})
+        return future
 
 
-def test_fetch_dashboard_prefers_uid() -> None:
+def test_fetch_dashboard_prefers_uid(run_sync: Callable[..., Any]) -> None:
     client = DummyClient()
 
-    result = asyncio.run(
+    result = run_sync(
         _fetch_dashboard(
             client,
             uid="abc123",
@@ -189,26 +169,26 @@ def test_fetch_dashboard_prefers_uid() -> None:
     assert client.paths == ["/dashboards/uid/abc123"]
 
 
-def test_fetch_dashboard_supports_numeric_id() -> None:
+def test_fetch_dashboard_supports_numeric_id(run_sync: Callable[..., Any]) -> None:
     client = DummyClient()
 
-    result = asyncio.run(_fetch_dashboard(client, uid=None, numeric_id="99"))
+    result = run_sync(_fetch_dashboard(client, uid=None, numeric_id="99"))
 
     assert result == {"path": "/dashboards/id/99"}
     assert client.paths == ["/dashboards/id/99"]
 
 
-def test_fetch_dashboard_requires_identifier() -> None:
+def test_fetch_dashboard_requires_identifier(run_sync: Callable[..., Any]) -> None:
     client = DummyClient()
 
     with pytest.raises(ValueError):
-        asyncio.run(_fetch_dashboard(client, uid=None, numeric_id=None))
+        run_sync(_fetch_dashboard(client, uid=None, numeric_id=None))
 
 
-def test_fetch_resource_uses_url_when_available() -> None:
+def test_fetch_resource_uses_url_when_available(run_sync: Callable[..., Any]) -> None:
     client = DummyClient()
 
-    result = asyncio.run(
+    result = run_sync(
         _fetch_resource(
             client,
             resource_type="dash-db",
@@ -225,10 +205,10 @@ def test_fetch_resource_uses_url_when_available() -> None:
     assert client.paths == ["/dashboards/uid/uid-from-url"]
 
 
-def test_fetch_resource_uses_metadata_item() -> None:
+def test_fetch_resource_uses_metadata_item(run_sync: Callable[..., Any]) -> None:
     client = DummyClient()
 
-    result = asyncio.run(
+    result = run_sync(
         _fetch_resource(
             client,
             resource_type=None,
@@ -245,11 +225,11 @@ def test_fetch_resource_uses_metadata_item() -> None:
     assert client.paths == ["/dashboards/uid/item-uid"]
 
 
-def test_fetch_resource_requires_identifier() -> None:
+def test_fetch_resource_requires_identifier(run_sync: Callable[..., Any]) -> None:
     client = DummyClient()
 
     with pytest.raises(ValueError):
-        asyncio.run(
+        run_sync(
             _fetch_resource(
                 client,
                 resource_type="dash-db",
@@ -263,11 +243,11 @@ def test_fetch_resource_requires_identifier() -> None:
         )
 
 
-def test_fetch_resource_rejects_unsupported_types() -> None:
+def test_fetch_resource_rejects_unsupported_types(run_sync: Callable[..., Any]) -> None:
     client = DummyClient()
 
     with pytest.raises(ValueError):
-        asyncio.run(
+        run_sync(
             _fetch_resource(
                 client,
                 resource_type="datasource",
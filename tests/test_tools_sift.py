@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
-import asyncio
 from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
 
 import pytest
 
 from app.tools import sift
-from mcp.server.fastmcp import FastMCP
+
+
+_SIFT_CONFIG = SimpleNamespace(url="https://grafana.local")
+_INVESTIGATION = {"id": "123", "status": "finished", "name": "Investigation"}
+_ANALYSES_RESPONSE = {"data": [{"id": "1", "name": "ErrorPatternLogs"}]}
+_INVESTIGATIONS_RESPONSE = {"data": [_INVESTIGATION]}
+_INVESTIGATION_RESPONSE = {"data": _INVESTIGATION}
 
 
 def test_time_range_defaults_and_validation() -> None:
@@ -39,18 +44,19 @@ def test_parse_datetime_relative(monkeypatch: pytest.MonkeyPatch) -> None:
 
     with pytest.raises(ValueError):
         sift._parse_datetime("now-")
+    with pytest.raises(ValueError):
+        sift._parse_datetime("now-1hour")
 
 
 @pytest.fixture
-def ctx(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
-    config = SimpleNamespace(url="https://grafana.local")
-    monkeypatch.setattr(sift, "get_grafana_config", lambda _: config)
-    return SimpleNamespace()
+def ctx(monkeypatch: pytest.MonkeyPatch, tool_ctx: Any) -> Any:
+    monkeypatch.setattr(sift, "get_grafana_config", lambda _: _SIFT_CONFIG)
+    return tool_ctx
 
 
 @pytest.fixture
 def captured(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
-    data: Dict[str, Any] = {}
+    data: Dict[str, Any] = {"get_json": []}
 
     async def fake_request(ctx: Any,
                            method: str,
@@ -72,17 +78,12 @@ def captured(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
                             params: Dict[str,
                                          Any] | None = None) -> Dict[str,
                                                                      Any]:
-        data.setdefault("get_json", []).append((path, params))
+        data["get_json"].append((path, params))
         if path.endswith("/analyses"):
-            return {"data": [{"id": "1", "name": "ErrorPatternLogs"}]}
+            return _ANALYSES_RESPONSE
         if path.endswith("/investigations"):
-            return {
-                "data": [{"id": "123", "status": "finished", "name": "Investigation"}]}
-        return {
-            "data": {
-                "id": "123",
-                "status": "finished",
-                "name": "Investigation"}}
+            return _INVESTIGATIONS_RESPONSE
+        return _INVESTIGATION_RESPONSE
 
     monkeypatch.setattr(sift, "_sift_request", fake_request)
     monkeypatch.setattr(sift, "_sift_get_json", fake_get_json)
@@ -90,10 +91,10 @@ def captured(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
 
 
 def test_create_investigation(
-        ctx: SimpleNamespace, captured: Dict[str, Any]) -> None:
+        ctx: Any, captured: Dict[str, Any], run_sync: Callable[..., Any]) -> None:
     start = datetime(2024, 1, 1, tzinfo=timezone.utc)
     end = start + timedelta(minutes=5)
-    result = asyncio.run(
+    result = run_sync(
         sift._create_investigation(
             ctx,
             name="Investigation",
@@ -109,23 +110,24 @@ def test_create_investigation(
 
 
 def test_list_and_get_helpers(
-        ctx: SimpleNamespace, captured: Dict[str, Any]) -> None:
-    investigations = asyncio.run(sift._list_investigations(ctx, limit=5))
+        ctx: Any, captured: Dict[str, Any], run_sync: Callable[..., Any]) -> None:
+    investigations = run_sync(sift._list_investigations(ctx, limit=5))
     assert investigations[0]["id"] == "123"
-    investigation = asyncio.run(sift._get_investigation(ctx, "123"))
+    investigation = run_sync(sift._get_investigation(ctx, "123"))
     assert investigation["status"] == "finished"
-    analyses = asyncio.run(sift._get_analyses(ctx, "123"))
+    analyses = run_sync(sift._get_analyses(ctx, "123"))
     assert analyses[0]["name"] == "ErrorPatternLogs"
 
 
-def test_wait_for_completion(monkeypatch: pytest.MonkeyPatch) -> None:
-    responses = [
+def test_wait_for_completion(
+        monkeypatch: pytest.MonkeyPatch, tool_ctx: Any, run_sync: Callable[..., Any]) -> None:
+    responses = iter([
         {"id": "1", "status": "pending"},
         {"id": "1", "status": "finished"},
-    ]
+    ])
 
     async def fake_get_investigation(ctx: Any, _id: str) -> Dict[str, Any]:
-        return responses.pop(0)
+        return next(responses)
 
     async def fake_sleep(_: float) -> None:
         return None
@@ -134,11 +136,9 @@ def test_wait_for_completion(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(
         sift, "_now", lambda: datetime(
             2024, 1, 1, tzinfo=timezone.utc))
-    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(sift, "_sleep", fake_sleep)
 
-    ctx = SimpleNamespace()
-
-    result = asyncio.run(sift._wait_for_completion(ctx, "1"))
+    result = run_sync(sift._wait_for_completion(tool_ctx, "1"))
     assert result["status"] == "finished"
 
 
@@ -150,7 +150,8 @@ def test_find_analysis() -> None:
         sift._find_analysis(analyses, "Missing")
 
 
-def test_run_check(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_run_check(
+        monkeypatch: pytest.MonkeyPatch, tool_ctx: Any, run_sync: Callable[..., Any]) -> None:
     async def fake_create(ctx: Any, *args: Any, **
                           kwargs: Any) -> Dict[str, Any]:
         return {"id": "1"}
@@ -166,10 +167,9 @@ def test_run_check(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(sift, "_wait_for_completion", fake_wait)
     monkeypatch.setattr(sift, "_get_analyses", fake_analyses)
 
-    ctx = SimpleNamespace()
-    result = asyncio.run(
+    result = run_sync(
         sift._run_check(
-            ctx,
+            tool_ctx,
             "ErrorPatternLogs",
             name="Investigation",
             labels={"service": "api"},
@@ -180,11 +180,9 @@ def test_run_check(monkeypatch: pytest.MonkeyPatch) -> None:
     assert result["result"] == "ok"
 
 
-def test_sift_tools_require_context() -> None:
-    app = FastMCP()
-    sift.register(app)
-    tools = asyncio.run(app.list_tools())
-    tool = next(tool for tool in tools if tool.name ==
-                "list_sift_investigations")
+def test_sift_tools_require_context(
+        run_sync: Callable[..., Any],
+        tool_map: Callable[..., Dict[str, Any]]) -> None:
+    tool = tool_map(sift.register)["list_sift_investigations"]
     with pytest.raises(ValueError):
-        asyncio.run(tool.function(ctx=None))
+        run_sync(tool.function(ctx=None))